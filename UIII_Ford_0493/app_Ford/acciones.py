@@ -0,0 +1,125 @@
+# app_Ford/acciones.py
+from decimal import Decimal
+
+from django.core.exceptions import EmptyResultSet
+from django.db import connections, router, transaction
+from django.db.models import Count, F
+from django.db.models.functions import Round
+from django.utils import timezone
+
+from . import inventario, resumenes, tablero
+from .cache_listas import invalidar_modelo
+from .filtros import aplicar_filtros
+from .models import ServicioArchivado, ServicioMantenimiento
+
+# ==========================================
+# ACCIONES MASIVAS DE LAS LISTAS
+# ==========================================
+# Las listas permiten marcar filas (o tomar todas las que pasan el filtro)
+# y aplicarles una acción: cambiar precios en un porcentaje, sumar o restar
+# stock, pasar ventas a otro empleado o borrar. Cada acción es una sola
+# sentencia sobre el conjunto (UPDATE ... WHERE, un UPDATE con CASE, un
+# DELETE ... WHERE) dentro de una transacción, así que cambiar 10 000
+# filas cuesta lo mismo que cambiar una, en lugar de una petición por fila.
+#
+# Ninguna pasa por save()/delete() de cada objeto: no hay señales
+# post_save/post_delete y la caché se invalida aquí. Lo que esas señales
+# mantienen (resumen diario, bitácora de inventario) también se actualiza
+# aquí, por conjunto.
+
+
+def seleccion(request, queryset, filtros=None):
+    """
+    Las filas de 'queryset' a las que se aplica la acción: las marcadas
+    (POST 'ids') o, con POST 'todos', todas las que pasan los filtros de la
+    lista (los parámetros GET de la URL de la acción).
+    """
+    if filtros is not None and request.POST.get('todos'):
+        return aplicar_filtros(request, queryset, filtros)[0]
+    ids = []
+    for valor in request.POST.getlist('ids'):
+        try:
+            ids.append(int(valor))
+        except ValueError:
+            continue
+    return queryset.filter(id__in=ids)
+
+
+def _borrar(queryset):
+    """
+    DELETE ... WHERE id IN (<consulta de 'queryset'>) en una sola sentencia,
+    sin cargar las filas (queryset.delete() las lee todas para mandar las
+    señales). Regresa cuántas se borraron.
+    """
+    modelo = queryset.model
+    conexion = connections[router.db_for_write(modelo)]
+    try:
+        subconsulta, parametros = queryset.order_by().values('id').query.sql_with_params()
+    except EmptyResultSet:
+        # Nada marcado (id__in=[]): Django no genera SQL para eso.
+        return 0
+    with conexion.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {conexion.ops.quote_name(modelo._meta.db_table)} WHERE id IN ({subconsulta})',
+            parametros,
+        )
+        return cursor.rowcount
+
+
+def cambiar_precios(vehiculos, porcentaje):
+    """Sube (o baja, si es negativo) el precio de 'vehiculos' en 'porcentaje'. Regresa cuántos cambiaron."""
+    factor = 1 + Decimal(porcentaje) / 100
+    with transaction.atomic():
+        cambiados = vehiculos.update(precio=Round(F('precio') * factor, 2), fecha_actualizacion=timezone.now())
+    invalidar_modelo('Vehiculo')
+    tablero.invalidar()
+    return cambiados
+
+
+def reasignar_ventas(ventas, empleado):
+    """Pasa 'ventas' al 'empleado'. Regresa cuántas cambiaron."""
+    ventas = ventas.exclude(empleado=empleado)
+    with transaction.atomic():
+        resumenes.reasignar_ventas(ventas, empleado.id)
+        cambiadas = ventas.update(empleado=empleado, fecha_actualizacion=timezone.now())
+    invalidar_modelo('Venta')
+    tablero.invalidar()
+    return cambiadas
+
+
+def borrar_ventas(ventas):
+    """
+    Borra 'ventas', regresa sus vehículos al stock (un UPDATE con CASE) y
+    las resta del resumen. Regresa cuántas se borraron.
+    """
+    with transaction.atomic():
+        # Se bloquean primero: un borrado simultáneo de las mismas ventas
+        # espera y luego ya no las encuentra, así que no devuelve dos veces.
+        if not list(ventas.select_for_update().order_by().values_list('id', flat=True)):
+            return 0
+        por_vehiculo = dict(
+            ventas.order_by().values('vehiculo_id').annotate(n=Count('id')).values_list('vehiculo_id', 'n')
+        )
+        resumenes.acumular(resumenes.ventas_agrupadas(ventas), signo=-1)
+        borradas = _borrar(ventas)
+        inventario.devolver_unidades(por_vehiculo, nota='Borrado masivo de ventas')
+    invalidar_modelo('Venta')
+    return borradas
+
+
+def borrar_proveedores(proveedores):
+    """
+    Borra 'proveedores'; sus servicios (también los archivados) quedan sin
+    proveedor, como en el borrado de uno solo (SET_NULL). Regresa cuántos se
+    borraron.
+    """
+    with transaction.atomic():
+        ServicioMantenimiento.objects.filter(proveedor__in=proveedores).update(
+            proveedor=None, fecha_actualizacion=timezone.now()
+        )
+        ServicioArchivado.objects.filter(proveedor__in=proveedores).update(proveedor=None)
+        borrados = _borrar(proveedores)
+    invalidar_modelo('Proveedor')
+    invalidar_modelo('ServicioMantenimiento')
+    tablero.invalidar()
+    return borrados
@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class AppFordConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app_Ford'
+
+    def ready(self):
+        # Conecta los receptores de señales (invalidación de caché, etc.)
+        from . import signals  # noqa: F401
+
+        # Registro de consultas lentas (consultas_lentas.py), sólo si hay umbral
+        from django.db.backends.signals import connection_created
+        from .consultas_lentas import instalar_vigilante, umbral_ms
+        if umbral_ms() is not None:
+            connection_created.connect(instalar_vigilante, dispatch_uid='ford_consultas_lentas')
@@ -0,0 +1,111 @@
+# app_Ford/archivo.py
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.db import connections, router, transaction
+
+from . import tablero
+from .cache_listas import invalidar_modelo
+from .filtros import aplicar_filtros
+from .models import ServicioArchivado, ServicioMantenimiento, Venta, VentaArchivada
+
+# ==========================================
+# ARCHIVO DE VENTAS Y SERVICIOS ANTIGUOS
+# ==========================================
+# Las pantallas de todos los días sólo miran los últimos meses, pero Venta y
+# ServicioMantenimiento crecen sin límite. 'manage.py archivar_historial'
+# (desde cron) mueve las filas de más de FORD_ARCHIVO_DIAS días a
+# VentaArchivada / ServicioArchivado, por lotes y cada lote en su propia
+# transacción: las tablas de uso diario y sus índices se quedan del tamaño
+# de ese periodo.
+#
+# Archivar una venta no es borrarla: no cambia el stock ni el resumen
+# diario (resumenes.py lee las dos tablas).
+#
+# Las listas y exportaciones sólo consultan el archivo cuando su filtro de
+# fechas llega antes del límite (ver con_archivo); sin filtro de fecha o
+# con uno reciente la consulta es la misma de siempre.
+
+DIAS = getattr(settings, 'FORD_ARCHIVO_DIAS', 365)
+
+# Modelo de uso diario -> (modelo de archivo, campo de fecha)
+ARCHIVOS = {
+    Venta: (VentaArchivada, 'fecha_venta'),
+    ServicioMantenimiento: (ServicioArchivado, 'fecha_servicio'),
+}
+
+
+def limite(hoy=None):
+    """Fecha desde la que todo está en las tablas de uso diario."""
+    return (hoy or date.today()) - timedelta(days=DIAS)
+
+
+def pide_archivo(filtros):
+    """True si los filtros aplicados ('desde', 'hasta') piden fechas anteriores al límite."""
+    if 'desde' in filtros:
+        return date.fromisoformat(filtros['desde']) < limite()
+    return 'hasta' in filtros
+
+
+def con_archivo(request, modelo, relacionados, filtros):
+    """
+    aplicar_filtros() sobre 'modelo' (con select_related de 'relacionados')
+    y, si el filtro de fechas lo pide, también sobre su tabla de archivo.
+    Regresa ([querysets], aplicados); la paginación y las exportaciones
+    mezclan los querysets en orden.
+    """
+    actuales, aplicados = aplicar_filtros(request, modelo.objects.select_related(*relacionados), filtros)
+    if not pide_archivo(aplicados):
+        return [actuales], aplicados
+    archivados, _ = aplicar_filtros(request, ARCHIVOS[modelo][0].objects.select_related(*relacionados), filtros)
+    return [actuales, archivados], aplicados
+
+
+def _mover(origen, destino, campo, condicion, lote):
+    """
+    Mueve a 'destino' las filas de 'origen' que cumplen 'condicion', 'lote'
+    filas por transacción: un INSERT ... SELECT y un DELETE por lote, sin
+    pasar las filas por Python. Regresa cuántas se movieron.
+    """
+    conexion = connections[router.db_for_write(origen)]
+    nombre = conexion.ops.quote_name
+    columnas = ', '.join(nombre(campo_modelo.column) for campo_modelo in origen._meta.concrete_fields)
+    tabla_origen, tabla_destino = nombre(origen._meta.db_table), nombre(destino._meta.db_table)
+    movidas = 0
+    while True:
+        with transaction.atomic():
+            ids = list(
+                origen.objects.filter(**condicion).order_by(campo, 'id').values_list('id', flat=True)[:lote]
+            )
+            if not ids:
+                break
+            marcas = ', '.join(['%s'] * len(ids))
+            with conexion.cursor() as cursor:
+                cursor.execute(
+                    f'INSERT INTO {tabla_destino} ({columnas}) '
+                    f'SELECT {columnas} FROM {tabla_origen} WHERE id IN ({marcas})', ids
+                )
+                cursor.execute(f'DELETE FROM {tabla_origen} WHERE id IN ({marcas})', ids)
+        movidas += len(ids)
+    if movidas:
+        # SQL directo: no hay post_save/post_delete que invaliden.
+        invalidar_modelo(origen.__name__)
+        invalidar_modelo(destino.__name__)
+        tablero.invalidar()
+    return movidas
+
+
+def archivar(lote=2000):
+    """
+    Mueve al archivo las ventas y servicios anteriores al límite. Si
+    FORD_ARCHIVO_DIAS creció, primero regresa a las tablas de uso diario
+    los archivados que ya no pasan el límite, para que las listas no los
+    pierdan. Regresa {nombre del modelo: (archivadas, devueltas)}.
+    """
+    corte = limite()
+    resultado = {}
+    for modelo, (modelo_archivo, campo) in ARCHIVOS.items():
+        devueltas = _mover(modelo_archivo, modelo, campo, {f'{campo}__gte': corte}, lote)
+        archivadas = _mover(modelo, modelo_archivo, campo, {f'{campo}__lt': corte}, lote)
+        resultado[modelo.__name__] = (archivadas, devueltas)
+    return resultado
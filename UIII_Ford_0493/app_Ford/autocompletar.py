@@ -0,0 +1,127 @@
+# app_Ford/autocompletar.py
+from django.db.models.functions import Lower
+from django.http import JsonResponse
+
+# ==========================================
+# BÚSQUEDA POR PREFIJO PARA AUTOCOMPLETAR
+# ==========================================
+# Los formularios ya no cargan tablas completas en un <select>: el navegador
+# pide los primeros N registros cuyo campo empieza con lo que se escribe.
+#
+# Cada campo de búsqueda tiene un índice sobre LOWER(campo) (ver
+# 'Meta.indexes' en models.py). La condición
+#     LOWER(campo) >= 'pre' AND LOWER(campo) < 'prf'
+# es un rango sobre ese índice, así que la consulta lee sólo las N filas
+# que devuelve, sin importar el tamaño de la tabla.
+
+LIMITE_RESULTADOS = 10
+LIMITE_MAXIMO = 50
+
+
+def _siguiente_prefijo(prefijo):
+    """'ford' -> 'forf': el primer texto que ya no empieza con 'prefijo'."""
+    return prefijo[:-1] + chr(ord(prefijo[-1]) + 1)
+
+
+def _filas_con_prefijo(queryset, campo, prefijo, columnas, encontrados, faltan):
+    """Los primeros 'faltan' registros (sin evaluar) cuyo 'campo' empieza con 'prefijo'."""
+    clave = f'{campo}_minusculas'
+    return (
+        queryset.annotate(**{clave: Lower(campo)})
+        .filter(**{
+            f'{clave}__gte': prefijo,
+            f'{clave}__lt': _siguiente_prefijo(prefijo),
+            # Filtro exacto: el rango sólo acota el recorrido del índice.
+            f'{clave}__startswith': prefijo,
+        })
+        .exclude(id__in=list(encontrados))
+        .order_by(clave)
+        .values(*columnas)[:faltan]
+    )
+
+
+def buscar_por_prefijo(queryset, campos, prefijo, columnas, limite=LIMITE_RESULTADOS):
+    """
+    Busca en cada campo de 'campos' (en orden) los registros cuyo valor
+    empieza con 'prefijo', sin distinguir mayúsculas. Regresa a lo más
+    'limite' diccionarios con 'columnas', sin repetir registros.
+    """
+    prefijo = prefijo.strip().lower()
+    if not prefijo:
+        return []
+
+    encontrados = {}
+    for campo in campos:
+        faltan = limite - len(encontrados)
+        if faltan <= 0:
+            break
+        for fila in _filas_con_prefijo(queryset, campo, prefijo, columnas, encontrados, faltan):
+            encontrados[fila['id']] = fila
+    return list(encontrados.values())
+
+
+async def abuscar_por_prefijo(queryset, campos, prefijo, columnas, limite=LIMITE_RESULTADOS):
+    """buscar_por_prefijo para vistas async (ORM asíncrono)."""
+    prefijo = prefijo.strip().lower()
+    if not prefijo:
+        return []
+
+    encontrados = {}
+    for campo in campos:
+        faltan = limite - len(encontrados)
+        if faltan <= 0:
+            break
+        async for fila in _filas_con_prefijo(queryset, campo, prefijo, columnas, encontrados, faltan):
+            encontrados[fila['id']] = fila
+    return list(encontrados.values())
+
+
+def texto_vehiculo(v):
+    return f"{v['marca']} {v['modelo']} ({v['anio']}) - {v['numero_serie']} - ${v['precio']}"
+
+
+def texto_persona(p):
+    return f"{p['nombre']} {p['apellido']}"
+
+
+def texto_proveedor(p):
+    return p['nombre_proveedor']
+
+
+# Por modelo: campos donde se busca, columnas que se leen y cómo se muestra.
+BUSQUEDA_VEHICULO = (
+    ['numero_serie', 'modelo'],
+    ['id', 'marca', 'modelo', 'anio', 'numero_serie', 'precio'],
+    texto_vehiculo,
+)
+BUSQUEDA_EMPLEADO = (['nombre', 'apellido'], ['id', 'nombre', 'apellido'], texto_persona)
+BUSQUEDA_CLIENTE = (['nombre', 'apellido'], ['id', 'nombre', 'apellido'], texto_persona)
+BUSQUEDA_PROVEEDOR = (['nombre_proveedor'], ['id', 'nombre_proveedor'], texto_proveedor)
+
+
+def leer_limite(request):
+    """?limite=<n> entre 1 y LIMITE_MAXIMO (LIMITE_RESULTADOS si no es válido)."""
+    try:
+        limite = int(request.GET.get('limite', LIMITE_RESULTADOS))
+    except (ValueError, TypeError):
+        limite = LIMITE_RESULTADOS
+    return max(1, min(limite, LIMITE_MAXIMO))
+
+
+def respuesta_autocompletar(request, queryset, busqueda):
+    """
+    JsonResponse con los resultados para ?q=<prefijo>&limite=<n>:
+        {"resultados": [{"id": 1, "texto": "..."}, ...]}
+    """
+    campos, columnas, texto = busqueda
+    limite = leer_limite(request)
+    filas = buscar_por_prefijo(queryset, campos, request.GET.get('q', ''), columnas, limite)
+    return JsonResponse({'resultados': [{'id': f['id'], 'texto': texto(f)} for f in filas]})
+
+
+async def arespuesta_autocompletar(request, queryset, busqueda):
+    """respuesta_autocompletar para vistas async."""
+    campos, columnas, texto = busqueda
+    limite = leer_limite(request)
+    filas = await abuscar_por_prefijo(queryset, campos, request.GET.get('q', ''), columnas, limite)
+    return JsonResponse({'resultados': [{'id': f['id'], 'texto': texto(f)} for f in filas]})
@@ -0,0 +1,126 @@
+# app_Ford/busqueda.py
+import re
+
+from django.db import connections, router
+from django.urls import reverse
+
+from .autocompletar import LIMITE_RESULTADOS, buscar_por_prefijo, texto_proveedor, texto_vehiculo
+from .models import Cliente, Proveedor, Vehiculo
+
+# ==========================================
+# BÚSQUEDA GLOBAL DE TEXTO
+# ==========================================
+# Busca clientes, proveedores y vehículos por cualquier palabra de sus
+# columnas de texto (nombre, teléfono, correo, serie, modelo...), con
+# coincidencia por prefijo y resultados ordenados por relevancia:
+#
+#     'mar lop'  ->  clientes con una palabra que empieza con 'mar' y otra
+#                    que empieza con 'lop' (María López, Mario Lopera...)
+#
+# Los índices los crea la migración 0006_busqueda_texto:
+#
+#   - SQLite: tablas virtuales FTS5 sincronizadas por triggers; se ordena
+#     por bm25(). Sin distinguir acentos ('jose' encuentra 'José').
+#   - PostgreSQL: índice GIN sobre to_tsvector('simple', ...); se ordena por
+#     ts_rank(). Aquí los acentos sí cuentan (no se usa 'unaccent').
+#
+# La relevancia se calcula sólo sobre las primeras CANDIDATOS coincidencias:
+# 'ma' coincide con media tabla y ordenarla completa cuesta cientos de ms
+# con un millón de filas. Una búsqueda más específica (dos palabras, el
+# teléfono, la serie) tiene menos coincidencias que eso y se ordena entera.
+#
+# Con otro motor se cae al autocompletado por prefijo (autocompletar.py).
+
+# Palabras de la búsqueda que se toman en cuenta.
+MAXIMO_TERMINOS = 8
+CANDIDATOS = 200
+
+
+def texto_cliente(c):
+    contacto = c['telefono'] or c['correo_electronico']
+    return f"{c['nombre']} {c['apellido']}" + (f' - {contacto}' if contacto else '')
+
+
+# tipo -> (modelo, índice, columnas indexadas, columnas que se leen, texto, vista de edición)
+# Las columnas indexadas deben coincidir con las de la migración.
+INDICES = {
+    'clientes': (
+        Cliente, 'busqueda_cliente',
+        ['nombre', 'apellido', 'telefono', 'correo_electronico'],
+        ['id', 'nombre', 'apellido', 'telefono', 'correo_electronico'],
+        texto_cliente, 'actualizar_cliente',
+    ),
+    'proveedores': (
+        Proveedor, 'busqueda_proveedor',
+        ['nombre_proveedor', 'telefono', 'email', 'producto'],
+        ['id', 'nombre_proveedor'],
+        texto_proveedor, 'actualizar_proveedor',
+    ),
+    'vehiculos': (
+        Vehiculo, 'busqueda_vehiculo',
+        ['numero_serie', 'modelo', 'marca', 'color'],
+        ['id', 'marca', 'modelo', 'anio', 'numero_serie', 'precio'],
+        texto_vehiculo, 'actualizar_vehiculo',
+    ),
+}
+
+
+def terminos(texto):
+    """Las palabras de 'texto' en minúsculas; nada de la sintaxis del motor pasa."""
+    return re.findall(r'\w+', (texto or '').lower())[:MAXIMO_TERMINOS]
+
+
+def _consulta_sqlite(tabla, indice, leer, palabras):
+    columnas = ', '.join(f't.{c}' for c in leer)
+    sql = (
+        f'SELECT {columnas} FROM ('
+        f'SELECT rowid AS id, bm25({indice}) AS rango FROM {indice} WHERE {indice} MATCH %s LIMIT {CANDIDATOS}'
+        f') candidatos JOIN "{tabla}" t ON t.id = candidatos.id ORDER BY candidatos.rango LIMIT %s'
+    )
+    return sql, ' '.join(f'"{p}"*' for p in palabras)
+
+
+def _consulta_postgresql(tabla, columnas_indice, leer, palabras):
+    # La misma expresión del índice GIN, o PostgreSQL no lo usa.
+    documento = " || ' ' || ".join(f"coalesce({c}, '')" for c in columnas_indice)
+    vector = f"to_tsvector('simple', {documento})"
+    columnas = ', '.join(leer)
+    sql = (
+        f'SELECT {columnas} FROM ('
+        f"SELECT {columnas}, ts_rank({vector}, consulta) AS rango FROM \"{tabla}\", to_tsquery('simple', %s) consulta "
+        f'WHERE {vector} @@ consulta LIMIT {CANDIDATOS}'
+        f') candidatos ORDER BY rango DESC LIMIT %s'
+    )
+    return sql, ' & '.join(f'{p}:*' for p in palabras)
+
+
+def buscar_en(tipo, palabras, limite=LIMITE_RESULTADOS):
+    """Hasta 'limite' filas de 'tipo' (ver INDICES) que contienen todas las 'palabras'."""
+    modelo, indice, columnas_indice, leer, _, _ = INDICES[tipo]
+    conexion = connections[router.db_for_read(modelo)]
+    tabla = modelo._meta.db_table
+    if conexion.vendor == 'sqlite':
+        sql, consulta = _consulta_sqlite(tabla, indice, leer, palabras)
+    elif conexion.vendor == 'postgresql':
+        sql, consulta = _consulta_postgresql(tabla, columnas_indice, leer, palabras)
+    else:
+        return buscar_por_prefijo(modelo.objects.all(), columnas_indice, palabras[0], leer, limite)
+    with conexion.cursor() as cursor:
+        cursor.execute(sql, [consulta, limite])
+        return [dict(zip(leer, fila)) for fila in cursor.fetchall()]
+
+
+def buscar(texto, tipos=None, limite=LIMITE_RESULTADOS):
+    """
+    Búsqueda global: {tipo: [{'id', 'texto', 'url'}]} para cada tipo de
+    'tipos' (todos si es None), con los más relevantes primero.
+    """
+    palabras = terminos(texto)
+    resultados = {}
+    for tipo in tipos or INDICES:
+        _, _, _, _, formato, vista = INDICES[tipo]
+        filas = buscar_en(tipo, palabras, limite) if palabras else []
+        resultados[tipo] = [
+            {'id': f['id'], 'texto': formato(f), 'url': reverse(vista, args=[f['id']])} for f in filas
+        ]
+    return resultados
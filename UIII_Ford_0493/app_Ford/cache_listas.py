@@ -0,0 +1,171 @@
+# app_Ford/cache_listas.py
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+# ==========================================
+# CACHÉ DE FRAGMENTOS DE LAS LISTAS
+# ==========================================
+# La tabla ya renderizada de una lista (con su paginación) se guarda en la
+# caché de Django, con una clave por lista + versión + parámetros GET
+# (página, filtros, orden). Cada lista tiene un número de versión; cuando
+# cambia un modelo del que depende, las señales post_save/post_delete
+# (signals.py) suben la versión y todas sus páginas quedan inválidas de
+# golpe, sin tener que buscarlas una por una. Las listas que no dependen
+# de ese modelo no se tocan.
+#
+# Las escrituras que no pasan por save()/delete() (queryset.update(),
+# bulk_create) deben llamar a invalidar_modelo() explícitamente.
+#
+# Además cada modelo tiene un "sello": la hora (en nanosegundos) de su
+# última escritura confirmada. Lo usan las respuestas condicionales
+# (ETag/Last-Modified, ver condicional.py) para saber si una página cambió
+# sin consultar la tabla.
+#
+# Versiones y sellos sólo sirven si todos los procesos ven la misma caché
+# (FORD_CACHE en settings): con la memoria de cada proceso, una escritura de
+# otro worker o de un comando no los renovaría aquí. En ese caso las tablas
+# no se guardan y no hay respuestas condicionales.
+
+DURACION = getattr(settings, 'FORD_CACHE_LISTAS_SEGUNDOS', 300)
+COMPARTIDA = getattr(settings, 'FORD_CACHE_COMPARTIDA', True)
+
+# Lista cacheada -> modelos que aparecen en su tabla.
+DEPENDENCIAS = {
+    'vehiculos': ['Vehiculo'],
+    'proveedores': ['Proveedor'],
+}
+
+_estadisticas = {}
+_candado = threading.Lock()
+
+
+def _contar(nombre, resultado):
+    with _candado:
+        conteo = _estadisticas.setdefault(nombre, {'aciertos': 0, 'fallos': 0})
+        conteo[resultado] += 1
+
+
+def estadisticas():
+    """
+    Aciertos, fallos y tasa de aciertos por lista (contadores de este proceso).
+    """
+    with _candado:
+        resultado = {}
+        for nombre, conteo in _estadisticas.items():
+            total = conteo['aciertos'] + conteo['fallos']
+            resultado[nombre] = dict(conteo, tasa=conteo['aciertos'] / total if total else 0.0)
+        return resultado
+
+
+def reiniciar_estadisticas():
+    with _candado:
+        _estadisticas.clear()
+
+
+def _clave_version(nombre):
+    return f'ford:listas:{nombre}:version'
+
+
+def _version(nombre):
+    # Si la versión no existe (caché vacía o expulsada) se inicia con la hora
+    # actual en nanosegundos, para no reutilizar nunca un número viejo.
+    return cache.get_or_set(_clave_version(nombre), time.time_ns(), timeout=None)
+
+
+def _siguiente(clave):
+    # La hora actual, nunca hacia atrás aunque el reloj de otro worker vaya
+    # detrás. No se usa incr(): en caché de archivos no es atómico entre
+    # procesos, y dos escrituras simultáneas podrían quedar con la misma versión.
+    cache.set(clave, max(time.time_ns(), (cache.get(clave) or 0) + 1), timeout=None)
+
+
+def invalidar_lista(nombre):
+    _siguiente(_clave_version(nombre))
+
+
+def _clave_sello(nombre_modelo):
+    return f'ford:sellos:{nombre_modelo}'
+
+
+def sello(nombre_modelo):
+    """
+    Hora (ns) de la última escritura de 'nombre_modelo'. Si la caché la
+    perdió se toma la hora actual: las páginas se consideran cambiadas, que
+    es lo seguro.
+    """
+    return cache.get_or_set(_clave_sello(nombre_modelo), time.time_ns(), timeout=None)
+
+
+def _renovar_sello(nombre_modelo):
+    _siguiente(_clave_sello(nombre_modelo))
+
+
+def invalidar_modelo(nombre_modelo):
+    """
+    Invalida todas las listas que muestran 'nombre_modelo' y renueva su
+    sello. Si hay una transacción abierta espera al COMMIT, para que ninguna
+    otra petición vuelva a guardar en caché los datos anteriores mientras
+    tanto.
+    """
+    transaction.on_commit(lambda: _renovar_sello(nombre_modelo))
+    for nombre, modelos in DEPENDENCIAS.items():
+        if nombre_modelo in modelos:
+            transaction.on_commit(lambda nombre=nombre: invalidar_lista(nombre))
+
+
+def _clave_tabla(request, nombre, version):
+    # El orden de los parámetros en la URL no cambia la página.
+    parametros = '&'.join(sorted(request.GET.urlencode().split('&')))
+    huella = hashlib.md5(parametros.encode()).hexdigest()
+    return f'ford:listas:{nombre}:{version}:{huella}'
+
+
+def tabla_cacheada(request, nombre, plantilla, construir_contexto):
+    """
+    Regresa (html, acierto) de la tabla de la lista 'nombre'. Si no está en
+    caché llama a construir_contexto() (que hace las consultas), renderiza
+    'plantilla' y guarda el resultado.
+    """
+    if not COMPARTIDA:
+        _contar(nombre, 'fallos')
+        return render_to_string(plantilla, construir_contexto(), request), False
+    clave = _clave_tabla(request, nombre, _version(nombre))
+
+    html = cache.get(clave)
+    if html is not None:
+        _contar(nombre, 'aciertos')
+        return mark_safe(html), True
+
+    _contar(nombre, 'fallos')
+    html = render_to_string(plantilla, construir_contexto(), request)
+    cache.set(clave, html, DURACION)
+    return html, False
+
+
+async def atabla_cacheada(request, nombre, plantilla, construir_contexto):
+    """
+    tabla_cacheada para vistas async: construir_contexto es una corrutina
+    y el contexto que regresa ya no debe consultar la base al renderizar.
+    """
+    if not COMPARTIDA:
+        _contar(nombre, 'fallos')
+        return render_to_string(plantilla, await construir_contexto(), request), False
+    version = await cache.aget_or_set(_clave_version(nombre), time.time_ns(), timeout=None)
+    clave = _clave_tabla(request, nombre, version)
+
+    html = await cache.aget(clave)
+    if html is not None:
+        _contar(nombre, 'aciertos')
+        return mark_safe(html), True
+
+    _contar(nombre, 'fallos')
+    html = render_to_string(plantilla, await construir_contexto(), request)
+    await cache.aset(clave, html, DURACION)
+    return html, False
@@ -0,0 +1,123 @@
+# app_Ford/condicional.py
+import hashlib
+import time
+from datetime import datetime, timezone
+from functools import wraps
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.views.decorators.http import condition
+
+from . import cache_listas
+from .enrutador import VENTANA_PRIMARIA, hay_replica
+
+# ==========================================
+# RESPUESTAS CONDICIONALES (ETag / Last-Modified)
+# ==========================================
+# Los tableros que se recargan solos piden la misma lista una y otra vez.
+# Las listas y formularios de edición decorados con @respuesta_condicional
+# mandan ETag y Last-Modified; si el navegador los regresa
+# (If-None-Match / If-Modified-Since) y ningún modelo que muestra la página
+# cambió, se responde 304 sin entrar a la vista: sin consultar la base ni
+# renderizar la plantilla.
+#
+# Saber si algo cambió sólo lee de la caché el sello de cada modelo
+# (cache_listas.sello), que se renueva al confirmar cualquier escritura, en
+# cualquier worker o comando. Por eso sólo hay validadores con una caché
+# compartida entre procesos (FORD_CACHE en settings). El ETag también cambia
+# con la URL completa (página, filtros), con la cookie CSRF (los formularios
+# llevan su token) y con cada despliegue.
+#
+# Una página con mensajes pendientes (messages.success/error antes de
+# redirigir) no lleva validadores: el 304 escondería el mensaje.
+#
+# Con réplica, durante VENTANA_PRIMARIA segundos después de una escritura
+# no se mandan validadores: la réplica podría no tener aún el cambio y la
+# página vieja quedaría guardada con el sello nuevo.
+
+
+def _version_del_codigo():
+    """Hora de modificación más reciente de los módulos y plantillas de la app."""
+    carpeta = Path(__file__).resolve().parent
+    archivos = [*carpeta.glob('*.py'), *(carpeta / 'Templates').rglob('*.html')]
+    return format(max(archivo.stat().st_mtime_ns for archivo in archivos), 'x')
+
+
+VERSION_CODIGO = _version_del_codigo()
+
+
+def _hay_mensajes(request):
+    """
+    True si la página debe mostrar mensajes pendientes (p. ej. después de una
+    acción masiva que no cambió nada): sin validadores, para que el navegador
+    no reuse la página guardada y el mensaje no salga en la siguiente.
+    len() lee los mensajes sin marcarlos como mostrados; con la cookie de
+    mensajes (FallbackStorage) no consulta la sesión si no hace falta.
+    """
+    return hasattr(request, '_messages') and len(get_messages(request)) > 0
+
+
+def _sellos(request, modelos):
+    """Sellos de 'modelos', o None si la página no debe tener validadores."""
+    if request.method not in ('GET', 'HEAD') or not cache_listas.COMPARTIDA:
+        return None
+    if _hay_mensajes(request):
+        return None
+    sellos = [cache_listas.sello(modelo) for modelo in modelos]
+    if hay_replica() and time.time_ns() - max(sellos) < VENTANA_PRIMARIA * 10 ** 9:
+        return None
+    return sellos
+
+
+def respuesta_condicional(*modelos):
+    """
+    Decorador para vistas (síncronas o async) que sólo muestran datos de
+    'modelos' (nombres de modelos de app_Ford). Las peticiones que no son
+    GET pasan sin cambios.
+    """
+    def etag(request, *args, **kwargs):
+        sellos = _sellos(request, modelos)
+        if sellos is None:
+            return None
+        partes = [request.get_full_path(), VERSION_CODIGO, request.COOKIES.get(settings.CSRF_COOKIE_NAME, '')]
+        return hashlib.md5('|'.join(partes + [str(s) for s in sellos]).encode()).hexdigest()
+
+    def ultima_modificacion(request, *args, **kwargs):
+        sellos = _sellos(request, modelos)
+        if sellos is None:
+            return None
+        segundo = max(sellos) // 10 ** 9
+        # Last-Modified se mide en segundos: si el segundo de la última
+        # escritura no ha terminado, otra escritura en ese mismo segundo no
+        # cambiaría la fecha. Mientras tanto sólo se manda el ETag.
+        if segundo >= time.time_ns() // 10 ** 9:
+            return None
+        return datetime.fromtimestamp(segundo, tz=timezone.utc)
+
+    def decorador(vista):
+        condicional = condition(etag_func=etag, last_modified_func=ultima_modificacion)(vista)
+
+        if iscoroutinefunction(vista):
+            @wraps(vista)
+            async def envoltura_async(request, *args, **kwargs):
+                return _revalidar_siempre(await condicional(request, *args, **kwargs))
+            return envoltura_async
+
+        @wraps(vista)
+        def envoltura(request, *args, **kwargs):
+            return _revalidar_siempre(condicional(request, *args, **kwargs))
+        return envoltura
+    return decorador
+
+
+def _revalidar_siempre(respuesta):
+    if respuesta.has_header('ETag'):
+        # Guardar pero preguntar siempre: sin esto el navegador puede
+        # reusar la página sin preguntar, calculando su frescura con
+        # Last-Modified.
+        patch_cache_control(respuesta, private=True, no_cache=True)
+        patch_vary_headers(respuesta, ['Cookie'])
+    return respuesta
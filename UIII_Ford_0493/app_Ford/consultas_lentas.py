@@ -0,0 +1,137 @@
+# app_Ford/consultas_lentas.py
+import json
+import logging
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import transaction
+
+from .instrumentacion import forma_sql
+
+# ==========================================
+# REGISTRO DE CONSULTAS LENTAS
+# ==========================================
+# Con FORD_CONSULTA_LENTA_MS definido, toda consulta (ORM o SQL crudo) que
+# tarde más que ese umbral se escribe en el log 'app_Ford.consultas_lentas'
+# como una línea JSON con: el SQL, sus parámetros, la vista que la ejecutó
+# y el plan de ejecución (EXPLAIN QUERY PLAN en SQLite, EXPLAIN en
+# PostgreSQL), obtenido en ese momento sobre la misma conexión.
+#
+# El vigilante se instala en cada conexión nueva (señal connection_created,
+# ver apps.py), así que también cubre los comandos de manage.py; la vista
+# la aporta ConsultasLentasMiddleware.
+#
+# 'manage.py resumir_consultas_lentas' agrupa el log por forma de consulta.
+
+logger = logging.getLogger('app_Ford.consultas_lentas')
+
+_vista = ContextVar('ford_vista_actual', default=None)
+# Evita que el EXPLAIN pase otra vez por el vigilante.
+_explicando = ContextVar('ford_explicando', default=False)
+
+MAXIMO_PARAMETROS = 50
+SENTENCIAS_EXPLICABLES = ('select', 'with', 'update', 'delete', 'insert')
+
+
+def umbral_ms():
+    return getattr(settings, 'FORD_CONSULTA_LENTA_MS', None)
+
+
+def plan_de_ejecucion(connection, sql, params):
+    """
+    Lista de líneas del plan de 'sql', o None si no se pudo obtener.
+    """
+    if not sql.lstrip().lower().startswith(SENTENCIAS_EXPLICABLES):
+        return None
+    if connection.vendor == 'sqlite':
+        prefijo = 'EXPLAIN QUERY PLAN '
+    elif connection.vendor == 'postgresql':
+        prefijo = 'EXPLAIN '
+    else:
+        return None
+    token = _explicando.set(True)
+    try:
+        # Dentro de una transacción el EXPLAIN va en un savepoint: si falla
+        # no debe dejar la transacción de la vista en estado de error.
+        if connection.in_atomic_block:
+            bloque = transaction.atomic(using=connection.alias)
+        else:
+            bloque = nullcontext()
+        with bloque, connection.cursor() as cursor:
+            cursor.execute(prefijo + sql, params)
+            filas = cursor.fetchall()
+    except Exception:
+        return None
+    finally:
+        _explicando.reset(token)
+    if connection.vendor == 'sqlite':
+        # (id, padre, sin_uso, detalle)
+        return [fila[-1] for fila in filas]
+    return [fila[0] for fila in filas]
+
+
+def _parametros(params):
+    if params is None:
+        return None
+    lista = list(params) if isinstance(params, (list, tuple)) else [params]
+    return [repr(valor)[:200] for valor in lista[:MAXIMO_PARAMETROS]]
+
+
+def vigilar_consulta(execute, sql, params, many, context):
+    """execute_wrapper que registra las consultas que superan el umbral."""
+    if _explicando.get():
+        return execute(sql, params, many, context)
+    inicio = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duracion_ms = (time.perf_counter() - inicio) * 1000
+        umbral = umbral_ms()
+        if umbral is not None and duracion_ms >= umbral:
+            connection = context['connection']
+            registro = {
+                'fecha': datetime.now(timezone.utc).isoformat(timespec='milliseconds'),
+                'ms': round(duracion_ms, 2),
+                'alias': connection.alias,
+                'vista': _vista.get(),
+                'forma': forma_sql(sql),
+                'sql': sql,
+                'parametros': None if many else _parametros(params),
+                'plan': None if many else plan_de_ejecucion(connection, sql, params),
+            }
+            logger.warning(json.dumps(registro, ensure_ascii=False, default=str))
+
+
+def instalar_vigilante(sender, connection, **kwargs):
+    """Receptor de connection_created."""
+    # Al principio de la lista: connection.execute_wrapper() quita el último
+    # al salir, y la conexión puede abrirse dentro de uno de esos bloques.
+    if vigilar_consulta not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, vigilar_consulta)
+
+
+class ConsultasLentasMiddleware:
+    """
+    Anota el nombre de la vista para el registro de consultas lentas.
+    Django lo descarta si FORD_CONSULTA_LENTA_MS no está definido.
+    """
+
+    def __init__(self, get_response):
+        if umbral_ms() is None:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _vista.set(request.path)
+        try:
+            return self.get_response(request)
+        finally:
+            _vista.reset(token)
+
+    def process_view(self, request, vista, args, kwargs):
+        coincidencia = request.resolver_match
+        _vista.set(coincidencia.view_name if coincidencia else request.path)
@@ -0,0 +1,189 @@
+# app_Ford/enrutador.py
+import time
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.http import StreamingHttpResponse
+
+# ==========================================
+# ENRUTADOR LECTURA / ESCRITURA
+# ==========================================
+# Las vistas de sólo lectura (listas, exportaciones, reportes) se decoran con
+# @lectura_en_replica y sus consultas van a la base 'replica'. Todo lo demás
+# (escrituras, formularios, lecturas dentro de una vista que escribe) va a
+# 'default', la primaria.
+#
+# Lectura de lo recién escrito: cuando una petición escribe, la sesión recibe
+# una "ventana" de FORD_VENTANA_PRIMARIA segundos durante la cual sus lecturas
+# también van a la primaria, para que quien acaba de registrar una venta la
+# vea en la lista aunque la réplica todavía no la tenga.
+#
+# Si no hay alias 'replica' en DATABASES, todo va a 'default'.
+
+ALIAS_PRIMARIA = 'default'
+ALIAS_REPLICA = 'replica'
+CLAVE_SESION = 'ford_primaria_hasta'
+VENTANA_PRIMARIA = getattr(settings, 'FORD_VENTANA_PRIMARIA', 5)
+
+# Estado de la petición actual. Es un diccionario (mutable) para que los
+# cambios hechos dentro de la vista se vean en el middleware aunque la vista
+# corra en otro contexto (vistas síncronas bajo ASGI).
+_estado = ContextVar('ford_estado_enrutador', default=None)
+
+
+def _destino(alias):
+    ajustes = connections[alias].settings_dict
+    return ajustes.get('HOST'), ajustes.get('PORT'), str(ajustes['NAME'])
+
+
+def hay_replica():
+    """
+    True si hay una réplica distinta de la primaria. En las pruebas la
+    réplica es espejo de 'default' (TEST MIRROR): la misma base por otra
+    conexión, que no vería la transacción de la prueba.
+    """
+    if ALIAS_REPLICA not in settings.DATABASES:
+        return False
+    return _destino(ALIAS_REPLICA) != _destino(ALIAS_PRIMARIA)
+
+
+def _estado_actual():
+    estado = _estado.get()
+    return estado if estado is not None else {}
+
+
+def alias_lectura():
+    """Alias que usarán las lecturas en este momento."""
+    estado = _estado_actual()
+    if estado.get('replica') and not estado.get('escribio') and hay_replica():
+        return ALIAS_REPLICA
+    return ALIAS_PRIMARIA
+
+
+class EnrutadorLecturaEscritura:
+    """
+    Router de Django (DATABASE_ROUTERS). Sólo decide para los modelos de
+    app_Ford; sesiones, usuarios, etc. siempre van a la primaria.
+    """
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label != 'app_Ford':
+            return ALIAS_PRIMARIA
+        return alias_lectura()
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label == 'app_Ford':
+            _estado_actual()['escribio'] = True
+        return ALIAS_PRIMARIA
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Primaria y réplica tienen los mismos datos.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # La réplica es una copia: sólo se migra la primaria.
+        return db != ALIAS_REPLICA
+
+
+def _iterar_con_estado(estado, contenido):
+    """
+    El contenido de una StreamingHttpResponse se consume después de que la
+    vista terminó; se restablece el estado en cada trozo para que las
+    consultas del iterador sigan yendo a la réplica.
+    """
+    iterador = iter(contenido)
+    while True:
+        token = _estado.set(estado)
+        try:
+            trozo = next(iterador)
+        except StopIteration:
+            return
+        finally:
+            _estado.reset(token)
+        yield trozo
+
+
+async def _aiterar_con_estado(estado, contenido):
+    """_iterar_con_estado para el contenido asíncrono (vistas async)."""
+    iterador = aiter(contenido)
+    while True:
+        token = _estado.set(estado)
+        try:
+            trozo = await anext(iterador)
+        except StopAsyncIteration:
+            return
+        finally:
+            _estado.reset(token)
+        yield trozo
+
+
+def _con_estado(estado, respuesta):
+    if isinstance(respuesta, StreamingHttpResponse):
+        if respuesta.is_async:
+            respuesta.streaming_content = _aiterar_con_estado(estado, respuesta.streaming_content)
+        else:
+            respuesta.streaming_content = _iterar_con_estado(estado, respuesta.streaming_content)
+    return respuesta
+
+
+def lectura_en_replica(vista):
+    """
+    Decorador para vistas de sólo lectura (síncronas o async): sus consultas
+    van a la réplica, salvo que la sesión esté dentro de la ventana posterior
+    a una escritura.
+    """
+    if iscoroutinefunction(vista):
+        @wraps(vista)
+        async def envoltura_async(request, *args, **kwargs):
+            hasta = await request.session.aget(CLAVE_SESION, 0) if hasattr(request, 'session') else 0
+            padre = _estado_actual()
+            estado = {'replica': time.time() >= hasta, 'escribio': padre.get('escribio', False)}
+            token = _estado.set(estado)
+            try:
+                respuesta = await vista(request, *args, **kwargs)
+            finally:
+                _estado.reset(token)
+                if estado['escribio']:
+                    padre['escribio'] = True
+            return _con_estado(estado, respuesta)
+        return envoltura_async
+
+    @wraps(vista)
+    def envoltura(request, *args, **kwargs):
+        hasta = request.session.get(CLAVE_SESION, 0) if hasattr(request, 'session') else 0
+        padre = _estado_actual()
+        estado = {'replica': time.time() >= hasta, 'escribio': padre.get('escribio', False)}
+        token = _estado.set(estado)
+        try:
+            respuesta = vista(request, *args, **kwargs)
+        finally:
+            _estado.reset(token)
+            if estado['escribio']:
+                padre['escribio'] = True
+        return _con_estado(estado, respuesta)
+    return envoltura
+
+
+class PrimariaTrasEscrituraMiddleware:
+    """
+    Marca en la sesión la ventana de lectura desde la primaria cuando la
+    petición escribió en algún modelo de app_Ford. Debe ir después de
+    SessionMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        estado = {}
+        token = _estado.set(estado)
+        try:
+            respuesta = self.get_response(request)
+        finally:
+            _estado.reset(token)
+        if estado.get('escribio') and hay_replica():
+            request.session[CLAVE_SESION] = time.time() + VENTANA_PRIMARIA
+        return respuesta
@@ -0,0 +1,164 @@
+# app_Ford/exportar.py
+import csv
+import heapq
+import json
+from operator import attrgetter
+
+from django.http import StreamingHttpResponse
+
+# ==========================================
+# EXPORTACIÓN EN STREAMING (CSV / JSONL)
+# ==========================================
+# Las filas se leen con queryset.iterator(chunk_size=...) y se escriben una
+# por una en la respuesta: el primer byte sale de inmediato y la memoria no
+# crece con el número de registros exportados.
+#
+# Las vistas async (vistas_async.py) leen con aiterator() y la respuesta es
+# un iterador asíncrono: mientras el cliente recibe, el worker atiende otras
+# peticiones. Ahí las líneas se juntan en mensajes de hasta TAMANO_MENSAJE
+# bytes, porque cada trozo es un mensaje ASGI.
+#
+# Si el filtro de fechas incluye el archivo (ver archivo.py) se reciben dos
+# querysets, ya ordenados por fecha e id, y sus filas se intercalan en ese
+# orden mientras se leen.
+
+TAMANO_BLOQUE = 2000
+TAMANO_MENSAJE = 64 * 1024
+
+COLUMNAS_VENTA = [
+    'id', 'folio', 'fecha_venta', 'vehiculo_id', 'vehiculo', 'numero_serie',
+    'empleado_id', 'empleado', 'cliente_nombre', 'cliente_telefono',
+    'total', 'metodo_pago',
+]
+
+COLUMNAS_SERVICIO = [
+    'id', 'fecha_servicio', 'tipo_servicio', 'costo_servicio',
+    'vehiculo_id', 'vehiculo', 'numero_serie',
+    'cliente_id', 'cliente', 'proveedor_id', 'proveedor',
+]
+
+
+class _Eco:
+    """Pseudo-archivo: csv.writer escribe aquí y recibimos la línea de vuelta."""
+
+    def write(self, valor):
+        return valor
+
+
+def _fila_venta(v):
+    vehiculo = v.vehiculo
+    return [
+        v.id, v.folio, v.fecha_venta, v.vehiculo_id,
+        f"{vehiculo.marca} {vehiculo.modelo} ({vehiculo.anio})", vehiculo.numero_serie,
+        v.empleado_id, str(v.empleado) if v.empleado_id else None,
+        v.cliente_nombre, v.cliente_telefono, v.total, v.metodo_pago,
+    ]
+
+
+def _fila_servicio(s):
+    vehiculo = s.vehiculo
+    return [
+        s.id, s.fecha_servicio, s.tipo_servicio, s.costo_servicio,
+        s.vehiculo_id, f"{vehiculo.marca} {vehiculo.modelo} ({vehiculo.anio})",
+        vehiculo.numero_serie,
+        s.cliente_id, str(s.cliente) if s.cliente_id else None,
+        s.proveedor_id, s.proveedor.nombre_proveedor if s.proveedor_id else None,
+    ]
+
+
+_ORDEN_VENTA = attrgetter('fecha_venta', 'id')
+_ORDEN_SERVICIO = attrgetter('fecha_servicio', 'id')
+
+
+def _objetos(querysets, clave):
+    iteradores = [queryset.iterator(chunk_size=TAMANO_BLOQUE) for queryset in querysets]
+    return iteradores[0] if len(iteradores) == 1 else heapq.merge(*iteradores, key=clave)
+
+
+async def _aobjetos(querysets, clave):
+    """_objetos con aiterator(): heapq.merge no acepta iteradores async."""
+    iteradores = [queryset.aiterator(chunk_size=TAMANO_BLOQUE) for queryset in querysets]
+    cabezas = {}
+    for indice, iterador in enumerate(iteradores):
+        objeto = await anext(iterador, None)
+        if objeto is not None:
+            cabezas[indice] = objeto
+    while cabezas:
+        indice = min(cabezas, key=lambda i: clave(cabezas[i]))
+        yield cabezas[indice]
+        objeto = await anext(iteradores[indice], None)
+        if objeto is None:
+            del cabezas[indice]
+        else:
+            cabezas[indice] = objeto
+
+
+def filas_venta(*querysets):
+    for v in _objetos(querysets, _ORDEN_VENTA):
+        yield _fila_venta(v)
+
+
+def filas_servicio(*querysets):
+    for s in _objetos(querysets, _ORDEN_SERVICIO):
+        yield _fila_servicio(s)
+
+
+async def afilas_venta(*querysets):
+    async for v in _aobjetos(querysets, _ORDEN_VENTA):
+        yield _fila_venta(v)
+
+
+async def afilas_servicio(*querysets):
+    async for s in _aobjetos(querysets, _ORDEN_SERVICIO):
+        yield _fila_servicio(s)
+
+
+def _linea_jsonl(columnas, fila):
+    return json.dumps(dict(zip(columnas, fila)), default=str, ensure_ascii=False) + '\n'
+
+
+def _lineas_csv(columnas, filas):
+    escritor = csv.writer(_Eco())
+    yield escritor.writerow(columnas)
+    for fila in filas:
+        yield escritor.writerow(fila)
+
+
+def _lineas_jsonl(columnas, filas):
+    for fila in filas:
+        yield _linea_jsonl(columnas, fila)
+
+
+async def _alineas(formato, columnas, filas):
+    """Las líneas de 'filas' (iterador async) en mensajes de ~TAMANO_MENSAJE bytes."""
+    escritor = csv.writer(_Eco())
+    mensaje = [escritor.writerow(columnas)] if formato == 'csv' else []
+    tamano = 0
+    async for fila in filas:
+        linea = escritor.writerow(fila) if formato == 'csv' else _linea_jsonl(columnas, fila)
+        mensaje.append(linea)
+        tamano += len(linea)
+        if tamano >= TAMANO_MENSAJE:
+            yield ''.join(mensaje)
+            mensaje, tamano = [], 0
+    if mensaje:
+        yield ''.join(mensaje)
+
+
+def respuesta_exportacion(columnas, filas, formato, nombre):
+    """
+    Regresa una StreamingHttpResponse con 'filas' en CSV o JSONL. 'filas'
+    puede ser un iterador async (afilas_venta, afilas_servicio).
+    """
+    if formato != 'jsonl':
+        formato = 'csv'
+    if hasattr(filas, '__aiter__'):
+        contenido = _alineas(formato, columnas, filas)
+    elif formato == 'jsonl':
+        contenido = _lineas_jsonl(columnas, filas)
+    else:
+        contenido = _lineas_csv(columnas, filas)
+    tipo = 'application/x-ndjson' if formato == 'jsonl' else 'text/csv; charset=utf-8'
+    respuesta = StreamingHttpResponse(contenido, content_type=tipo)
+    respuesta['Content-Disposition'] = f'attachment; filename="{nombre}.{formato}"'
+    return respuesta
@@ -0,0 +1,96 @@
+# app_Ford/filtros.py
+from datetime import date
+
+# ==========================================
+# FILTROS Y ORDENAMIENTO DE LAS VISTAS ver_*
+# ==========================================
+# Cada lista declara qué parámetros GET acepta y a qué búsqueda del ORM
+# corresponden. Sólo se permiten filtros y órdenes que tienen un índice
+# detrás (ver 'Meta.indexes' en models.py), para que la consulta sea una
+# búsqueda por índice y no un recorrido completo de la tabla.
+#
+# Las órdenes siempre terminan en 'id' para que la paginación por cursor
+# tenga un orden total.
+
+
+def _texto(valor):
+    valor = valor.strip()
+    if not valor:
+        raise ValueError('vacío')
+    return valor
+
+
+FILTROS_VENTA = {
+    'desde': ('fecha_venta__gte', date.fromisoformat),
+    'hasta': ('fecha_venta__lte', date.fromisoformat),
+    'empleado': ('empleado_id', int),
+    'metodo_pago': ('metodo_pago', _texto),
+}
+
+ORDENES_VENTA = {
+    'recientes': ['-fecha_venta', '-id'],
+    'antiguas': ['fecha_venta', 'id'],
+}
+
+# 'reporte_ventas' lee el resumen diario (ver resumenes.py).
+FILTROS_REPORTE = {
+    'desde': ('fecha__gte', date.fromisoformat),
+    'hasta': ('fecha__lte', date.fromisoformat),
+}
+
+FILTROS_VEHICULO = {
+    'marca': ('marca', _texto),
+    'modelo': ('modelo', _texto),
+    'anio': ('anio', int),
+    'anio_desde': ('anio__gte', int),
+    'anio_hasta': ('anio__lte', int),
+}
+
+ORDENES_VEHICULO = {
+    'id': ['id'],
+    'marca': ['marca', 'modelo', 'anio', 'id'],
+    'anio': ['-anio', '-id'],
+}
+
+FILTROS_SERVICIO = {
+    'vehiculo': ('vehiculo_id', int),
+    'proveedor': ('proveedor_id', int),
+    'desde': ('fecha_servicio__gte', date.fromisoformat),
+    'hasta': ('fecha_servicio__lte', date.fromisoformat),
+}
+
+ORDENES_SERVICIO = {
+    'recientes': ['-fecha_servicio', '-id'],
+    'antiguos': ['fecha_servicio', 'id'],
+}
+
+
+def aplicar_filtros(request, queryset, filtros):
+    """
+    Aplica a 'queryset' los parámetros GET declarados en 'filtros'.
+    Los valores vacíos o inválidos se ignoran. Regresa el queryset filtrado
+    y un diccionario con los valores aplicados (para rellenar el formulario).
+    """
+    aplicados = {}
+    condiciones = {}
+    for parametro, (busqueda, convertir) in filtros.items():
+        valor = request.GET.get(parametro)
+        if valor is None:
+            continue
+        try:
+            condiciones[busqueda] = convertir(valor)
+        except (ValueError, TypeError):
+            continue
+        aplicados[parametro] = valor.strip()
+    return queryset.filter(**condiciones), aplicados
+
+
+def elegir_orden(request, ordenes, por_defecto):
+    """
+    Regresa (clave, lista de campos) del orden pedido en ?orden=,
+    o el orden por defecto si no es uno de los permitidos.
+    """
+    clave = request.GET.get('orden')
+    if clave not in ordenes:
+        clave = por_defecto
+    return clave, ordenes[clave]
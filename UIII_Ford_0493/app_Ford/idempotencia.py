@@ -0,0 +1,72 @@
+# app_Ford/idempotencia.py
+import re
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import ClaveIdempotencia
+
+# ==========================================
+# CLAVES DE IDEMPOTENCIA DE LAS ALTAS
+# ==========================================
+# Un doble clic o el reintento de una tableta mandan dos veces el mismo
+# POST de agregar_venta / agregar_servicio, o el mismo lote de api_lote
+# después de un timeout. Cada formulario lleva una clave nueva en un campo
+# oculto (o el cliente manda el encabezado Idempotency-Key; en api_lote la
+# clave es de todo el lote); la vista la guarda en ClaveIdempotencia en la
+# misma transacción que el alta. Si la clave vuelve a llegar, la vista
+# responde lo mismo que la primera vez sin crear nada ni tocar el stock.
+#
+# Buscar la clave es una búsqueda en el índice único (ruta, clave). Si dos
+# peticiones con la misma clave llegan a la vez, la segunda choca con ese
+# índice al guardarla, su transacción se deshace y responde como repetida.
+#
+# Las peticiones sin clave funcionan como siempre.
+
+HORAS = getattr(settings, 'FORD_IDEMPOTENCIA_HORAS', 24)
+CAMPO = 'clave_idempotencia'
+ENCABEZADO = 'HTTP_IDEMPOTENCY_KEY'
+_VALIDA = re.compile(r'[A-Za-z0-9_.:-]{8,64}')
+
+
+def nueva_clave():
+    """Clave para el campo oculto de un formulario nuevo."""
+    return uuid.uuid4().hex
+
+
+def clave_de(request):
+    """La clave de la petición (encabezado o campo del formulario), o None si no trae una válida."""
+    clave = request.META.get(ENCABEZADO) or request.POST.get(CAMPO)
+    return clave if clave and _VALIDA.fullmatch(clave) else None
+
+
+def buscar(ruta, clave):
+    """
+    (objeto_id, resultado) de la primera petición con esta clave, o None si
+    es nueva.
+    """
+    return next(iter(
+        ClaveIdempotencia.objects.filter(ruta=ruta, clave=clave).values_list('objeto_id', 'resultado')[:1]
+    ), None)
+
+
+def registrar(ruta, clave, objeto_id=None, resultado=None):
+    """
+    Guarda la clave con lo que creó la petición (o, para un lote, su
+    respuesta completa); va dentro de la transacción del alta.
+    """
+    ClaveIdempotencia.objects.create(ruta=ruta, clave=clave, objeto_id=objeto_id, resultado=resultado)
+
+
+def repetida(respuesta):
+    """Marca la respuesta de una petición repetida."""
+    respuesta['Idempotent-Replayed'] = 'true'
+    return respuesta
+
+
+def purgar(ahora=None):
+    """Borra las claves de más de HORAS horas. Regresa cuántas borró."""
+    corte = (ahora or timezone.now()) - timedelta(hours=HORAS)
+    return ClaveIdempotencia.objects.filter(fecha__lt=corte).delete()[0]
@@ -0,0 +1,166 @@
+# app_Ford/instrumentacion.py
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.base import Template
+
+# ==========================================
+# INSTRUMENTACIÓN POR PETICIÓN
+# ==========================================
+# Middleware opcional (FORD_INSTRUMENTACION=1) que mide en cada petición:
+#   - número de consultas SQL y tiempo total en la base de datos, con
+#     connection.execute_wrapper (cubre ORM y SQL crudo, todas las bases);
+#   - tiempo de render de plantillas, sin contar las consultas que se
+#     ejecutan desde la plantilla (querysets perezosos);
+#   - consultas repetidas: la misma forma de SQL (sin parámetros) ejecutada
+#     FORD_INSTRUMENTACION_REPETIDAS veces o más, la huella típica de un N+1.
+#
+# Los valores salen en la cabecera Server-Timing (visible en las
+# herramientas del navegador) y en una línea JSON por petición en el log
+# 'app_Ford.instrumentacion' (archivo rotativo, ver LOGGING en settings).
+
+logger = logging.getLogger('app_Ford.instrumentacion')
+
+# Medición de la petición en curso (None fuera del middleware).
+_medicion = ContextVar('ford_medicion', default=None)
+
+_LISTA_PARAMETROS = re.compile(r'\(\s*%s(?:\s*,\s*%s)*\s*\)')
+_ESPACIOS = re.compile(r'\s+')
+
+
+def forma_sql(sql):
+    """
+    SQL sin variaciones que no cambian la consulta: 'IN (%s, %s, %s)' se
+    reduce a 'IN (...)' y se normalizan los espacios.
+    """
+    return _ESPACIOS.sub(' ', _LISTA_PARAMETROS.sub('(...)', sql)).strip()
+
+
+class Medicion:
+    """
+    Acumula las métricas de una petición. Es también el execute_wrapper
+    que se instala en las conexiones.
+    """
+
+    def __init__(self):
+        self.consultas = 0
+        self.tiempo_bd = 0.0
+        self.tiempo_plantillas = 0.0
+        self.formas = Counter()
+        self.en_plantilla = False
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.consultas += 1
+            self.tiempo_bd += time.perf_counter() - inicio
+            self.formas[forma_sql(sql)] += 1
+
+    def repetidas(self, minimo):
+        """{forma: veces} de las consultas ejecutadas 'minimo' veces o más."""
+        return {forma: veces for forma, veces in self.formas.most_common() if veces >= minimo}
+
+
+# ==========================================
+# TIEMPO DE PLANTILLAS
+# ==========================================
+# Django no tiene un gancho para medir el render fuera de las pruebas; se
+# envuelve Template.render una sola vez. Sólo se mide la plantilla más
+# externa ({% include %} vuelve a llamar a render).
+
+_render_original = Template.render
+
+
+def _render_medido(self, context):
+    medicion = _medicion.get()
+    if medicion is None or medicion.en_plantilla:
+        return _render_original(self, context)
+    medicion.en_plantilla = True
+    inicio = time.perf_counter()
+    bd_antes = medicion.tiempo_bd
+    try:
+        return _render_original(self, context)
+    finally:
+        medicion.en_plantilla = False
+        transcurrido = time.perf_counter() - inicio
+        medicion.tiempo_plantillas += transcurrido - (medicion.tiempo_bd - bd_antes)
+
+
+def instalar_medicion_plantillas():
+    if Template.render is not _render_medido:
+        Template.render = _render_medido
+
+
+def _ms(segundos):
+    return round(segundos * 1000, 2)
+
+
+def server_timing(medicion, total, repetidas):
+    partes = [
+        f'bd;dur={_ms(medicion.tiempo_bd)};desc="{medicion.consultas} consultas"',
+        f'plantillas;dur={_ms(medicion.tiempo_plantillas)}',
+        f'total;dur={_ms(total)}',
+    ]
+    if repetidas:
+        partes.append(f'repetidas;desc="{len(repetidas)} consultas repetidas (N+1)"')
+    return ', '.join(partes)
+
+
+class InstrumentacionMiddleware:
+    """
+    Debe ir primero en MIDDLEWARE para que 'total' cubra toda la petición.
+    Si FORD_INSTRUMENTACION está apagado Django lo descarta al arrancar.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'FORD_INSTRUMENTACION', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.minimo_repetidas = getattr(settings, 'FORD_INSTRUMENTACION_REPETIDAS', 5)
+        instalar_medicion_plantillas()
+
+    def __call__(self, request):
+        medicion = Medicion()
+        token = _medicion.set(medicion)
+        inicio = time.perf_counter()
+        try:
+            with ExitStack() as pila:
+                for alias in connections:
+                    pila.enter_context(connections[alias].execute_wrapper(medicion))
+                respuesta = self.get_response(request)
+        finally:
+            _medicion.reset(token)
+        total = time.perf_counter() - inicio
+
+        repetidas = medicion.repetidas(self.minimo_repetidas)
+        respuesta['Server-Timing'] = server_timing(medicion, total, repetidas)
+        self.registrar(request, respuesta, medicion, total, repetidas)
+        return respuesta
+
+    def registrar(self, request, respuesta, medicion, total, repetidas):
+        coincidencia = getattr(request, 'resolver_match', None)
+        registro = {
+            'fecha': datetime.now(timezone.utc).isoformat(timespec='milliseconds'),
+            'metodo': request.method,
+            'ruta': request.path,
+            'vista': coincidencia.view_name if coincidencia else None,
+            'estado': respuesta.status_code,
+            'total_ms': _ms(total),
+            'bd_ms': _ms(medicion.tiempo_bd),
+            'plantillas_ms': _ms(medicion.tiempo_plantillas),
+            'consultas': medicion.consultas,
+            'repetidas': [{'sql': forma[:500], 'veces': veces} for forma, veces in repetidas.items()],
+        }
+        nivel = logging.WARNING if repetidas else logging.INFO
+        logger.log(nivel, json.dumps(registro, ensure_ascii=False))
@@ -0,0 +1,258 @@
+# app_Ford/inventario.py
+from datetime import datetime, timedelta, timezone as tz
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, DateTimeField, Exists, F, IntegerField, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from . import tablero
+from .cache_listas import invalidar_modelo
+from .models import MovimientoInventario, SaldoInventario, Vehiculo
+
+# ==========================================
+# MOVIMIENTOS DE STOCK ATÓMICOS
+# ==========================================
+# El stock nunca se modifica con "leer, restar en Python y guardar": con
+# varios vendedores a la vez, dos peticiones pueden leer el mismo valor y
+# una de las dos actualizaciones se pierde (o se vende una unidad que ya no
+# existe). En su lugar la base de datos hace la comprobación y el cambio en
+# una sola sentencia:
+#
+#     UPDATE vehiculo SET cantidad_disponible = cantidad_disponible - 1
+#     WHERE id = :id AND cantidad_disponible > 0
+#
+# Estas funciones deben llamarse dentro de transaction.atomic() junto con
+# el INSERT/DELETE de la venta, para que ambos cambios se confirmen o se
+# deshagan juntos.
+#
+# Cada cambio además agrega una fila a MovimientoInventario (entrada,
+# venta, devolución o ajuste), en la misma transacción. La bitácora sólo
+# recibe INSERT: es la historia del stock, y 'cantidad_disponible' es su
+# total acumulado, que es lo que leen las vistas y lo que protege el UPDATE
+# condicional de arriba.
+
+
+def _registrar(movimientos):
+    """Agrega los movimientos [(vehiculo_id, tipo, cantidad, nota)] a la bitácora."""
+    ahora = timezone.now()
+    MovimientoInventario.objects.bulk_create([
+        MovimientoInventario(vehiculo_id=vehiculo_id, tipo=tipo, cantidad=cantidad, nota=nota or '', fecha=ahora)
+        for vehiculo_id, tipo, cantidad, nota in movimientos if cantidad
+    ])
+
+
+def registrar_entrada(vehiculo_id, cantidad, nota=''):
+    """Registra unidades que ya se sumaron al vehículo (el alta de un vehículo nuevo)."""
+    _registrar([(vehiculo_id, 'entrada', cantidad, nota)])
+
+
+def reservar_unidad(vehiculo_id, cantidad=1, nota=''):
+    """
+    Descuenta 'cantidad' unidades del vehículo sólo si hay suficientes.
+    Regresa True si se reservaron, False si no había stock.
+    """
+    actualizados = Vehiculo.objects.filter(
+        id=vehiculo_id, cantidad_disponible__gte=cantidad
+    ).update(cantidad_disponible=F('cantidad_disponible') - cantidad, fecha_actualizacion=timezone.now())
+    if actualizados:
+        _registrar([(vehiculo_id, 'venta', -cantidad, nota)])
+        # update() no dispara post_save: se invalida la caché a mano.
+        invalidar_modelo('Vehiculo')
+        tablero.invalidar()
+    return actualizados == 1
+
+
+def devolver_unidad(vehiculo_id, cantidad=1, nota=''):
+    """
+    Regresa 'cantidad' unidades al inventario del vehículo.
+    """
+    actualizados = Vehiculo.objects.filter(id=vehiculo_id).update(
+        cantidad_disponible=F('cantidad_disponible') + cantidad, fecha_actualizacion=timezone.now()
+    )
+    if actualizados:
+        _registrar([(vehiculo_id, 'devolucion', cantidad, nota)])
+    invalidar_modelo('Vehiculo')
+    tablero.invalidar()
+
+
+def reservar_unidades(cantidades, nota=''):
+    """
+    Versión por lotes de reservar_unidad: 'cantidades' es {vehiculo_id: n}.
+    Hace un UPDATE condicional por vehículo (no uno por unidad) y regresa el
+    conjunto de vehículos cuya reserva se aplicó completa.
+    """
+    reservados = set()
+    for vehiculo_id, cantidad in cantidades.items():
+        actualizados = Vehiculo.objects.filter(
+            id=vehiculo_id, cantidad_disponible__gte=cantidad
+        ).update(cantidad_disponible=F('cantidad_disponible') - cantidad, fecha_actualizacion=timezone.now())
+        if actualizados:
+            reservados.add(vehiculo_id)
+    if reservados:
+        _registrar([(vehiculo_id, 'venta', -cantidades[vehiculo_id], nota) for vehiculo_id in reservados])
+        invalidar_modelo('Vehiculo')
+        tablero.invalidar()
+    return reservados
+
+
+def devolver_unidades(cantidades, nota=''):
+    """
+    Versión por lotes de devolver_unidad: 'cantidades' es {vehiculo_id: n}.
+    Un solo UPDATE con CASE suma a cada vehículo sus unidades.
+    """
+    if not cantidades:
+        return
+    Vehiculo.objects.filter(id__in=cantidades).update(
+        cantidad_disponible=F('cantidad_disponible') + Case(
+            *[When(id=vehiculo_id, then=Value(cantidad)) for vehiculo_id, cantidad in cantidades.items()],
+            default=Value(0),
+        ),
+        fecha_actualizacion=timezone.now(),
+    )
+    _registrar([(vehiculo_id, 'devolucion', cantidad, nota) for vehiculo_id, cantidad in cantidades.items()])
+    invalidar_modelo('Vehiculo')
+    tablero.invalidar()
+
+
+def ajustar_stock(vehiculo_id, cantidad, nota=''):
+    """
+    Fija el stock del vehículo en 'cantidad' (un conteo físico, el
+    formulario de edición) y registra la diferencia como ajuste. Regresa la
+    diferencia aplicada.
+    """
+    with transaction.atomic():
+        actual = Vehiculo.objects.select_for_update().filter(id=vehiculo_id).values_list(
+            'cantidad_disponible', flat=True).first()
+        if actual is None or actual == cantidad:
+            return 0
+        Vehiculo.objects.filter(id=vehiculo_id).update(
+            cantidad_disponible=cantidad, fecha_actualizacion=timezone.now()
+        )
+        _registrar([(vehiculo_id, 'ajuste', cantidad - actual, nota)])
+    invalidar_modelo('Vehiculo')
+    tablero.invalidar()
+    return cantidad - actual
+
+
+def ajustar_stocks(vehiculos, cantidad, nota=''):
+    """
+    Suma 'cantidad' (negativa resta) al stock de todos los 'vehiculos' (un
+    queryset) con un solo UPDATE y registra un ajuste por vehículo. Los que
+    no tienen unidades suficientes para restar se quedan igual. Regresa los
+    ids ajustados.
+    """
+    if not cantidad:
+        return []
+    with transaction.atomic():
+        ids = list(
+            vehiculos.filter(cantidad_disponible__gte=max(0, -cantidad))
+            .select_for_update().order_by().values_list('id', flat=True)
+        )
+        Vehiculo.objects.filter(id__in=ids).update(
+            cantidad_disponible=F('cantidad_disponible') + cantidad, fecha_actualizacion=timezone.now()
+        )
+        _registrar([(vehiculo_id, 'ajuste', cantidad, nota) for vehiculo_id in ids])
+    if ids:
+        invalidar_modelo('Vehiculo')
+        tablero.invalidar()
+    return ids
+
+# ==========================================
+# SALDOS: FOTOS, STOCK A UNA FECHA Y CONCILIACIÓN
+# ==========================================
+# Sumar toda la bitácora para saber el stock de una fecha crece con la
+# historia. SaldoInventario guarda fotos: el saldo de un vehículo sumando
+# sus movimientos hasta 'corte'. El stock a cualquier fecha es la última
+# foto anterior (una búsqueda en el índice vehiculo + corte) más los
+# movimientos posteriores a ella, que son sólo los del último periodo.
+#
+# 'manage.py compactar_inventario' (desde cron) saca una foto nueva de los
+# vehículos que tuvieron movimientos. El corte queda FORD_INVENTARIO_MARGEN
+# segundos en el pasado: una transacción todavía abierta podría confirmar
+# después un movimiento con fecha anterior al corte, y la foto no lo vería.
+
+MARGEN = getattr(settings, 'FORD_INVENTARIO_MARGEN', 300)
+_INICIO = datetime(1970, 1, 1, tzinfo=tz.utc)
+
+
+def _con_saldo(vehiculos, hasta=None):
+    """
+    Anota en 'vehiculos' su stock según la bitácora: 'corte' de la última
+    foto, 'base' (su saldo) y 'movido' (la suma de los movimientos
+    posteriores), todo hasta 'hasta' (o hasta ahora).
+    """
+    fotos = SaldoInventario.objects.filter(vehiculo=OuterRef('pk')).order_by('-corte')
+    movimientos = MovimientoInventario.objects.filter(vehiculo=OuterRef('pk'), fecha__gt=OuterRef('corte'))
+    if hasta is not None:
+        fotos = fotos.filter(corte__lte=hasta)
+        movimientos = movimientos.filter(fecha__lte=hasta)
+    suma = movimientos.order_by().values('vehiculo').annotate(suma=Sum('cantidad')).values('suma')
+    return vehiculos.annotate(
+        corte=Coalesce(Subquery(fotos.values('corte')[:1]), Value(_INICIO, output_field=DateTimeField())),
+        base=Coalesce(Subquery(fotos.values('saldo')[:1]), 0),
+    ).annotate(
+        movido=Coalesce(Subquery(suma, output_field=IntegerField()), 0),
+        nuevos=Exists(movimientos),
+    )
+
+
+def stock_al(vehiculo_id, momento):
+    """
+    Unidades del vehículo en 'momento' según la bitácora. Para un solo
+    vehículo dos consultas simples salen más baratas que armar las de
+    _con_saldo.
+    """
+    corte, base = SaldoInventario.objects.filter(
+        vehiculo_id=vehiculo_id, corte__lte=momento
+    ).order_by('-corte').values_list('corte', 'saldo').first() or (_INICIO, 0)
+    movido = MovimientoInventario.objects.filter(
+        vehiculo_id=vehiculo_id, fecha__gt=corte, fecha__lte=momento
+    ).aggregate(suma=Sum('cantidad'))['suma']
+    return base + (movido or 0)
+
+
+def stocks_al(momento, vehiculos=None):
+    """{vehiculo_id: unidades en 'momento'} de 'vehiculos' (todos por omisión)."""
+    vehiculos = Vehiculo.objects.all() if vehiculos is None else vehiculos
+    return {
+        vehiculo_id: base + movido
+        for vehiculo_id, base, movido in _con_saldo(vehiculos, momento).values_list('id', 'base', 'movido').iterator()
+    }
+
+
+def compactar(corte=None, lote=5000):
+    """
+    Saca una foto al 'corte' (por omisión hace MARGEN segundos) de cada
+    vehículo con movimientos desde su foto anterior. Regresa cuántas fotos
+    se crearon.
+    """
+    corte = corte or timezone.now() - timedelta(seconds=MARGEN)
+    saldos = _con_saldo(Vehiculo.objects.all(), corte).filter(nuevos=True).values_list('id', 'base', 'movido')
+    with transaction.atomic():
+        creadas = SaldoInventario.objects.bulk_create([
+            SaldoInventario(vehiculo_id=vehiculo_id, corte=corte, saldo=base + movido)
+            for vehiculo_id, base, movido in saldos.iterator()
+        ], batch_size=lote)
+    return len(creadas)
+
+
+def conciliar(vehiculos=None, reparar=False, nota='Conciliación'):
+    """
+    Vehículos cuyo 'cantidad_disponible' no coincide con la bitácora:
+    [(vehiculo_id, cantidad_disponible, segun_bitacora)]. Son cambios que no
+    pasaron por estas funciones (el admin, un UPDATE a mano, una
+    importación). Con reparar=True se registra la diferencia como ajuste,
+    así la bitácora vuelve a cuadrar sin reescribir la historia.
+    """
+    vehiculos = Vehiculo.objects.all() if vehiculos is None else vehiculos
+    diferentes = list(
+        _con_saldo(vehiculos).annotate(segun_bitacora=F('base') + F('movido'))
+        .exclude(cantidad_disponible=F('segun_bitacora'))
+        .order_by('id').values_list('id', 'cantidad_disponible', 'segun_bitacora')
+    )
+    if reparar and diferentes:
+        _registrar([(vehiculo_id, 'ajuste', cantidad - esperado, nota)
+                    for vehiculo_id, cantidad, esperado in diferentes])
+    return diferentes
@@ -0,0 +1,273 @@
+# app_Ford/lotes.py
+from collections import Counter
+from datetime import date
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from . import metricas, resumenes, tablero
+from .cache_listas import invalidar_modelo
+from .inventario import reservar_unidades
+from .models import Vehiculo, Empleado, Venta, VentaArchivada, Cliente, Proveedor, ServicioMantenimiento
+
+# ==========================================
+# LOTES DE VENTAS Y SERVICIOS (API JSON)
+# ==========================================
+# Las tabletas del piso de ventas mandan en una sola petición todas las
+# ventas y órdenes de servicio pendientes:
+#
+#     {"ventas": [{"vehiculo": 3, "cliente_nombre": "Ana", "total": "1500.00"}, ...],
+#      "servicios": [{"vehiculo": 3, "tipo_servicio": "Afinación",
+#                     "fecha_servicio": "2025-05-01", "costo_servicio": "900"}, ...]}
+#
+# Cada elemento se valida por separado y recibe su propio resultado; los
+# válidos se guardan juntos en una transacción con un número fijo de
+# consultas: una por tabla relacionada para comprobar que existen los ids,
+# dos para los folios ya usados, un UPDATE condicional por vehículo (no por
+# unidad) para el stock y un INSERT masivo por tabla.
+
+MAXIMO_ELEMENTOS = getattr(settings, 'FORD_API_LOTE_MAXIMO', 500)
+ERROR_SIN_STOCK = 'no hay stock disponible'
+
+
+class LoteInvalido(ValueError):
+    """El cuerpo completo no se puede procesar (no sólo un elemento)."""
+
+
+def _limpiar(modelo, campo, valor, requerido=True):
+    """
+    Valida 'valor' con las reglas del campo del modelo (largo máximo,
+    dígitos, formato de fecha...). Lanza ValueError con la razón.
+    """
+    if valor is None or valor == '':
+        if requerido:
+            raise ValueError(f"'{campo}' es obligatorio")
+        return None
+    try:
+        return modelo._meta.get_field(campo).clean(valor, None)
+    except ValidationError as error:
+        raise ValueError(f"'{campo}': {' '.join(error.messages)}")
+
+
+def _id(item, campo, requerido=True):
+    valor = item.get(campo)
+    if valor is None or valor == '':
+        if requerido:
+            raise ValueError(f"'{campo}' es obligatorio")
+        return None
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        raise ValueError(f"'{campo}' debe ser un id numérico")
+
+
+def validar_venta(item):
+    """Regresa los argumentos de Venta(...) o lanza ValueError."""
+    if not isinstance(item, dict):
+        raise ValueError('elemento mal formado')
+    return {
+        'vehiculo_id': _id(item, 'vehiculo'),
+        'empleado_id': _id(item, 'empleado', requerido=False),
+        'cliente_nombre': _limpiar(Venta, 'cliente_nombre', item.get('cliente_nombre')),
+        'cliente_telefono': _limpiar(Venta, 'cliente_telefono', item.get('cliente_telefono'), requerido=False),
+        'total': _limpiar(Venta, 'total', item.get('total')),
+        'metodo_pago': _limpiar(Venta, 'metodo_pago', item.get('metodo_pago'), requerido=False),
+        'folio': _limpiar(Venta, 'folio', item.get('folio'), requerido=False),
+    }
+
+
+def validar_servicio(item):
+    """Regresa los argumentos de ServicioMantenimiento(...) o lanza ValueError."""
+    if not isinstance(item, dict):
+        raise ValueError('elemento mal formado')
+    return {
+        'vehiculo_id': _id(item, 'vehiculo'),
+        'cliente_id': _id(item, 'cliente', requerido=False),
+        'proveedor_id': _id(item, 'proveedor', requerido=False),
+        'tipo_servicio': _limpiar(ServicioMantenimiento, 'tipo_servicio', item.get('tipo_servicio')),
+        'fecha_servicio': _limpiar(ServicioMantenimiento, 'fecha_servicio', item.get('fecha_servicio')),
+        'costo_servicio': _limpiar(ServicioMantenimiento, 'costo_servicio', item.get('costo_servicio')),
+    }
+
+
+# Campo de id -> modelo al que apunta, para comprobar que existen.
+RELACIONES = {
+    'vehiculo_id': Vehiculo,
+    'empleado_id': Empleado,
+    'cliente_id': Cliente,
+    'proveedor_id': Proveedor,
+}
+
+
+def _validar_todos(elementos, validar, resultados):
+    """Regresa [(indice, argumentos)] de los elementos válidos."""
+    validos = []
+    for indice, item in enumerate(elementos):
+        try:
+            validos.append((indice, validar(item)))
+        except ValueError as error:
+            resultados[indice] = {'indice': indice, 'ok': False, 'error': str(error)}
+    return validos
+
+
+def _quitar_relaciones_inexistentes(grupos):
+    """
+    Marca como error los elementos que apuntan a ids que no existen: una
+    consulta por modelo relacionado para todo el lote.
+    """
+    buscados = {campo: set() for campo in RELACIONES}
+    for validos, _ in grupos:
+        for _, argumentos in validos:
+            for campo in RELACIONES:
+                if argumentos.get(campo) is not None:
+                    buscados[campo].add(argumentos[campo])
+    existentes = {
+        campo: set(RELACIONES[campo].objects.filter(id__in=ids).values_list('id', flat=True))
+        for campo, ids in buscados.items() if ids
+    }
+
+    restantes = []
+    for validos, resultados in grupos:
+        quedan = []
+        for indice, argumentos in validos:
+            faltante = next(
+                (campo for campo in RELACIONES
+                 if argumentos.get(campo) is not None and argumentos[campo] not in existentes[campo]),
+                None,
+            )
+            if faltante:
+                nombre = faltante[:-3]
+                resultados[indice] = {
+                    'indice': indice, 'ok': False,
+                    'error': f"no existe {nombre} con id {argumentos[faltante]}",
+                }
+            else:
+                quedan.append((indice, argumentos))
+        restantes.append(quedan)
+    return restantes
+
+
+def _quitar_folios_repetidos(ventas, resultados):
+    """
+    Marca como error las ventas con un folio que ya existe (también entre las
+    archivadas) o que se repite en el lote (se acepta la primera): una
+    consulta por tabla para todo el lote. Regresa las demás.
+    """
+    folios = {argumentos['folio'] for _, argumentos in ventas if argumentos['folio']}
+    usados = set()
+    if folios:
+        for modelo in (Venta, VentaArchivada):
+            usados.update(modelo.objects.filter(folio__in=folios).values_list('folio', flat=True))
+    quedan = []
+    for indice, argumentos in ventas:
+        folio = argumentos['folio']
+        if folio and folio in usados:
+            resultados[indice] = {'indice': indice, 'ok': False, 'error': f"ya existe una venta con el folio {folio}"}
+        else:
+            usados.add(folio)
+            quedan.append((indice, argumentos))
+    return quedan
+
+
+def _reservar_stock(ventas, resultados):
+    """
+    Descuenta el stock de las ventas con un UPDATE por vehículo. Si un
+    vehículo no alcanza para todas, se aceptan las primeras del lote
+    (en orden) y el resto recibe error. Regresa las ventas aceptadas.
+    """
+    pedidas = Counter(argumentos['vehiculo_id'] for _, argumentos in ventas)
+    # select_for_update bloquea los vehículos en PostgreSQL; en SQLite la
+    # transacción ya tiene el candado de escritura (BEGIN IMMEDIATE).
+    stock = dict(
+        Vehiculo.objects.select_for_update()
+        .filter(id__in=pedidas).values_list('id', 'cantidad_disponible')
+    )
+
+    asignadas = Counter()
+    aceptadas = []
+    for indice, argumentos in ventas:
+        vehiculo_id = argumentos['vehiculo_id']
+        if asignadas[vehiculo_id] < stock.get(vehiculo_id, 0):
+            asignadas[vehiculo_id] += 1
+            aceptadas.append((indice, argumentos))
+        else:
+            resultados[indice] = {'indice': indice, 'ok': False, 'error': ERROR_SIN_STOCK}
+
+    # El UPDATE condicional vuelve a comprobar el stock en la base; si algo
+    # cambió entre la lectura y el UPDATE, esas ventas no se aplican.
+    reservados = reservar_unidades(asignadas, nota='API de lotes')
+    finales = []
+    for indice, argumentos in aceptadas:
+        if argumentos['vehiculo_id'] in reservados:
+            finales.append((indice, argumentos))
+        else:
+            resultados[indice] = {'indice': indice, 'ok': False, 'error': ERROR_SIN_STOCK}
+    return finales
+
+
+def procesar_lote(datos):
+    """
+    Valida y guarda un lote. Regresa un diccionario con un resultado por
+    elemento, en el mismo orden en que llegaron:
+        {"ventas": [{"indice": 0, "ok": true, "id": 15}, ...],
+         "servicios": [{"indice": 0, "ok": false, "error": "..."}, ...],
+         "resumen": {"ventas_creadas": 1, "servicios_creados": 0, "errores": 1}}
+    Lanza LoteInvalido si el cuerpo no tiene la forma esperada.
+    """
+    if not isinstance(datos, dict):
+        raise LoteInvalido('el cuerpo debe ser un objeto JSON')
+    ventas = datos.get('ventas', [])
+    servicios = datos.get('servicios', [])
+    if not isinstance(ventas, list) or not isinstance(servicios, list):
+        raise LoteInvalido("'ventas' y 'servicios' deben ser listas")
+    if len(ventas) + len(servicios) > MAXIMO_ELEMENTOS:
+        raise LoteInvalido(f'el lote admite a lo más {MAXIMO_ELEMENTOS} elementos')
+
+    resultados_ventas = [None] * len(ventas)
+    resultados_servicios = [None] * len(servicios)
+    ventas_validas = _validar_todos(ventas, validar_venta, resultados_ventas)
+    servicios_validos = _validar_todos(servicios, validar_servicio, resultados_servicios)
+
+    with transaction.atomic():
+        ventas_validas, servicios_validos = _quitar_relaciones_inexistentes([
+            (ventas_validas, resultados_ventas),
+            (servicios_validos, resultados_servicios),
+        ])
+        ventas_validas = _quitar_folios_repetidos(ventas_validas, resultados_ventas)
+        ventas_validas = _reservar_stock(ventas_validas, resultados_ventas)
+
+        hoy = date.today()
+        creadas = Venta.objects.bulk_create(
+            [Venta(fecha_venta=hoy, **argumentos) for _, argumentos in ventas_validas]
+        )
+        resumenes.registrar_ventas(creadas)
+        creados = ServicioMantenimiento.objects.bulk_create(
+            [ServicioMantenimiento(**argumentos) for _, argumentos in servicios_validos]
+        )
+        # bulk_create no dispara post_save: se invalida la caché a mano.
+        if creadas:
+            invalidar_modelo('Venta')
+        if creados:
+            invalidar_modelo('ServicioMantenimiento')
+            tablero.invalidar()
+
+    for (indice, _), venta in zip(ventas_validas, creadas):
+        resultados_ventas[indice] = {'indice': indice, 'ok': True, 'id': venta.id}
+    for (indice, _), servicio in zip(servicios_validos, creados):
+        resultados_servicios[indice] = {'indice': indice, 'ok': True, 'id': servicio.id}
+
+    sin_stock = sum(1 for r in resultados_ventas if r.get('error') == ERROR_SIN_STOCK)
+    metricas.contar('ford_ventas_registradas_total', len(creadas), origen='lote')
+    metricas.contar('ford_ventas_sin_stock_total', sin_stock, origen='lote')
+    metricas.contar('ford_servicios_registrados_total', len(creados), origen='lote')
+
+    return {
+        'ventas': resultados_ventas,
+        'servicios': resultados_servicios,
+        'resumen': {
+            'ventas_creadas': len(creadas),
+            'servicios_creados': len(creados),
+            'errores': len(ventas) + len(servicios) - len(creadas) - len(creados),
+        },
+    }
@@ -0,0 +1,32 @@
+# app_Ford/management/commands/archivar_historial.py
+from django.core.management.base import BaseCommand
+
+from app_Ford import archivo
+
+# ==========================================
+# ARCHIVO DE VENTAS Y SERVICIOS ANTIGUOS
+# ==========================================
+# Uso:
+#     python manage.py archivar_historial
+#     python manage.py archivar_historial --lote 500
+#
+# Mueve las ventas y servicios de más de FORD_ARCHIVO_DIAS días a sus
+# tablas de archivo (ver archivo.py). Se corre desde cron, por ejemplo cada
+# noche; cada lote es una transacción corta, así que puede correr con el
+# sitio en uso.
+
+
+class Command(BaseCommand):
+    help = 'Mueve las ventas y servicios antiguos a las tablas de archivo.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=2000, help='Filas por transacción.')
+
+    def handle(self, *args, **opciones):
+        resultado = archivo.archivar(lote=max(1, opciones['lote']))
+        for nombre, (archivadas, devueltas) in resultado.items():
+            linea = f'{nombre}: {archivadas} archivadas'
+            if devueltas:
+                linea += f', {devueltas} devueltas a la tabla de uso diario'
+            self.stdout.write(self.style.SUCCESS(linea))
+        self.stdout.write(f'Límite: {archivo.limite()}.')
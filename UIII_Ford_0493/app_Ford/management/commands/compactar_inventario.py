@@ -0,0 +1,44 @@
+# app_Ford/management/commands/compactar_inventario.py
+from django.core.management.base import BaseCommand, CommandError
+
+from app_Ford import inventario
+
+# ==========================================
+# FOTOS Y CONCILIACIÓN DEL INVENTARIO
+# ==========================================
+# Uso:
+#     python manage.py compactar_inventario
+#     python manage.py compactar_inventario --verificar
+#     python manage.py compactar_inventario --reparar
+#
+# Sin opciones saca una foto del saldo de cada vehículo que tuvo
+# movimientos desde la anterior (ver inventario.compactar); se corre desde
+# cron, por ejemplo cada noche. --verificar compara 'cantidad_disponible'
+# con la bitácora y termina con error si hay diferencias; --reparar las
+# registra como ajustes.
+
+
+class Command(BaseCommand):
+    help = 'Saca fotos del saldo de inventario y concilia el stock con la bitácora.'
+
+    def add_arguments(self, parser):
+        grupo = parser.add_mutually_exclusive_group()
+        grupo.add_argument('--verificar', action='store_true', help='Sólo compara; no escribe nada.')
+        grupo.add_argument('--reparar', action='store_true',
+                           help='Registra las diferencias como ajustes.')
+
+    def handle(self, *args, **opciones):
+        if opciones['verificar'] or opciones['reparar']:
+            diferentes = inventario.conciliar(reparar=opciones['reparar'])
+            for vehiculo_id, cantidad, esperado in diferentes[:20]:
+                self.stdout.write(f'Vehículo {vehiculo_id}: stock {cantidad}, según la bitácora {esperado}')
+            if diferentes and opciones['verificar']:
+                raise CommandError(f'{len(diferentes)} vehículos no coinciden con la bitácora.')
+            if diferentes:
+                self.stdout.write(self.style.SUCCESS(f'{len(diferentes)} ajustes registrados.'))
+            else:
+                self.stdout.write(self.style.SUCCESS('El stock coincide con la bitácora.'))
+            return
+
+        creadas = inventario.compactar()
+        self.stdout.write(self.style.SUCCESS(f'{creadas} fotos de saldo creadas.'))
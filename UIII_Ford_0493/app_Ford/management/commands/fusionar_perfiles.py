@@ -0,0 +1,89 @@
+# app_Ford/management/commands/fusionar_perfiles.py
+import io
+import pstats
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app_Ford.perfilado import directorio_perfiles, escribir_colapsado, vista_del_archivo
+
+# ==========================================
+# FUSIÓN DE PERFILES POR VISTA
+# ==========================================
+# Uso:
+#     python manage.py fusionar_perfiles
+#     python manage.py fusionar_perfiles --vista ver_ventas --top 30
+#     python manage.py fusionar_perfiles --vista ver_ventas --salida ventas.prof
+#     python manage.py fusionar_perfiles --vista ver_ventas --colapsado ventas.txt
+#
+# Suma los perfiles del anillo (ver perfilado.py) de cada vista y muestra
+# las funciones con más tiempo. --salida guarda el perfil sumado (se abre
+# con snakeviz, gprof2dot, pstats...). --colapsado suma las pilas
+# muestreadas en un solo archivo para flamegraph.pl o speedscope:
+#     flamegraph.pl ventas.txt > ventas.svg
+
+
+def sumar_colapsados(archivos):
+    """Suma las muestras de varios archivos '.colapsado' por pila."""
+    pilas = Counter()
+    for archivo in archivos:
+        try:
+            with open(archivo, encoding='utf-8') as lineas:
+                for linea in lineas:
+                    pila, _, muestras = linea.rstrip('\n').rpartition(' ')
+                    if pila and muestras.isdigit():
+                        pilas[pila] += int(muestras)
+        except OSError:
+            continue
+    return pilas
+
+
+class Command(BaseCommand):
+    help = 'Suma los perfiles de cProfile del anillo por vista.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dir', default=None, help='Directorio de perfiles (FORD_PERFILADO_DIR).')
+        parser.add_argument('--vista', default=None, help='Sólo esta vista (nombre de URL).')
+        parser.add_argument('--top', type=int, default=20)
+        parser.add_argument('--orden', choices=['cumulative', 'tottime', 'calls'], default='cumulative')
+        parser.add_argument('--salida', default=None, help='Guarda el perfil sumado (.prof).')
+        parser.add_argument('--colapsado', default=None, help='Guarda las pilas colapsadas (flamegraph).')
+
+    def handle(self, *args, **opciones):
+        directorio = Path(opciones['dir']) if opciones['dir'] else directorio_perfiles()
+        por_vista = defaultdict(list)
+        for archivo in sorted(directorio.glob('*.prof')):
+            por_vista[vista_del_archivo(archivo)].append(archivo)
+        if opciones['vista']:
+            por_vista = {opciones['vista']: por_vista.get(opciones['vista'], [])}
+        por_vista = {vista: archivos for vista, archivos in por_vista.items() if archivos}
+        if not por_vista:
+            raise CommandError(f'No hay perfiles en {directorio}.')
+        if (opciones['salida'] or opciones['colapsado']) and len(por_vista) > 1:
+            raise CommandError('--salida y --colapsado requieren --vista.')
+
+        for vista, archivos in sorted(por_vista.items()):
+            stats = pstats.Stats(str(archivos[0]), stream=io.StringIO())
+            for archivo in archivos[1:]:
+                try:
+                    stats.add(str(archivo))
+                except (OSError, EOFError, TypeError, ValueError):
+                    # El anillo pudo borrarlo mientras se leía.
+                    continue
+
+            texto = io.StringIO()
+            stats.stream = texto
+            stats.sort_stats(opciones['orden']).print_stats(opciones['top'])
+            self.stdout.write(self.style.WARNING(f'== {vista}: {len(archivos)} perfiles =='))
+            self.stdout.write(texto.getvalue())
+
+            if opciones['salida']:
+                stats.dump_stats(opciones['salida'])
+                self.stdout.write(f"Perfil sumado en {opciones['salida']}")
+            if opciones['colapsado']:
+                pilas = sumar_colapsados(a.with_suffix('.colapsado') for a in archivos)
+                escribir_colapsado(opciones['colapsado'], pilas)
+                self.stdout.write(
+                    f"Pilas colapsadas en {opciones['colapsado']} ({sum(pilas.values())} muestras)"
+                )
@@ -0,0 +1,158 @@
+# app_Ford/management/commands/import_vehiculos.py
+import csv
+import json
+import time
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from app_Ford import inventario
+from app_Ford.cache_listas import invalidar_modelo
+from app_Ford.models import Vehiculo
+
+# ==========================================
+# IMPORTACIÓN MASIVA DE INVENTARIO
+# ==========================================
+# Uso:
+#     python manage.py import_vehiculos inventario.csv
+#     python manage.py import_vehiculos inventario.jsonl --lote 5000
+#
+# El archivo se lee fila por fila con un generador y sólo un lote de
+# vehículos vive en memoria a la vez, sin importar el tamaño del archivo.
+# Cada lote es un solo INSERT ... ON CONFLICT (numero_serie) DO UPDATE
+# dentro de su propia transacción: los vehículos que ya existen sólo
+# actualizan 'precio' y 'cantidad_disponible'. La cantidad del archivo es un
+# conteo: la diferencia con la bitácora de inventario se registra como
+# ajuste en la misma transacción (ver inventario.conciliar).
+
+CAMPOS_OBLIGATORIOS = ('marca', 'modelo', 'anio', 'numero_serie', 'precio')
+MAX_ERRORES_MOSTRADOS = 20
+
+
+def leer_filas(ruta, formato):
+    """
+    Genera (numero_de_linea, diccionario) por cada registro del archivo.
+    """
+    with open(ruta, newline='', encoding='utf-8-sig') as archivo:
+        if formato == 'csv':
+            lector = csv.DictReader(archivo)
+            for fila in lector:
+                yield lector.line_num, fila
+        else:
+            for numero, linea in enumerate(archivo, start=1):
+                if not linea.strip():
+                    continue
+                try:
+                    fila = json.loads(linea)
+                except ValueError:
+                    yield numero, None
+                    continue
+                yield numero, fila
+
+
+def validar_fila(fila):
+    """
+    Convierte un registro del archivo en un Vehiculo (sin guardar).
+    Lanza ValueError con la razón si el registro no es válido.
+    """
+    if not isinstance(fila, dict):
+        raise ValueError('registro mal formado')
+
+    datos = {campo: str(fila.get(campo) or '').strip() for campo in
+             CAMPOS_OBLIGATORIOS + ('color', 'cantidad_disponible')}
+    faltantes = [campo for campo in CAMPOS_OBLIGATORIOS if not datos[campo]]
+    if faltantes:
+        raise ValueError(f"faltan campos: {', '.join(faltantes)}")
+
+    try:
+        anio = int(datos['anio'])
+    except ValueError:
+        raise ValueError(f"año inválido: {datos['anio']!r}")
+    try:
+        precio = Decimal(datos['precio'])
+    except InvalidOperation:
+        raise ValueError(f"precio inválido: {datos['precio']!r}")
+    try:
+        cantidad = int(datos['cantidad_disponible'] or 1)
+    except ValueError:
+        raise ValueError(f"cantidad inválida: {datos['cantidad_disponible']!r}")
+
+    if anio <= 0 or precio < 0 or cantidad < 0:
+        raise ValueError('año, precio y cantidad no pueden ser negativos')
+
+    return Vehiculo(
+        marca=datos['marca'][:100],
+        modelo=datos['modelo'][:100],
+        anio=anio,
+        color=datos['color'][:50] or None,
+        numero_serie=datos['numero_serie'][:100],
+        precio=precio.quantize(Decimal('0.01')),
+        cantidad_disponible=cantidad,
+    )
+
+
+class Command(BaseCommand):
+    help = "Importa (o actualiza) vehículos desde un archivo CSV o JSONL por lotes."
+
+    def add_arguments(self, parser):
+        parser.add_argument('archivo', help="Ruta del archivo .csv o .jsonl")
+        parser.add_argument('--formato', choices=['csv', 'jsonl'],
+                            help="Formato del archivo (por defecto se deduce de la extensión)")
+        parser.add_argument('--lote', type=int, default=2000,
+                            help="Vehículos por INSERT/transacción (por defecto 2000)")
+
+    def handle(self, *args, **opciones):
+        ruta = Path(opciones['archivo'])
+        if not ruta.exists():
+            raise CommandError(f"No existe el archivo: {ruta}")
+        formato = opciones['formato'] or ('csv' if ruta.suffix.lower() == '.csv' else 'jsonl')
+        tamano_lote = max(1, opciones['lote'])
+
+        self.errores = 0
+        inicio = time.perf_counter()
+        procesados = 0
+
+        vehiculos = self.vehiculos_validos(leer_filas(ruta, formato))
+        while True:
+            lote = list(islice(vehiculos, tamano_lote))
+            if not lote:
+                break
+            # Un numero_serie repetido dentro del mismo lote se queda con el último.
+            lote = list({v.numero_serie: v for v in lote}.values())
+            with transaction.atomic():
+                Vehiculo.objects.bulk_create(
+                    lote,
+                    update_conflicts=True,
+                    unique_fields=['numero_serie'],
+                    update_fields=['precio', 'cantidad_disponible', 'fecha_actualizacion'],
+                )
+                inventario.conciliar(
+                    Vehiculo.objects.filter(numero_serie__in=[v.numero_serie for v in lote]),
+                    reparar=True, nota='import_vehiculos',
+                )
+                # bulk_create no dispara post_save: se invalida la caché a mano.
+                invalidar_modelo('Vehiculo')
+            procesados += len(lote)
+            transcurrido = time.perf_counter() - inicio
+            self.stdout.write(
+                f"  {procesados} vehículos ({procesados / transcurrido:,.0f} filas/s)"
+            )
+
+        transcurrido = time.perf_counter() - inicio
+        velocidad = procesados / transcurrido if transcurrido else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Importados/actualizados {procesados} vehículos en {transcurrido:.2f}s "
+            f"({velocidad:,.0f} filas/s); {self.errores} filas rechazadas."
+        ))
+
+    def vehiculos_validos(self, filas):
+        for numero, fila in filas:
+            try:
+                yield validar_fila(fila)
+            except ValueError as error:
+                self.errores += 1
+                if self.errores <= MAX_ERRORES_MOSTRADOS:
+                    self.stderr.write(f"Línea {numero}: {error}")
@@ -0,0 +1,22 @@
+# app_Ford/management/commands/purgar_idempotencia.py
+from django.core.management.base import BaseCommand
+
+from app_Ford import idempotencia
+
+# ==========================================
+# CLAVES DE IDEMPOTENCIA VENCIDAS
+# ==========================================
+# Uso:
+#     python manage.py purgar_idempotencia
+#
+# Borra las claves de idempotencia de más de FORD_IDEMPOTENCIA_HORAS horas
+# (ver idempotencia.py) para que la tabla se quede chica. Se corre desde
+# cron, por ejemplo cada hora.
+
+
+class Command(BaseCommand):
+    help = 'Borra las claves de idempotencia vencidas.'
+
+    def handle(self, *args, **opciones):
+        borradas = idempotencia.purgar()
+        self.stdout.write(self.style.SUCCESS(f'{borradas} claves de idempotencia borradas.'))
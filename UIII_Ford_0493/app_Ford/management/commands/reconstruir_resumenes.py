@@ -0,0 +1,58 @@
+# app_Ford/management/commands/reconstruir_resumenes.py
+import argparse
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app_Ford import resumenes
+
+# ==========================================
+# RECONSTRUCCIÓN DEL RESUMEN DE VENTAS
+# ==========================================
+# Uso:
+#     python manage.py reconstruir_resumenes
+#     python manage.py reconstruir_resumenes --desde 2025-01-01 --hasta 2025-01-31
+#     python manage.py reconstruir_resumenes --verificar
+#
+# Recalcula VentaDiaria (ver resumenes.py) desde la tabla de ventas, para
+# reparar cambios que no pasaron por las vistas (el admin, un UPDATE a
+# mano). --verificar sólo compara y termina con error si hay diferencias,
+# para correrlo desde cron o CI.
+
+
+def _fecha(valor):
+    try:
+        return date.fromisoformat(valor)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"fecha inválida '{valor}' (se espera AAAA-MM-DD)")
+
+
+class Command(BaseCommand):
+    help = 'Recalcula el resumen diario de ventas desde la tabla de ventas.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--desde', type=_fecha, default=None)
+        parser.add_argument('--hasta', type=_fecha, default=None)
+        parser.add_argument('--verificar', action='store_true',
+                            help='Sólo compara; no escribe nada.')
+
+    def handle(self, *args, **opciones):
+        desde, hasta = opciones['desde'], opciones['hasta']
+        if opciones['verificar']:
+            esperado = resumenes.calcular(desde, hasta)
+            actual = resumenes.guardado(desde, hasta)
+            diferentes = sorted(
+                clave for clave in esperado.keys() | actual.keys() if esperado.get(clave) != actual.get(clave)
+            )
+            for dimension, fecha, clave in diferentes[:20]:
+                llave = (dimension, fecha, clave)
+                self.stdout.write(
+                    f'{fecha} {dimension}={clave!r}: guardado {actual.get(llave)}, correcto {esperado.get(llave)}'
+                )
+            if diferentes:
+                raise CommandError(f'{len(diferentes)} filas del resumen no coinciden con las ventas.')
+            self.stdout.write(self.style.SUCCESS(f'El resumen coincide ({len(esperado)} filas).'))
+            return
+
+        escritas = resumenes.reconstruir(desde, hasta)
+        self.stdout.write(self.style.SUCCESS(f'Resumen reconstruido: {escritas} filas.'))
@@ -0,0 +1,65 @@
+# app_Ford/management/commands/replicar_sqlite.py
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from app_Ford.enrutador import ALIAS_PRIMARIA, ALIAS_REPLICA
+
+# ==========================================
+# REPLICACIÓN LOCAL (SQLITE)
+# ==========================================
+# Sustituto de la replicación de PostgreSQL para probar el enrutador en una
+# sola máquina: copia el archivo de la primaria al de la réplica con la API
+# de respaldo de SQLite (copia consistente aunque haya escrituras).
+#
+# Uso:
+#     FORD_DB_REPLICA_NAME=replica.sqlite3 python manage.py replicar_sqlite
+#     FORD_DB_REPLICA_NAME=replica.sqlite3 python manage.py replicar_sqlite --intervalo 2
+#
+# Con --intervalo se repite cada N segundos hasta Ctrl+C; el retraso de la
+# réplica es a lo más ese intervalo.
+
+
+def copiar_base(origen, destino):
+    fuente = sqlite3.connect(origen)
+    copia = sqlite3.connect(destino)
+    try:
+        fuente.backup(copia)
+    finally:
+        copia.close()
+        fuente.close()
+
+
+class Command(BaseCommand):
+    help = 'Copia la base SQLite primaria sobre la réplica (una vez o cada N segundos).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--intervalo', type=float, default=0,
+                            help='Segundos entre copias; 0 copia una sola vez.')
+
+    def handle(self, *args, **opciones):
+        if ALIAS_REPLICA not in settings.DATABASES:
+            raise CommandError('No hay réplica configurada (FORD_DB_REPLICA_NAME).')
+        primaria = settings.DATABASES[ALIAS_PRIMARIA]
+        replica = settings.DATABASES[ALIAS_REPLICA]
+        for base in (primaria, replica):
+            if base['ENGINE'] != 'django.db.backends.sqlite3':
+                raise CommandError('replicar_sqlite sólo funciona con SQLite.')
+        if str(primaria['NAME']) == str(replica['NAME']):
+            raise CommandError('La primaria y la réplica son el mismo archivo.')
+
+        intervalo = opciones['intervalo']
+        try:
+            while True:
+                inicio = time.perf_counter()
+                copiar_base(str(primaria['NAME']), str(replica['NAME']))
+                self.stdout.write(
+                    f"Réplica actualizada en {time.perf_counter() - inicio:.3f}s -> {replica['NAME']}"
+                )
+                if intervalo <= 0:
+                    break
+                time.sleep(intervalo)
+        except KeyboardInterrupt:
+            pass
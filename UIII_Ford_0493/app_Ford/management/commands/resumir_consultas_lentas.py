@@ -0,0 +1,110 @@
+# app_Ford/management/commands/resumir_consultas_lentas.py
+import json
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# ==========================================
+# RESUMEN DEL LOG DE CONSULTAS LENTAS
+# ==========================================
+# Uso:
+#     python manage.py resumir_consultas_lentas
+#     python manage.py resumir_consultas_lentas --horas 6 --limite 5 --orden max
+#
+# Agrupa las consultas del log (ver consultas_lentas.py) por su forma (el SQL
+# sin parámetros) y muestra las peores: veces, tiempo total, promedio,
+# máximo, las vistas que la ejecutan y el plan de la ejecución más lenta.
+# Lee también los archivos rotados (consultas_lentas.log.1, .2, ...).
+
+ORDENES = {
+    'total': lambda grupo: grupo['total_ms'],
+    'max': lambda grupo: grupo['max_ms'],
+    'veces': lambda grupo: grupo['veces'],
+}
+
+
+def archivos_del_log(ruta):
+    """El log y sus rotaciones, del más viejo al más nuevo."""
+    ruta = Path(ruta)
+    rotados = [
+        p for p in ruta.parent.glob(ruta.name + '.*') if p.suffix[1:].isdigit()
+    ]
+    rotados.sort(key=lambda p: int(p.suffix[1:]), reverse=True)
+    return rotados + ([ruta] if ruta.exists() else [])
+
+
+def leer_registros(archivos, desde=None):
+    for archivo in archivos:
+        with open(archivo, encoding='utf-8') as lineas:
+            for linea in lineas:
+                try:
+                    registro = json.loads(linea)
+                    fecha = datetime.fromisoformat(registro['fecha'])
+                except (ValueError, KeyError, TypeError):
+                    continue
+                if desde is None or fecha >= desde:
+                    yield registro
+
+
+def agrupar(registros):
+    """
+    {forma: {'veces', 'total_ms', 'max_ms', 'vistas', 'peor'}}, donde 'peor'
+    es el registro completo de la ejecución más lenta.
+    """
+    grupos = {}
+    for registro in registros:
+        grupo = grupos.setdefault(registro['forma'], {
+            'veces': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'vistas': Counter(), 'peor': None,
+        })
+        grupo['veces'] += 1
+        grupo['total_ms'] += registro['ms']
+        grupo['vistas'][registro.get('vista') or '(fuera de una vista)'] += 1
+        if registro['ms'] >= grupo['max_ms']:
+            grupo['max_ms'] = registro['ms']
+            grupo['peor'] = registro
+    return grupos
+
+
+class Command(BaseCommand):
+    help = 'Resume el log de consultas lentas agrupando por forma de consulta.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--archivo', default=settings.FORD_CONSULTAS_LENTAS_LOG)
+        parser.add_argument('--horas', type=float, default=24,
+                            help='Ventana de tiempo hacia atrás; 0 para todo el log.')
+        parser.add_argument('--limite', type=int, default=10)
+        parser.add_argument('--orden', choices=sorted(ORDENES), default='total')
+
+    def handle(self, *args, **opciones):
+        archivos = archivos_del_log(opciones['archivo'])
+        if not archivos:
+            raise CommandError(f"No existe el log '{opciones['archivo']}'.")
+        desde = None
+        if opciones['horas'] > 0:
+            desde = datetime.now(timezone.utc) - timedelta(hours=opciones['horas'])
+
+        grupos = agrupar(leer_registros(archivos, desde))
+        if not grupos:
+            self.stdout.write('No hay consultas lentas en la ventana indicada.')
+            return
+
+        peores = sorted(grupos.items(), key=lambda par: ORDENES[opciones['orden']](par[1]), reverse=True)
+        total = sum(grupo['veces'] for grupo in grupos.values())
+        self.stdout.write(
+            f"{total} consultas lentas, {len(grupos)} formas distintas. "
+            f"Las {min(opciones['limite'], len(peores))} peores por '{opciones['orden']}':"
+        )
+        for posicion, (forma, grupo) in enumerate(peores[:opciones['limite']], start=1):
+            vistas = ', '.join(f'{vista} ({veces})' for vista, veces in grupo['vistas'].most_common(3))
+            self.stdout.write('')
+            self.stdout.write(self.style.WARNING(
+                f"#{posicion}  veces={grupo['veces']}  total={grupo['total_ms']:.1f}ms  "
+                f"promedio={grupo['total_ms'] / grupo['veces']:.1f}ms  max={grupo['max_ms']:.1f}ms"
+            ))
+            self.stdout.write(f'    vistas: {vistas}')
+            self.stdout.write(f'    sql: {forma[:400]}')
+            for linea in grupo['peor'].get('plan') or []:
+                self.stdout.write(f'    plan: {linea}')
@@ -0,0 +1,268 @@
+# app_Ford/management/commands/seed_ford.py
+import random
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max
+
+from app_Ford import inventario, resumenes
+from app_Ford.cache_listas import invalidar_modelo
+from app_Ford.models import Vehiculo, Empleado, Venta, VentaArchivada, Cliente, Proveedor, ServicioMantenimiento
+
+# ==========================================
+# GENERADOR DE DATOS SINTÉTICOS
+# ==========================================
+# Uso:
+#     python manage.py seed_ford --scale 1        # ~18 mil filas
+#     python manage.py seed_ford --scale 100      # ~1.8 millones de filas
+#     python manage.py seed_ford --scale 10 --semilla 7 --lote 10000
+#
+# Genera filas relacionadas entre sí (las ventas apuntan a vehículos y
+# empleados existentes, los servicios a vehículos, clientes y proveedores)
+# con bulk_create por lotes: sólo un lote vive en memoria a la vez. Con la
+# misma --semilla sobre una base vacía el resultado es el mismo.
+#
+# Sólo agrega filas; no borra nada. Los números de serie continúan después
+# del último generado, así que se puede correr varias veces.
+
+# Filas por unidad de --scale
+POR_ESCALA = {
+    'Proveedor': 20,
+    'Empleado': 50,
+    'Vehiculo': 1000,
+    'Cliente': 2000,
+    'Venta': 10000,
+    'ServicioMantenimiento': 5000,
+}
+
+# modelo -> (precio base, años disponibles)
+MODELOS_FORD = {
+    'Lobo': (900000, range(2015, 2026)),
+    'Ranger': (650000, range(2019, 2026)),
+    'Maverick': (560000, range(2022, 2026)),
+    'Mustang': (850000, range(2015, 2026)),
+    'Bronco': (950000, range(2021, 2026)),
+    'Explorer': (1000000, range(2015, 2026)),
+    'Escape': (600000, range(2015, 2026)),
+    'Edge': (700000, range(2015, 2024)),
+    'Expedition': (1500000, range(2015, 2026)),
+    'Territory': (550000, range(2021, 2026)),
+    'Transit': (800000, range(2015, 2026)),
+    'Figo': (250000, range(2016, 2021)),
+}
+COLORES = ['Blanco', 'Negro', 'Gris', 'Plata', 'Rojo', 'Azul', 'Verde', 'Naranja']
+NOMBRES = [
+    'José', 'María', 'Juan', 'Guadalupe', 'Luis', 'Ana', 'Carlos', 'Rosa', 'Jorge', 'Laura',
+    'Miguel', 'Sofía', 'Fernando', 'Elena', 'Ricardo', 'Patricia', 'Alejandro', 'Daniela',
+    'Emiliano', 'Valeria', 'Diego', 'Fernanda', 'Raúl', 'Lucía', 'Andrés', 'Mariana',
+]
+APELLIDOS = [
+    'Hernández', 'García', 'Martínez', 'López', 'González', 'Pérez', 'Rodríguez', 'Sánchez',
+    'Ramírez', 'Cruz', 'Flores', 'Gómez', 'Morales', 'Vázquez', 'Reyes', 'Jiménez', 'Torres',
+    'Díaz', 'Gutiérrez', 'Ruiz', 'Mendoza', 'Aguilar', 'Ortiz', 'Castillo', 'Avilez',
+]
+PUESTOS = ['Asesor de ventas'] * 6 + ['Gerente de piso', 'Financiamiento', 'Recepción', 'Servicio']
+PRODUCTOS = ['Refacciones', 'Llantas', 'Lubricantes', 'Hojalatería', 'Eléctrico', 'Cristales', 'Audio']
+GIROS = ['Taller', 'Refaccionaria', 'Servicio', 'Distribuidora', 'Autopartes']
+METODOS_PAGO = ['Efectivo', 'Tarjeta', 'Transferencia', 'Crédito']
+# tipo de servicio -> costo base
+SERVICIOS = {
+    'Afinación': 2500, 'Cambio de aceite': 1200, 'Frenos': 3500, 'Alineación y balanceo': 900,
+    'Suspensión': 6000, 'Transmisión': 15000, 'Diagnóstico': 800, 'Aire acondicionado': 2800,
+}
+# Las ventas y servicios se reparten en los últimos tres años.
+DIAS_DE_HISTORIA = 3 * 365
+
+
+@contextmanager
+def fechas_manuales(*campos):
+    """
+    Desactiva auto_now_add mientras se generan datos, para que bulk_create
+    respete las fechas históricas en lugar de poner la de hoy.
+    """
+    originales = [campo.auto_now_add for campo in campos]
+    for campo in campos:
+        campo.auto_now_add = False
+    try:
+        yield
+    finally:
+        for campo, original in zip(campos, originales):
+            campo.auto_now_add = original
+
+
+def telefono(azar):
+    return f'55{azar.randrange(10 ** 8):08d}'
+
+
+def nombre_persona(azar):
+    return azar.choice(NOMBRES), f'{azar.choice(APELLIDOS)} {azar.choice(APELLIDOS)}'
+
+
+def fecha_pasada(azar, hoy):
+    return hoy - timedelta(days=azar.randrange(DIAS_DE_HISTORIA))
+
+
+class Command(BaseCommand):
+    help = 'Genera datos sintéticos relacionados para pruebas de rendimiento.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=1,
+                            help='Multiplicador de filas (1 = 10 mil ventas).')
+        parser.add_argument('--lote', type=int, default=5000, help='Filas por INSERT.')
+        parser.add_argument('--semilla', type=int, default=42)
+
+    def handle(self, *args, **opciones):
+        escala = opciones['scale']
+        if escala <= 0:
+            raise CommandError('--scale debe ser mayor que 0.')
+        self.lote = opciones['lote']
+        if self.lote < 1:
+            raise CommandError('--lote debe ser al menos 1.')
+        self.azar = random.Random(opciones['semilla'])
+        self.hoy = date.today()
+        cantidades = {modelo: max(1, int(n * escala)) for modelo, n in POR_ESCALA.items()}
+
+        inicio = time.perf_counter()
+        with fechas_manuales(Venta._meta.get_field('fecha_venta'), Cliente._meta.get_field('fecha_registro')):
+            proveedores = self.generar(Proveedor, cantidades['Proveedor'], self.proveedores)
+            empleados = self.generar(Empleado, cantidades['Empleado'], self.empleados)
+            self.ultima_serie = self.ultima_serie_generada()
+            precios = dict(self.generar(
+                Vehiculo, cantidades['Vehiculo'], self.vehiculos, clave=lambda v: (v.id, v.precio)
+            ))
+            clientes = self.generar(Cliente, cantidades['Cliente'], self.clientes)
+
+            self.ultimo_folio = self.ultimo_folio_generado()
+            self.generar(Venta, cantidades['Venta'], lambda n: self.ventas(n, precios, empleados), clave=None)
+            self.generar(ServicioMantenimiento, cantidades['ServicioMantenimiento'],
+                         lambda n: self.servicios(n, list(precios), clientes, proveedores), clave=None)
+
+        # bulk_create no dispara post_save ni pasa por las vistas: se
+        # invalidan las listas cacheadas, se recalcula el resumen de ventas y
+        # el stock de los vehículos nuevos entra a la bitácora de inventario.
+        resumenes.reconstruir()
+        with transaction.atomic():
+            inventario.conciliar(reparar=True, nota='seed_ford')
+        for modelo in POR_ESCALA:
+            invalidar_modelo(modelo)
+        total = sum(cantidades.values())
+        self.stdout.write(self.style.SUCCESS(
+            f'{total} filas en {time.perf_counter() - inicio:.1f}s (escala {escala:g}).'
+        ))
+
+    def generar(self, modelo, cantidad, fabrica, clave=lambda objeto: objeto.id):
+        """
+        Inserta 'cantidad' filas de 'modelo' en lotes, cada lote en su
+        transacción. 'fabrica(n)' regresa n instancias sin guardar.
+        Regresa clave(objeto) de cada fila creada (nada si clave es None:
+        las ventas y servicios no se guardan en memoria).
+        """
+        inicio = time.perf_counter()
+        claves = []
+        hechas = 0
+        while hechas < cantidad:
+            n = min(self.lote, cantidad - hechas)
+            with transaction.atomic():
+                creadas = modelo.objects.bulk_create(fabrica(n))
+            if clave is not None:
+                claves.extend(clave(objeto) for objeto in creadas)
+            hechas += n
+        segundos = time.perf_counter() - inicio
+        self.stdout.write(
+            f'{modelo.__name__}: {cantidad} filas, {cantidad / segundos if segundos else 0:.0f} filas/s'
+        )
+        return claves
+
+    def ultima_serie_generada(self):
+        ultima = Vehiculo.objects.filter(numero_serie__regex=r'^1FT[0-9]{14}$').aggregate(
+            Max('numero_serie'))['numero_serie__max']
+        return int(ultima[3:]) if ultima else 0
+
+    def ultimo_folio_generado(self):
+        # Los folios no se repiten: se sigue después del último, contando los archivados.
+        ultimos = [
+            modelo.objects.filter(folio__regex=r'^F-[0-9]{9}$').aggregate(Max('folio'))['folio__max']
+            for modelo in (Venta, VentaArchivada)
+        ]
+        return max((int(folio[2:]) for folio in ultimos if folio), default=0)
+
+    def proveedores(self, n):
+        azar = self.azar
+        for _ in range(n):
+            nombre = f'{azar.choice(GIROS)} {azar.choice(APELLIDOS)}'
+            yield Proveedor(
+                nombre_proveedor=nombre, telefono=telefono(azar),
+                direccion=f'Calle {azar.choice(APELLIDOS)} {azar.randrange(1, 999)}',
+                email=f'contacto{azar.randrange(10 ** 6)}@proveedor.mx',
+                producto=azar.choice(PRODUCTOS),
+            )
+
+    def empleados(self, n):
+        azar = self.azar
+        for _ in range(n):
+            nombre, apellido = nombre_persona(azar)
+            yield Empleado(
+                nombre=nombre, apellido=apellido, puesto=azar.choice(PUESTOS), telefono=telefono(azar),
+                email=f'empleado{azar.randrange(10 ** 6)}@ford.mx',
+                fecha_contratacion=self.hoy - timedelta(days=azar.randrange(10 * 365)),
+                salario=Decimal(azar.randrange(12000, 60000)),
+            )
+
+    def vehiculos(self, n):
+        azar = self.azar
+        for _ in range(n):
+            modelo = azar.choice(list(MODELOS_FORD))
+            base, anios = MODELOS_FORD[modelo]
+            anio = azar.choice(anios)
+            self.ultima_serie += 1
+            yield Vehiculo(
+                marca='Ford', modelo=modelo, anio=anio, color=azar.choice(COLORES),
+                # 17 caracteres, como un VIN
+                numero_serie=f'1FT{self.ultima_serie:014d}',
+                precio=Decimal(int(base * (1 + (anio - 2020) * 0.04) * azar.uniform(0.95, 1.1))),
+                cantidad_disponible=azar.randrange(0, 15),
+            )
+
+    def clientes(self, n):
+        azar = self.azar
+        for _ in range(n):
+            nombre, apellido = nombre_persona(azar)
+            yield Cliente(
+                nombre=nombre, apellido=apellido, telefono=telefono(azar),
+                correo_electronico=f'cliente{azar.randrange(10 ** 7)}@correo.mx',
+                fecha_registro=fecha_pasada(azar, self.hoy),
+            )
+
+    def ventas(self, n, precios, empleados):
+        azar = self.azar
+        vehiculos = list(precios)
+        for _ in range(n):
+            vehiculo_id = azar.choice(vehiculos)
+            nombre, apellido = nombre_persona(azar)
+            self.ultimo_folio += 1
+            yield Venta(
+                vehiculo_id=vehiculo_id,
+                empleado_id=azar.choice(empleados) if azar.random() < 0.9 else None,
+                cliente_nombre=f'{nombre} {apellido}', cliente_telefono=telefono(azar),
+                fecha_venta=fecha_pasada(azar, self.hoy),
+                total=(precios[vehiculo_id] * Decimal(str(round(azar.uniform(0.9, 1.05), 3)))).quantize(Decimal('0.01')),
+                metodo_pago=azar.choice(METODOS_PAGO),
+                folio=f'F-{self.ultimo_folio:09d}',
+            )
+
+    def servicios(self, n, vehiculos, clientes, proveedores):
+        azar = self.azar
+        for _ in range(n):
+            tipo = azar.choice(list(SERVICIOS))
+            yield ServicioMantenimiento(
+                vehiculo_id=azar.choice(vehiculos),
+                cliente_id=azar.choice(clientes) if azar.random() < 0.95 else None,
+                proveedor_id=azar.choice(proveedores) if azar.random() < 0.8 else None,
+                tipo_servicio=tipo,
+                fecha_servicio=fecha_pasada(azar, self.hoy),
+                costo_servicio=Decimal(int(SERVICIOS[tipo] * azar.uniform(0.8, 1.4))),
+            )
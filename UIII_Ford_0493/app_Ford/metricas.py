@@ -0,0 +1,291 @@
+# app_Ford/metricas.py
+import atexit
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+# ==========================================
+# MÉTRICAS EN FORMATO PROMETHEUS
+# ==========================================
+# /metrics expone contadores e histogramas en el formato de texto de
+# Prometheus, sin dependencias externas.
+#
+# Costo en el camino de la petición: cada hilo suma en su propio
+# "fragmento" (diccionarios que sólo ese hilo modifica), así que no hay
+# candados al contar. Al pedir /metrics se suman todos los fragmentos.
+#
+# Varios workers (gunicorn, uwsgi...): con FORD_METRICAS_DIR cada proceso
+# escribe cada FORD_METRICAS_INTERVALO segundos una foto de sus métricas en
+# ese directorio (un archivo por proceso, reemplazado de forma atómica) y
+# /metrics suma las fotos de todos. Los archivos de procesos que ya
+# terminaron se conservan para que los contadores no retrocedan; el
+# directorio se debe vaciar al reiniciar el servicio.
+
+BUCKETS_SEGUNDOS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BUCKETS_CONSULTA = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+BUCKETS_CONSULTAS_POR_PETICION = (1, 2, 5, 10, 20, 50, 100, 200)
+
+# nombre -> (tipo, ayuda, buckets)
+DEFINICIONES = {
+    'ford_http_peticiones_total': (
+        'counter', 'Peticiones atendidas por vista, método y código de estado.', None),
+    'ford_http_duracion_segundos': (
+        'histogram', 'Duración de las peticiones por vista.', BUCKETS_SEGUNDOS),
+    'ford_bd_consultas_por_peticion': (
+        'histogram', 'Consultas SQL ejecutadas en cada petición, por vista.', BUCKETS_CONSULTAS_POR_PETICION),
+    'ford_bd_consulta_duracion_segundos': (
+        'histogram', 'Duración de cada consulta SQL, por alias de base de datos.', BUCKETS_CONSULTA),
+    'ford_ventas_registradas_total': (
+        'counter', 'Ventas registradas, por origen (formulario o lote).', None),
+    'ford_ventas_sin_stock_total': (
+        'counter', 'Ventas rechazadas por falta de stock, por origen.', None),
+    'ford_servicios_registrados_total': (
+        'counter', 'Órdenes de servicio registradas, por origen.', None),
+}
+
+_local = threading.local()
+_fragmentos = []
+_candado_fragmentos = threading.Lock()
+# Identifica el archivo de este proceso (el pid se puede reutilizar).
+_ID_PROCESO = f'{os.getpid()}_{time.time_ns()}'
+_ultima_foto = [0.0]
+
+
+def _al_nacer_worker():
+    """
+    En el hijo de un fork (uWSGI, gunicorn --preload cargan la app antes de
+    crear los workers): id y archivo propios, y sin los contadores del
+    padre, que ya están en la foto del padre.
+    """
+    global _ID_PROCESO, _local, _candado_fragmentos
+    _ID_PROCESO = f'{os.getpid()}_{time.time_ns()}'
+    _local = threading.local()
+    _candado_fragmentos = threading.Lock()
+    _fragmentos.clear()
+    _ultima_foto[0] = 0.0
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_al_nacer_worker)
+
+
+def _fragmento():
+    fragmento = getattr(_local, 'fragmento', None)
+    if fragmento is None:
+        fragmento = {'contadores': {}, 'histogramas': {}}
+        _local.fragmento = fragmento
+        # Sólo la primera vez por hilo.
+        with _candado_fragmentos:
+            _fragmentos.append(fragmento)
+    return fragmento
+
+
+def _etiquetas(etiquetas):
+    return tuple(sorted(etiquetas.items()))
+
+
+def contar(nombre, cantidad=1, **etiquetas):
+    contadores = _fragmento()['contadores']
+    clave = (nombre, _etiquetas(etiquetas))
+    contadores[clave] = contadores.get(clave, 0) + cantidad
+
+
+def observar(nombre, valor, **etiquetas):
+    buckets = DEFINICIONES[nombre][2]
+    histogramas = _fragmento()['histogramas']
+    clave = (nombre, _etiquetas(etiquetas))
+    datos = histogramas.get(clave)
+    if datos is None:
+        # [cuenta por bucket (no acumulada) + desborde, suma, total]
+        datos = histogramas[clave] = [[0] * (len(buckets) + 1), 0.0, 0]
+    datos[0][bisect_left(buckets, valor)] += 1
+    datos[1] += valor
+    datos[2] += 1
+
+
+def foto_del_proceso():
+    """Suma de los fragmentos de todos los hilos de este proceso."""
+    contadores, histogramas = {}, {}
+    with _candado_fragmentos:
+        fragmentos = list(_fragmentos)
+    for fragmento in fragmentos:
+        # copy() es atómico: el hilo dueño puede seguir sumando mientras tanto.
+        for clave, valor in fragmento['contadores'].copy().items():
+            contadores[clave] = contadores.get(clave, 0) + valor
+        for clave, (cuentas, suma, total) in fragmento['histogramas'].copy().items():
+            _sumar_histograma(histogramas, clave, list(cuentas), suma, total)
+    return contadores, histogramas
+
+
+def _sumar_histograma(histogramas, clave, cuentas, suma, total):
+    actual = histogramas.get(clave)
+    if actual is None:
+        histogramas[clave] = [cuentas, suma, total]
+        return
+    actual[0] = [a + b for a, b in zip(actual[0], cuentas)]
+    actual[1] += suma
+    actual[2] += total
+
+
+# ==========================================
+# MODO MULTIPROCESO
+# ==========================================
+
+def _directorio():
+    directorio = getattr(settings, 'FORD_METRICAS_DIR', None)
+    return Path(directorio) if directorio else None
+
+
+def _a_json(contadores, histogramas):
+    return {
+        'contadores': [[n, list(map(list, e)), v] for (n, e), v in contadores.items()],
+        'histogramas': [[n, list(map(list, e))] + datos for (n, e), datos in histogramas.items()],
+    }
+
+
+def guardar_foto():
+    """Escribe la foto de este proceso en FORD_METRICAS_DIR (si está definido)."""
+    directorio = _directorio()
+    if directorio is None:
+        return
+    directorio.mkdir(parents=True, exist_ok=True)
+    destino = directorio / f'ford_{_ID_PROCESO}.json'
+    temporal = directorio / f'.ford_{_ID_PROCESO}.tmp'
+    temporal.write_text(json.dumps(_a_json(*foto_del_proceso())), encoding='utf-8')
+    os.replace(temporal, destino)
+    _ultima_foto[0] = time.monotonic()
+
+
+def guardar_foto_si_toca():
+    intervalo = getattr(settings, 'FORD_METRICAS_INTERVALO', 5)
+    if _directorio() is not None and time.monotonic() - _ultima_foto[0] >= intervalo:
+        guardar_foto()
+
+
+atexit.register(guardar_foto)
+
+
+def metricas_combinadas():
+    """Este proceso (en vivo) más las fotos de los demás procesos."""
+    contadores, histogramas = foto_del_proceso()
+    directorio = _directorio()
+    if directorio is None or not directorio.is_dir():
+        return contadores, histogramas
+    propio = f'ford_{_ID_PROCESO}.json'
+    for archivo in directorio.glob('ford_*.json'):
+        if archivo.name == propio:
+            continue
+        try:
+            datos = json.loads(archivo.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            continue
+        for nombre, etiquetas, valor in datos['contadores']:
+            clave = (nombre, tuple(map(tuple, etiquetas)))
+            contadores[clave] = contadores.get(clave, 0) + valor
+        for nombre, etiquetas, cuentas, suma, total in datos['histogramas']:
+            _sumar_histograma(histogramas, (nombre, tuple(map(tuple, etiquetas))), cuentas, suma, total)
+    return contadores, histogramas
+
+
+# ==========================================
+# FORMATO DE TEXTO
+# ==========================================
+
+def _escapar(valor):
+    return str(valor).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _texto_etiquetas(etiquetas, extra=()):
+    pares = list(etiquetas) + list(extra)
+    if not pares:
+        return ''
+    return '{' + ','.join(f'{k}="{_escapar(v)}"' for k, v in pares) + '}'
+
+
+def _numero(valor):
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+def exposicion():
+    """Texto en el formato de exposición de Prometheus (versión 0.0.4)."""
+    contadores, histogramas = metricas_combinadas()
+    lineas = []
+    for nombre, (tipo, ayuda, buckets) in DEFINICIONES.items():
+        lineas.append(f'# HELP {nombre} {ayuda}')
+        lineas.append(f'# TYPE {nombre} {tipo}')
+        if tipo == 'counter':
+            for (n, etiquetas), valor in sorted(contadores.items()):
+                if n == nombre:
+                    lineas.append(f'{nombre}{_texto_etiquetas(etiquetas)} {_numero(valor)}')
+            continue
+        for (n, etiquetas), (cuentas, suma, total) in sorted(histogramas.items()):
+            if n != nombre:
+                continue
+            acumulado = 0
+            for limite, cuenta in zip(list(buckets) + ['+Inf'], cuentas):
+                acumulado += cuenta
+                le = limite if limite == '+Inf' else _numero(limite)
+                lineas.append(f'{nombre}_bucket{_texto_etiquetas(etiquetas, [("le", le)])} {acumulado}')
+            lineas.append(f'{nombre}_sum{_texto_etiquetas(etiquetas)} {_numero(suma)}')
+            lineas.append(f'{nombre}_count{_texto_etiquetas(etiquetas)} {total}')
+    return '\n'.join(lineas) + '\n'
+
+
+# ==========================================
+# MIDDLEWARE
+# ==========================================
+
+class _ContadorConsultas:
+    """execute_wrapper: cuenta y mide cada consulta de la petición."""
+
+    def __init__(self):
+        self.consultas = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.consultas += 1
+            observar('ford_bd_consulta_duracion_segundos', time.perf_counter() - inicio,
+                     alias=context['connection'].alias)
+
+
+class MetricasMiddleware:
+    """
+    Mide cada petición por nombre de URL (urls.py). Las rutas sin nombre
+    se agrupan en 'desconocida' para no crear una serie por cada URL.
+    Django lo descarta si FORD_METRICAS está apagado.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'FORD_METRICAS', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        contador = _ContadorConsultas()
+        inicio = time.perf_counter()
+        with ExitStack() as pila:
+            for alias in connections:
+                pila.enter_context(connections[alias].execute_wrapper(contador))
+            respuesta = self.get_response(request)
+        duracion = time.perf_counter() - inicio
+
+        coincidencia = getattr(request, 'resolver_match', None)
+        vista = (coincidencia.url_name if coincidencia else None) or 'desconocida'
+        if vista != 'metricas':
+            contar('ford_http_peticiones_total', vista=vista, metodo=request.method,
+                   estado=str(respuesta.status_code))
+            observar('ford_http_duracion_segundos', duracion, vista=vista)
+            observar('ford_bd_consultas_por_peticion', contador.consultas, vista=vista)
+            guardar_foto_si_toca()
+        return respuesta
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_Ford', '0002_cliente_proveedor_serviciomantenimiento'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='serviciomantenimiento',
+            index=models.Index(fields=['fecha_servicio', 'id'], name='servicio_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='serviciomantenimiento',
+            index=models.Index(fields=['vehiculo', 'fecha_servicio'], name='servicio_vehiculo_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='serviciomantenimiento',
+            index=models.Index(fields=['proveedor', 'fecha_servicio'], name='servicio_proveedor_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehiculo',
+            index=models.Index(fields=['marca', 'modelo', 'anio'], name='vehiculo_marca_modelo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehiculo',
+            index=models.Index(fields=['anio'], name='vehiculo_anio_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='venta',
+            index=models.Index(fields=['fecha_venta', 'id'], name='venta_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='venta',
+            index=models.Index(fields=['empleado', 'fecha_venta'], name='venta_empleado_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='venta',
+            index=models.Index(fields=['metodo_pago', 'fecha_venta'], name='venta_metodo_fecha_idx'),
+        ),
+    ]
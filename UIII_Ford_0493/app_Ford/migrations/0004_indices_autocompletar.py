@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:57
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_Ford', '0003_indices_filtros'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cliente',
+            index=models.Index(django.db.models.functions.text.Lower('nombre'), name='cliente_nombre_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cliente',
+            index=models.Index(django.db.models.functions.text.Lower('apellido'), name='cliente_apellido_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='empleado',
+            index=models.Index(django.db.models.functions.text.Lower('nombre'), name='empleado_nombre_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='empleado',
+            index=models.Index(django.db.models.functions.text.Lower('apellido'), name='empleado_apellido_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='proveedor',
+            index=models.Index(django.db.models.functions.text.Lower('nombre_proveedor'), name='proveedor_nombre_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehiculo',
+            index=models.Index(django.db.models.functions.text.Lower('numero_serie'), name='vehiculo_serie_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehiculo',
+            index=models.Index(django.db.models.functions.text.Lower('modelo'), name='vehiculo_modelo_lower_idx'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:23
+
+from collections import defaultdict
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def llenar_resumen(apps, schema_editor):
+    """Calcula el resumen de las ventas que ya existen (ver resumenes.reconstruir)."""
+    Venta = apps.get_model('app_Ford', 'Venta')
+    VentaDiaria = apps.get_model('app_Ford', 'VentaDiaria')
+    columnas = {'dia': None, 'empleado': 'empleado_id', 'modelo': 'vehiculo__modelo', 'metodo_pago': 'metodo_pago'}
+    for dimension, columna in columnas.items():
+        filas = defaultdict(lambda: [0, 0])
+        agrupadas = Venta.objects.order_by().values(*['fecha_venta'] + ([columna] if columna else []))
+        for grupo in agrupadas.annotate(ventas=Count('id'), total=Sum('total')).iterator():
+            valor = grupo.get(columna) if columna else None
+            fila = filas[(grupo['fecha_venta'], '' if valor is None else str(valor))]
+            fila[0] += grupo['ventas']
+            fila[1] += grupo['total'] or 0
+        VentaDiaria.objects.bulk_create([
+            VentaDiaria(fecha=fecha, dimension=dimension, clave=clave, ventas=ventas, total=total)
+            for (fecha, clave), (ventas, total) in filas.items()
+        ], batch_size=5000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_Ford', '0004_indices_autocompletar'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VentaDiaria',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateField()),
+                ('dimension', models.CharField(max_length=20)),
+                ('clave', models.CharField(blank=True, default='', max_length=150)),
+                ('ventas', models.IntegerField(default=0)),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('dimension', 'fecha', 'clave'), name='venta_diaria_unica')],
+            },
+        ),
+        migrations.RunPython(llenar_resumen, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:05
+
+from django.db import migrations
+
+# Índices de texto de la búsqueda global (ver busqueda.py). Son SQL propio
+# de cada motor, así que no se describen en models.py:
+#
+#   - SQLite: una tabla virtual FTS5 por modelo, de contenido externo (lee
+#     las columnas de la tabla del modelo por rowid = id) y sincronizada por
+#     triggers, así que también la mantienen bulk_create, el admin y los
+#     UPDATE a mano. Los prefijos de 2 a 4 letras tienen índice propio.
+#   - PostgreSQL: un índice GIN sobre el tsvector de las mismas columnas.
+#
+# En SQLite, una migración que rehace una de estas tablas (AddField,
+# AlterField...) borra sus triggers: debe volver a crearlos con
+# triggers_sqlite() (ver 0007_fecha_actualizacion).
+#
+# tabla del modelo -> (nombre del índice, columnas)
+INDICES = {
+    'app_Ford_cliente': ('busqueda_cliente', ['nombre', 'apellido', 'telefono', 'correo_electronico']),
+    'app_Ford_proveedor': ('busqueda_proveedor', ['nombre_proveedor', 'telefono', 'email', 'producto']),
+    'app_Ford_vehiculo': ('busqueda_vehiculo', ['numero_serie', 'modelo', 'marca', 'color']),
+}
+
+
+def triggers_sqlite(tabla, indice, columnas):
+    lista = ', '.join(columnas)
+    nuevos = ', '.join(f'new.{c}' for c in columnas)
+    viejos = ', '.join(f'old.{c}' for c in columnas)
+    borrar = f"INSERT INTO {indice}({indice}, rowid, {lista}) VALUES ('delete', old.id, {viejos});"
+    insertar = f'INSERT INTO {indice}(rowid, {lista}) VALUES (new.id, {nuevos});'
+    return [
+        f'CREATE TRIGGER IF NOT EXISTS {indice}_ai AFTER INSERT ON "{tabla}" BEGIN {insertar} END',
+        f'CREATE TRIGGER IF NOT EXISTS {indice}_ad AFTER DELETE ON "{tabla}" BEGIN {borrar} END',
+        # Sólo cuando cambia una columna indexada: no al mover el stock.
+        f'CREATE TRIGGER IF NOT EXISTS {indice}_au AFTER UPDATE OF {lista} ON "{tabla}" '
+        f'BEGIN {borrar} {insertar} END',
+    ]
+
+
+def _sqlite(tabla, indice, columnas):
+    return [
+        f"CREATE VIRTUAL TABLE {indice} USING fts5({', '.join(columnas)}, content='{tabla}', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2', prefix='2 3 4')",
+        *triggers_sqlite(tabla, indice, columnas),
+        f"INSERT INTO {indice}({indice}) VALUES ('rebuild')",
+    ]
+
+
+def _postgresql(tabla, indice, columnas):
+    documento = " || ' ' || ".join(f"coalesce({c}, '')" for c in columnas)
+    return [f'CREATE INDEX {indice}_idx ON "{tabla}" USING gin (to_tsvector(\'simple\', {documento}))']
+
+
+def crear_indices(apps, schema_editor):
+    motor = schema_editor.connection.vendor
+    if motor not in ('sqlite', 'postgresql'):
+        return
+    for tabla, (indice, columnas) in INDICES.items():
+        for sentencia in (_sqlite if motor == 'sqlite' else _postgresql)(tabla, indice, columnas):
+            schema_editor.execute(sentencia)
+
+
+def borrar_indices(apps, schema_editor):
+    motor = schema_editor.connection.vendor
+    for indice, _ in INDICES.values():
+        if motor == 'sqlite':
+            # Los triggers son de la tabla del modelo: no se van con la virtual.
+            for sufijo in ('ai', 'ad', 'au'):
+                schema_editor.execute(f'DROP TRIGGER IF EXISTS {indice}_{sufijo}')
+            schema_editor.execute(f'DROP TABLE IF EXISTS {indice}')
+        elif motor == 'postgresql':
+            schema_editor.execute(f'DROP INDEX IF EXISTS {indice}_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_Ford', '0005_venta_diaria'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indices, borrar_indices),
+    ]
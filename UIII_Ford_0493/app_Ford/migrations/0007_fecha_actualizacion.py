@@ -0,0 +1,62 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:40
+
+import importlib
+
+from django.db import migrations, models
+
+busqueda = importlib.import_module('app_Ford.migrations.0006_busqueda_texto')
+
+
+def recrear_triggers(apps, schema_editor):
+    """
+    En SQLite AddField rehace la tabla y se pierden los triggers que
+    mantienen los índices de la búsqueda (0006); las filas no cambian.
+    """
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for tabla, (indice, columnas) in busqueda.INDICES.items():
+        for sentencia in busqueda.triggers_sqlite(tabla, indice, columnas):
+            schema_editor.execute(sentencia)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_Ford', '0006_busqueda_texto'),
+    ]
+
+    operations = [
+        # Al revertir, RemoveField también rehace las tablas.
+        migrations.RunPython(migrations.RunPython.noop, recrear_triggers),
+        migrations.AddField(
+            model_name='cliente',
+            name='fecha_actualizacion',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='empleado',
+            name='fecha_actualizacion',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='proveedor',
+            name='fecha_actualizacion',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='serviciomantenimiento',
+            name='fecha_actualizacion',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='vehiculo',
+            name='fecha_actualizacion',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='venta',
+            name='fecha_actualizacion',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(recrear_triggers, migrations.RunPython.noop),
+    ]
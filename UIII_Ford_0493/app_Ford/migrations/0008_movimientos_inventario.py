@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:58
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def saldos_iniciales(apps, schema_editor):
+    """Un ajuste por vehículo con su stock actual: el punto de partida de la bitácora."""
+    Vehiculo = apps.get_model('app_Ford', 'Vehiculo')
+    MovimientoInventario = apps.get_model('app_Ford', 'MovimientoInventario')
+    ahora = timezone.now()
+    lote = []
+    for vehiculo_id, cantidad in Vehiculo.objects.exclude(cantidad_disponible=0).values_list(
+            'id', 'cantidad_disponible').iterator():
+        lote.append(MovimientoInventario(
+            vehiculo_id=vehiculo_id, tipo='ajuste', cantidad=cantidad, fecha=ahora, nota='Saldo inicial'))
+        if len(lote) == 5000:
+            MovimientoInventario.objects.bulk_create(lote)
+            lote = []
+    MovimientoInventario.objects.bulk_create(lote)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_Ford', '0007_fecha_actualizacion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MovimientoInventario',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('entrada', 'Entrada'), ('venta', 'Venta'), ('devolucion', 'Devolución'), ('ajuste', 'Ajuste')], max_length=20)),
+                ('cantidad', models.IntegerField()),
+                ('fecha', models.DateTimeField(default=django.utils.timezone.now)),
+                ('nota', models.CharField(blank=True, default='', max_length=150)),
+                ('vehiculo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='movimientos', to='app_Ford.vehiculo')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['vehiculo', 'fecha'], name='movimiento_vehiculo_fecha_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SaldoInventario',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('corte', models.DateTimeField()),
+                ('saldo', models.IntegerField()),
+                ('vehiculo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='saldos', to='app_Ford.vehiculo')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('vehiculo', 'corte'), name='saldo_inventario_unico')],
+            },
+        ),
+        migrations.RunPython(saldos_iniciales, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_Ford', '0008_movimientos_inventario'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ServicioArchivado',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('tipo_servicio', models.CharField(max_length=150)),
+                ('fecha_servicio', models.DateField()),
+                ('costo_servicio', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('fecha_actualizacion', models.DateTimeField()),
+                ('cliente', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='app_Ford.cliente')),
+                ('proveedor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='app_Ford.proveedor')),
+                ('vehiculo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='app_Ford.vehiculo')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['fecha_servicio', 'id'], name='servicio_archivado_fecha_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='VentaArchivada',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('cliente_nombre', models.CharField(max_length=150)),
+                ('cliente_telefono', models.CharField(blank=True, max_length=50, null=True)),
+                ('fecha_venta', models.DateField()),
+                ('total', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('metodo_pago', models.CharField(blank=True, max_length=50, null=True)),
+                ('folio', models.CharField(blank=True, max_length=100, null=True)),
+                ('fecha_actualizacion', models.DateTimeField()),
+                ('empleado', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='app_Ford.empleado')),
+                ('vehiculo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='app_Ford.vehiculo')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['fecha_venta', 'id'], name='venta_archivada_fecha_idx')],
+            },
+        ),
+    ]
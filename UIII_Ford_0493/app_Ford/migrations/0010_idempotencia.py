@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:12
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def folios_repetidos(apps, schema_editor):
+    """
+    La restricción única no se puede crear si ya hay folios repetidos. No se
+    cambian solos (el folio es del negocio): se detiene la migración con la
+    lista para corregirlos a mano y volver a correr 'migrate'.
+    """
+    Venta = apps.get_model('app_Ford', 'Venta')
+    repetidos = (Venta.objects.filter(folio__gt='').values('folio')
+                 .annotate(n=Count('id')).filter(n__gt=1).order_by('folio'))
+    lineas = []
+    for fila in repetidos[:50]:
+        ids = Venta.objects.filter(folio=fila['folio']).order_by('id').values_list('id', flat=True)
+        lineas.append(f"  {fila['folio']}: ventas {', '.join(map(str, ids))}")
+    if lineas:
+        raise RuntimeError(
+            'Hay ventas con el mismo folio; corríjalas antes de migrar '
+            '(se muestran hasta 50):\n' + '\n'.join(lineas))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_Ford', '0009_archivo_historial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClaveIdempotencia',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ruta', models.CharField(max_length=20)),
+                ('clave', models.CharField(max_length=64)),
+                ('objeto_id', models.BigIntegerField()),
+                ('fecha', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.RunPython(folios_repetidos, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='venta',
+            constraint=models.UniqueConstraint(condition=models.Q(('folio__gt', '')), fields=('folio',), name='venta_folio_unico'),
+        ),
+        migrations.AddIndex(
+            model_name='claveidempotencia',
+            index=models.Index(fields=['fecha'], name='idempotencia_fecha_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='claveidempotencia',
+            constraint=models.UniqueConstraint(fields=('ruta', 'clave'), name='idempotencia_clave_unica'),
+        ),
+    ]
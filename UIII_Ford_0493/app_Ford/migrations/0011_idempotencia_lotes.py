@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_Ford', '0010_idempotencia'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='claveidempotencia',
+            name='resultado',
+            field=models.JSONField(null=True),
+        ),
+        migrations.AlterField(
+            model_name='claveidempotencia',
+            name='objeto_id',
+            field=models.BigIntegerField(null=True),
+        ),
+        migrations.AddIndex(
+            model_name='ventaarchivada',
+            index=models.Index(fields=['folio'], name='venta_archivada_folio_idx'),
+        ),
+    ]
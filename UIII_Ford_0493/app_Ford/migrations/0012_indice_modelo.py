@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_Ford', '0011_idempotencia_lotes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='vehiculo',
+            index=models.Index(fields=['modelo'], name='vehiculo_modelo_idx'),
+        ),
+    ]
@@ -1,5 +1,7 @@
 # app_Ford/models.py
 from django.db import models
+from django.db.models.functions import Lower
+from django.utils import timezone
 
 # ==========================================
 # MODELO: EMPLEADO
@@ -12,10 +14,18 @@ class Empleado(models.Model):
     email = models.EmailField(blank=True, null=True)
     fecha_contratacion = models.DateField(blank=True, null=True)
     salario = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
+    fecha_actualizacion = models.DateTimeField(auto_now=True) # La pone save(); update() debe ponerla a mano
     
     def __str__(self):  
         return f"{self.nombre} {self.apellido}"  
 
+    class Meta:
+        # Búsqueda por prefijo del autocompletado (ver autocompletar.py)
+        indexes = [
+            models.Index(Lower('nombre'), name='empleado_nombre_lower_idx'),
+            models.Index(Lower('apellido'), name='empleado_apellido_lower_idx'),
+        ]
+
 # ==========================================
 # MODELO: VEHÍCULO
 # ==========================================
@@ -27,6 +37,19 @@ class Vehiculo(models.Model):
     numero_serie = models.CharField(max_length=100, unique=True)
     precio = models.DecimalField(max_digits=12, decimal_places=2)
     cantidad_disponible = models.PositiveIntegerField(default=1)
+    fecha_actualizacion = models.DateTimeField(auto_now=True) # La pone save(); update() debe ponerla a mano
+
+    class Meta:
+        # Índices para los filtros y órdenes de 'ver_vehiculos' (ver filtros.py)
+        indexes = [
+            models.Index(fields=['marca', 'modelo', 'anio'], name='vehiculo_marca_modelo_idx'),
+            models.Index(fields=['anio'], name='vehiculo_anio_idx'),
+            # 'modelo' sin 'marca' no puede usar el índice anterior
+            models.Index(fields=['modelo'], name='vehiculo_modelo_idx'),
+            # Búsqueda por prefijo del autocompletado (ver autocompletar.py)
+            models.Index(Lower('numero_serie'), name='vehiculo_serie_lower_idx'),
+            models.Index(Lower('modelo'), name='vehiculo_modelo_lower_idx'),
+        ]
     
     def __str__(self):  
         return f"{self.marca} {self.modelo} ({self.anio})"  
@@ -43,10 +66,126 @@ class Venta(models.Model):
     total = models.DecimalField(max_digits=12, decimal_places=2)
     metodo_pago = models.CharField(max_length=50, blank=True, null=True)
     folio = models.CharField(max_length=100, blank=True, null=True)
+    fecha_actualizacion = models.DateTimeField(auto_now=True) # La pone save(); update() debe ponerla a mano
+
+    class Meta:
+        # Índices para los filtros de 'ver_ventas' (ver filtros.py); todos
+        # terminan en la fecha para que el filtro y el orden usen el mismo índice.
+        indexes = [
+            models.Index(fields=['fecha_venta', 'id'], name='venta_fecha_idx'),
+            models.Index(fields=['empleado', 'fecha_venta'], name='venta_empleado_fecha_idx'),
+            models.Index(fields=['metodo_pago', 'fecha_venta'], name='venta_metodo_fecha_idx'),
+        ]
+        # El folio es opcional, pero si se captura no se repite: un reintento
+        # sin clave de idempotencia con el mismo folio no crea otra venta.
+        constraints = [
+            models.UniqueConstraint(
+                fields=['folio'], condition=models.Q(folio__gt=''), name='venta_folio_unico'),
+        ]
     
     def __str__(self):  
         return f"Venta {self.folio or self.id}"
 
+# ==========================================
+# MODELO: VENTA ARCHIVADA
+# ==========================================
+class VentaArchivada(models.Model):
+    # Ventas de más de FORD_ARCHIVO_DIAS días, movidas aquí por
+    # 'manage.py archivar_historial' (ver archivo.py). Mismas columnas que
+    # Venta y el mismo id; sólo se leen.
+    archivada = True
+
+    id = models.BigIntegerField(primary_key=True) # El de la venta original
+    vehiculo = models.ForeignKey(Vehiculo, on_delete=models.CASCADE, related_name='+')
+    empleado = models.ForeignKey(Empleado, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    cliente_nombre = models.CharField(max_length=150)
+    cliente_telefono = models.CharField(max_length=50, blank=True, null=True)
+    fecha_venta = models.DateField()
+    total = models.DecimalField(max_digits=12, decimal_places=2)
+    metodo_pago = models.CharField(max_length=50, blank=True, null=True)
+    folio = models.CharField(max_length=100, blank=True, null=True)
+    fecha_actualizacion = models.DateTimeField()
+
+    class Meta:
+        # Se consulta con un rango de fechas, y por folio al validar uno
+        # nuevo: los folios archivados tampoco se reutilizan.
+        indexes = [
+            models.Index(fields=['fecha_venta', 'id'], name='venta_archivada_fecha_idx'),
+            models.Index(fields=['folio'], name='venta_archivada_folio_idx'),
+        ]
+
+    def __str__(self):
+        return f"Venta {self.folio or self.id}"
+
+# ==========================================
+# MODELO: RESUMEN DIARIO DE VENTAS
+# ==========================================
+class VentaDiaria(models.Model):
+    # Número de ventas y suma de 'total' de un día en una dimensión del
+    # reporte (día, empleado, modelo o método de pago). Se mantiene junto con
+    # cada venta; ver resumenes.py.
+    fecha = models.DateField()
+    dimension = models.CharField(max_length=20)
+    clave = models.CharField(max_length=150, blank=True, default='')
+    ventas = models.IntegerField(default=0)
+    total = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+
+    class Meta:
+        # Los reportes filtran por dimensión y rango de fechas.
+        constraints = [
+            models.UniqueConstraint(fields=['dimension', 'fecha', 'clave'], name='venta_diaria_unica'),
+        ]
+
+    def __str__(self):
+        return f"{self.fecha} {self.dimension}={self.clave}: {self.ventas}"
+
+# ==========================================
+# MODELO: MOVIMIENTO DE INVENTARIO
+# ==========================================
+class MovimientoInventario(models.Model):
+    # Bitácora del stock: sólo se insertan filas, nunca se cambian ni se
+    # borran (salvo junto con el vehículo). 'cantidad_disponible' del
+    # vehículo es la suma de sus movimientos; ver inventario.py.
+    TIPOS = [
+        ('entrada', 'Entrada'),
+        ('venta', 'Venta'),
+        ('devolucion', 'Devolución'),
+        ('ajuste', 'Ajuste'),
+    ]
+    vehiculo = models.ForeignKey(Vehiculo, on_delete=models.CASCADE, related_name='movimientos')
+    tipo = models.CharField(max_length=20, choices=TIPOS)
+    cantidad = models.IntegerField() # Positiva entra, negativa sale
+    fecha = models.DateTimeField(default=timezone.now)
+    nota = models.CharField(max_length=150, blank=True, default='')
+
+    class Meta:
+        # Movimientos de un vehículo desde una foto (ver SaldoInventario)
+        indexes = [
+            models.Index(fields=['vehiculo', 'fecha'], name='movimiento_vehiculo_fecha_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_tipo_display()} {self.cantidad:+d} de {self.vehiculo_id}"
+
+# ==========================================
+# MODELO: FOTO DEL SALDO DE INVENTARIO
+# ==========================================
+class SaldoInventario(models.Model):
+    # Suma de los movimientos del vehículo con fecha <= 'corte'. Las crea
+    # 'manage.py compactar_inventario'; ver inventario.py.
+    vehiculo = models.ForeignKey(Vehiculo, on_delete=models.CASCADE, related_name='saldos')
+    corte = models.DateTimeField()
+    saldo = models.IntegerField()
+
+    class Meta:
+        # La última foto antes de una fecha es una búsqueda en este índice.
+        constraints = [
+            models.UniqueConstraint(fields=['vehiculo', 'corte'], name='saldo_inventario_unico'),
+        ]
+
+    def __str__(self):
+        return f"{self.vehiculo_id} al {self.corte}: {self.saldo}"
+
 # ==========================================
 # MODELO: CLIENTE (NUEVO)
 # ==========================================
@@ -56,6 +195,14 @@ class Cliente(models.Model):
     correo_electronico = models.EmailField(blank=True, null=True)
     telefono = models.CharField(max_length=30, blank=True, null=True)
     fecha_registro = models.DateField(auto_now_add=True) # Se asigna la fecha actual al crear
+    fecha_actualizacion = models.DateTimeField(auto_now=True) # La pone save(); update() debe ponerla a mano
+
+    class Meta:
+        # Búsqueda por prefijo del autocompletado (ver autocompletar.py)
+        indexes = [
+            models.Index(Lower('nombre'), name='cliente_nombre_lower_idx'),
+            models.Index(Lower('apellido'), name='cliente_apellido_lower_idx'),
+        ]
 
     def __str__(self):
         return f"{self.nombre} {self.apellido}"
@@ -69,6 +216,13 @@ class Proveedor(models.Model):
     direccion = models.CharField(max_length=255, blank=True, null=True)
     email = models.EmailField(blank=True, null=True)
     producto = models.CharField(max_length=100, blank=True, null=True) # Producto o servicio que ofrece
+    fecha_actualizacion = models.DateTimeField(auto_now=True) # La pone save(); update() debe ponerla a mano
+
+    class Meta:
+        # Búsqueda por prefijo del autocompletado (ver autocompletar.py)
+        indexes = [
+            models.Index(Lower('nombre_proveedor'), name='proveedor_nombre_lower_idx'),
+        ]
 
     def __str__(self):
         return self.nombre_proveedor
@@ -86,6 +240,65 @@ class ServicioMantenimiento(models.Model):
     tipo_servicio = models.CharField(max_length=150)
     fecha_servicio = models.DateField()
     costo_servicio = models.DecimalField(max_digits=10, decimal_places=2)
+    fecha_actualizacion = models.DateTimeField(auto_now=True) # La pone save(); update() debe ponerla a mano
+
+    class Meta:
+        # Índices para los filtros de 'ver_servicios' (ver filtros.py)
+        indexes = [
+            models.Index(fields=['fecha_servicio', 'id'], name='servicio_fecha_idx'),
+            models.Index(fields=['vehiculo', 'fecha_servicio'], name='servicio_vehiculo_fecha_idx'),
+            models.Index(fields=['proveedor', 'fecha_servicio'], name='servicio_proveedor_fecha_idx'),
+        ]
     
     def __str__(self):
-        return f"Servicio de '{self.tipo_servicio}' para {self.vehiculo}"
\ No newline at end of file
+        return f"Servicio de '{self.tipo_servicio}' para {self.vehiculo}"
+
+# ==========================================
+# MODELO: SERVICIO ARCHIVADO
+# ==========================================
+class ServicioArchivado(models.Model):
+    # Como VentaArchivada, para ServicioMantenimiento.
+    archivada = True
+
+    id = models.BigIntegerField(primary_key=True) # El del servicio original
+    vehiculo = models.ForeignKey(Vehiculo, on_delete=models.CASCADE, related_name='+')
+    cliente = models.ForeignKey(Cliente, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    proveedor = models.ForeignKey(Proveedor, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    tipo_servicio = models.CharField(max_length=150)
+    fecha_servicio = models.DateField()
+    costo_servicio = models.DecimalField(max_digits=10, decimal_places=2)
+    fecha_actualizacion = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['fecha_servicio', 'id'], name='servicio_archivado_fecha_idx'),
+        ]
+
+    def __str__(self):
+        return f"Servicio de '{self.tipo_servicio}' para {self.vehiculo}"
+
+# ==========================================
+# MODELO: CLAVE DE IDEMPOTENCIA
+# ==========================================
+class ClaveIdempotencia(models.Model):
+    # Una por alta hecha con clave de idempotencia (campo oculto del
+    # formulario o encabezado Idempotency-Key): si la misma petición vuelve a
+    # llegar se responde con lo ya creado. Se borran después de
+    # FORD_IDEMPOTENCIA_HORAS horas; ver idempotencia.py.
+    ruta = models.CharField(max_length=20) # 'venta', 'servicio' o 'lote'
+    clave = models.CharField(max_length=64)
+    objeto_id = models.BigIntegerField(null=True) # Lo que creó la petición original
+    resultado = models.JSONField(null=True) # La respuesta original de un lote
+    fecha = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        # Buscar una clave es una sola búsqueda en el índice único.
+        constraints = [
+            models.UniqueConstraint(fields=['ruta', 'clave'], name='idempotencia_clave_unica'),
+        ]
+        indexes = [
+            models.Index(fields=['fecha'], name='idempotencia_fecha_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.ruta} {self.clave} -> {self.objeto_id}"
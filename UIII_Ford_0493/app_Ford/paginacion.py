@@ -0,0 +1,179 @@
+# app_Ford/paginacion.py
+import base64
+import json
+from operator import attrgetter
+
+from django.conf import settings
+from django.db.models import Q
+
+# ==========================================
+# PAGINACIÓN POR CURSOR (KEYSET)
+# ==========================================
+# En lugar de LIMIT/OFFSET (que obliga a la base de datos a recorrer y
+# descartar todas las filas anteriores), cada página se pide "a partir de"
+# la última fila vista: WHERE (fecha, id) < (:fecha, :id) ORDER BY ... LIMIT n.
+# Así el costo de cada página no depende del tamaño de la tabla.
+#
+# Una lista puede venir de varias tablas con las mismas columnas (una tabla
+# y su archivo, ver archivo.py): se pide la página a cada una y se mezclan
+# las filas en Python; siguen siendo a lo más tamaño + 1 filas por tabla.
+
+TAMANO_PAGINA_POR_DEFECTO = getattr(settings, 'FORD_TAMANO_PAGINA', 50)
+TAMANO_PAGINA_MAXIMO = getattr(settings, 'FORD_TAMANO_PAGINA_MAXIMO', 500)
+
+
+def _tamano_pagina(request):
+    try:
+        tamano = int(request.GET.get('tamano', TAMANO_PAGINA_POR_DEFECTO))
+    except (ValueError, TypeError):
+        tamano = TAMANO_PAGINA_POR_DEFECTO
+    return max(1, min(tamano, TAMANO_PAGINA_MAXIMO))
+
+
+def _invertir(orden):
+    return [campo[1:] if campo.startswith('-') else f'-{campo}' for campo in orden]
+
+
+def _codificar_cursor(obj, orden):
+    valores = []
+    for campo in orden:
+        field = obj._meta.get_field(campo.lstrip('-'))
+        valores.append(field.value_to_string(obj))
+    texto = json.dumps(valores, separators=(',', ':'))
+    return base64.urlsafe_b64encode(texto.encode()).decode().rstrip('=')
+
+
+def _decodificar_cursor(cursor, modelo, orden):
+    """
+    Devuelve la lista de valores del cursor, o None si no viene o es inválido
+    (un cursor manipulado simplemente regresa a la primera página).
+    """
+    if not cursor:
+        return None
+    try:
+        relleno = '=' * (-len(cursor) % 4)
+        valores = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+        if not isinstance(valores, list) or len(valores) != len(orden):
+            return None
+        return [
+            modelo._meta.get_field(campo.lstrip('-')).to_python(valor)
+            for campo, valor in zip(orden, valores)
+        ]
+    except Exception:
+        return None
+
+
+def _condicion_keyset(orden, valores):
+    """
+    Construye la condición "fila posterior al cursor" para un ORDER BY
+    de varias columnas:
+        (a > va) OR (a = va AND b > vb) OR ...
+    usando '<' en las columnas descendentes.
+    """
+    condicion = Q()
+    iguales = {}
+    for campo, valor in zip(orden, valores):
+        nombre = campo.lstrip('-')
+        operador = 'lt' if campo.startswith('-') else 'gt'
+        condicion |= Q(**iguales, **{f'{nombre}__{operador}': valor})
+        iguales[nombre] = valor
+    return condicion
+
+
+def _url_con(request, **parametros):
+    consulta = request.GET.copy()
+    for clave in ('despues', 'antes'):
+        consulta.pop(clave, None)
+    for clave, valor in parametros.items():
+        consulta[clave] = valor
+    return f'?{consulta.urlencode()}'
+
+
+def _consulta_de_pagina(request, querysets, orden):
+    """
+    Los querysets (sin evaluar) de la página pedida, uno por tabla, el orden
+    en que vienen sus filas y cómo interpretarlos.
+    """
+    tamano = _tamano_pagina(request)
+    modelo = querysets[0].model
+    antes = _decodificar_cursor(request.GET.get('antes'), modelo, orden)
+    despues = _decodificar_cursor(request.GET.get('despues'), modelo, orden)
+
+    if antes is not None:
+        # Página anterior: se recorre en sentido inverso y se voltea el resultado.
+        orden_consulta = _invertir(orden)
+        condicion = _condicion_keyset(orden_consulta, antes)
+    else:
+        orden_consulta = orden
+        condicion = _condicion_keyset(orden, despues) if despues is not None else Q()
+    # Se pide una fila extra sólo para saber si existe otra página.
+    consultas = [queryset.filter(condicion).order_by(*orden_consulta)[:tamano + 1] for queryset in querysets]
+    return consultas, orden_consulta, tamano, antes is not None, despues is not None
+
+
+def _mezclar(listas, orden, tamano):
+    """Junta las filas de varias tablas (cada lista ya en 'orden') y deja tamaño + 1."""
+    if len(listas) == 1:
+        return listas[0]
+    filas = [fila for lista in listas for fila in lista]
+    # Ordenamientos estables del último campo al primero: respeta la
+    # dirección de cada campo.
+    for campo in reversed(orden):
+        filas.sort(key=attrgetter(campo.lstrip('-')), reverse=campo.startswith('-'))
+    return filas[:tamano + 1]
+
+
+def _armar_pagina(request, filas, orden, tamano, hacia_atras, con_despues):
+    if hacia_atras:
+        hay_anterior = len(filas) > tamano
+        filas = filas[:tamano]
+        filas.reverse()
+        hay_siguiente = True
+    else:
+        hay_siguiente = len(filas) > tamano
+        filas = filas[:tamano]
+        hay_anterior = con_despues
+
+    url_siguiente = None
+    url_anterior = None
+    if filas and hay_siguiente:
+        url_siguiente = _url_con(request, despues=_codificar_cursor(filas[-1], orden))
+    if filas and hay_anterior:
+        url_anterior = _url_con(request, antes=_codificar_cursor(filas[0], orden))
+
+    return {
+        'objetos': filas,
+        'tamano': tamano,
+        'url_siguiente': url_siguiente,
+        'url_anterior': url_anterior,
+        'url_inicio': _url_con(request) if hay_anterior else None,
+    }
+
+
+def _querysets(queryset):
+    return list(queryset) if isinstance(queryset, (list, tuple)) else [queryset]
+
+
+def paginar_por_cursor(request, queryset, orden=('id',)):
+    """
+    Pagina 'queryset' por cursor según 'orden' (lista de campos, con '-'
+    para descendente). El último campo debe ser único (normalmente 'id')
+    para que el orden sea total. 'queryset' también puede ser una lista de
+    querysets con esos campos (ver archivo.con_archivo).
+
+    Parámetros GET: 'despues' / 'antes' (cursores opacos) y 'tamano'.
+    Regresa un diccionario con los objetos de la página y las URLs de
+    navegación para la plantilla 'paginacion.html'.
+    """
+    orden = list(orden)
+    consultas, orden_consulta, tamano, *resto = _consulta_de_pagina(request, _querysets(queryset), orden)
+    filas = _mezclar([list(consulta) for consulta in consultas], orden_consulta, tamano)
+    return _armar_pagina(request, filas, orden, tamano, *resto)
+
+
+async def apaginar_por_cursor(request, queryset, orden=('id',)):
+    """paginar_por_cursor para vistas async (ORM asíncrono)."""
+    orden = list(orden)
+    consultas, orden_consulta, tamano, *resto = _consulta_de_pagina(request, _querysets(queryset), orden)
+    filas = _mezclar([[fila async for fila in consulta] for consulta in consultas], orden_consulta, tamano)
+    return _armar_pagina(request, filas, orden, tamano, *resto)
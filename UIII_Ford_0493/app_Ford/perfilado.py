@@ -0,0 +1,151 @@
+# app_Ford/perfilado.py
+import cProfile
+import hmac
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+# ==========================================
+# PERFILADO POR MUESTREO EN PRODUCCIÓN
+# ==========================================
+# Middleware opcional que perfila con cProfile:
+#   - una fracción de las peticiones (FORD_PERFILADO_FRACCION, 0.01 = 1 %), y/o
+#   - las que traen la cabecera 'X-Ford-Perfil: <FORD_PERFILADO_SECRETO>'.
+#
+# Cada perfil se guarda como '<fecha_ns>_<vista>.prof' (formato pstats) en
+# FORD_PERFILADO_DIR. El directorio funciona como anillo: al pasar de
+# FORD_PERFILADO_MAXIMO perfiles se borran los más viejos, así que el disco
+# usado tiene un tope aunque el perfilado quede encendido.
+#
+# cProfile sólo guarda pares llamador -> llamado y junta los niveles de una
+# recursión (la cadena de middleware lo es), así que no sirve para armar
+# pilas completas. Para el flamegraph, mientras se perfila la petición un
+# hilo toma la pila real cada FORD_PERFILADO_PILAS_MS y la guarda en
+# '<fecha_ns>_<vista>.colapsado' con el formato "a;b;c <muestras>" que leen
+# flamegraph.pl y speedscope.
+#
+# 'manage.py fusionar_perfiles' suma ambos por vista.
+
+CABECERA = 'HTTP_X_FORD_PERFIL'
+_NOMBRE_SEGURO = re.compile(r'[^A-Za-z0-9_.-]')
+
+
+def directorio_perfiles():
+    return Path(getattr(settings, 'FORD_PERFILADO_DIR', settings.BASE_DIR / 'perfiles'))
+
+
+def vista_del_archivo(ruta):
+    """'1700000000000_ver_ventas.prof' -> 'ver_ventas'."""
+    return Path(ruta).stem.split('_', 1)[1]
+
+
+def recortar_anillo(directorio, maximo):
+    """Borra los perfiles más viejos (y sus pilas) hasta dejar 'maximo'."""
+    perfiles = sorted(directorio.glob('*.prof'))
+    for viejo in perfiles[:max(0, len(perfiles) - maximo)]:
+        viejo.unlink(missing_ok=True)
+        viejo.with_suffix('.colapsado').unlink(missing_ok=True)
+
+
+def _etiqueta(marco):
+    codigo = marco.f_code
+    partes = Path(codigo.co_filename).parts
+    archivo = '/'.join(partes[-2:]) if len(partes) > 1 else codigo.co_filename
+    return f'{archivo}:{codigo.co_name}'.replace(';', ',').replace(' ', '_')
+
+
+class MuestreadorPilas(threading.Thread):
+    """
+    Toma la pila del hilo 'objetivo' cada 'intervalo' segundos hasta que se
+    llama a detener(). Con el GIL, en la práctica toma una muestra cada
+    intervalo o cada cambio de hilo (~5 ms), lo que sea mayor.
+    """
+
+    def __init__(self, objetivo, intervalo):
+        super().__init__(daemon=True)
+        self.objetivo = objetivo
+        self.intervalo = intervalo
+        self.pilas = Counter()
+        self._fin = threading.Event()
+
+    def run(self):
+        while not self._fin.wait(self.intervalo):
+            marco = sys._current_frames().get(self.objetivo)
+            pila = []
+            while marco is not None:
+                pila.append(_etiqueta(marco))
+                marco = marco.f_back
+            if pila:
+                self.pilas[';'.join(reversed(pila))] += 1
+
+    def detener(self):
+        self._fin.set()
+        self.join()
+        return self.pilas
+
+
+def escribir_colapsado(ruta, pilas):
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        for pila, muestras in pilas.most_common():
+            archivo.write(f'{pila} {muestras}\n')
+
+
+class PerfiladoMiddleware:
+    """
+    Debe ir antes que los middleware que se quieran incluir en el perfil.
+    Django lo descarta si no hay fracción ni secreto configurados.
+    """
+
+    def __init__(self, get_response):
+        self.fraccion = getattr(settings, 'FORD_PERFILADO_FRACCION', 0) or 0
+        self.secreto = getattr(settings, 'FORD_PERFILADO_SECRETO', '') or ''
+        if self.fraccion <= 0 and not self.secreto:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.maximo = getattr(settings, 'FORD_PERFILADO_MAXIMO', 200)
+        self.intervalo_pilas = getattr(settings, 'FORD_PERFILADO_PILAS_MS', 2) / 1000
+
+    def debe_perfilar(self, request):
+        valor = request.META.get(CABECERA)
+        if self.secreto and valor and hmac.compare_digest(valor, self.secreto):
+            return True
+        return self.fraccion > 0 and random.random() < self.fraccion
+
+    def __call__(self, request):
+        if not self.debe_perfilar(request):
+            return self.get_response(request)
+
+        perfil = cProfile.Profile()
+        try:
+            perfil.enable()
+        except ValueError:
+            # Otro perfilador activo (p. ej. otra petición en Python 3.12+).
+            return self.get_response(request)
+        muestreador = None
+        if self.intervalo_pilas > 0:
+            muestreador = MuestreadorPilas(threading.get_ident(), self.intervalo_pilas)
+            muestreador.start()
+        try:
+            respuesta = self.get_response(request)
+        finally:
+            perfil.disable()
+            pilas = muestreador.detener() if muestreador else None
+
+        coincidencia = getattr(request, 'resolver_match', None)
+        vista = (coincidencia.url_name if coincidencia else None) or 'desconocida'
+        directorio = directorio_perfiles()
+        directorio.mkdir(parents=True, exist_ok=True)
+        archivo = directorio / f'{time.time_ns()}_{_NOMBRE_SEGURO.sub("_", vista)}.prof'
+        perfil.dump_stats(archivo)
+        if pilas:
+            escribir_colapsado(archivo.with_suffix('.colapsado'), pilas)
+        recortar_anillo(directorio, self.maximo)
+        respuesta['X-Ford-Perfil'] = archivo.name
+        return respuesta
@@ -0,0 +1,307 @@
+# app_Ford/resumenes.py
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import connections, router, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncMonth
+
+from . import tablero
+from .models import Empleado, Vehiculo, Venta, VentaArchivada, VentaDiaria
+
+# ==========================================
+# RESÚMENES DIARIOS DE VENTAS
+# ==========================================
+# Los reportes (ver 'reporte_ventas') no recorren la tabla de ventas: leen
+# VentaDiaria, que guarda por día el número de ventas y la suma de 'total'
+# en cada dimensión del reporte:
+#
+#     dimension='dia'          clave=''              (total del día)
+#     dimension='empleado'     clave=<empleado_id>   ('' = sin empleado)
+#     dimension='modelo'       clave=<modelo del vehículo>
+#     dimension='metodo_pago'  clave=<método>        ('' = sin método)
+#
+# Cada día tiene a lo más una fila por empleado, modelo y método, así que
+# un reporte de cualquier rango lee pocas filas aunque haya millones de
+# ventas.
+#
+# Las vistas que crean, cambian o borran ventas (y la API de lotes) llaman a
+# estas funciones dentro de la misma transacción que el INSERT/UPDATE/DELETE,
+# así que el resumen nunca queda a medias. Borrar un empleado o un vehículo
+# lo ajusta por señales (signals.py). Lo que se cambie por otro camino (el
+# admin, un UPDATE a mano) se repara con 'manage.py reconstruir_resumenes'.
+#
+# Las ventas archivadas (ver archivo.py) siguen contando: todo lo que
+# recalcula desde las ventas lee la tabla de uso diario y la de archivo.
+
+DIMENSIONES = {
+    'dia': None,
+    'empleado': 'empleado_id',
+    'modelo': 'vehiculo__modelo',
+    'metodo_pago': 'metodo_pago',
+}
+
+
+# agrupar= de 'reporte_ventas' -> título de la columna
+AGRUPACIONES = {
+    'mes': 'Mes',
+    'dia': 'Día',
+    'empleado': 'Empleado',
+    'modelo': 'Modelo',
+    'metodo_pago': 'Método de pago',
+}
+SIN_VALOR = {'empleado': 'Sin empleado', 'modelo': 'Sin modelo', 'metodo_pago': 'Sin método'}
+
+
+def _clave(grupo, dimension):
+    """Clave de la fila del resumen a la que pertenece 'grupo' en 'dimension'."""
+    if dimension == 'dia':
+        return ''
+    valor = grupo['modelo' if dimension == 'modelo' else DIMENSIONES[dimension]]
+    return '' if valor is None else str(valor)
+
+
+def _decimal(valor):
+    return Decimal(str(valor or 0)).quantize(Decimal('0.01'))
+
+
+def _aplicar(cambios, lote=1000):
+    """
+    Suma 'cambios' {(fecha, dimension, clave): [ventas, total]} al resumen
+    (los negativos restan). Un solo INSERT ... ON CONFLICT DO UPDATE por
+    cada 'lote' filas (SQLite 3.24+ y PostgreSQL): crea las filas que faltan
+    y suma a las que existen en la misma sentencia, así que dos ventas
+    simultáneas del mismo día no chocan y el número de consultas no depende
+    de si la fila ya existía.
+    """
+    filas = [(dimension, fecha, clave, ventas, total)
+             for (fecha, dimension, clave), (ventas, total) in cambios.items() if ventas or total]
+    if not filas:
+        return
+    conexion = connections[router.db_for_write(VentaDiaria)]
+    tabla = conexion.ops.quote_name(VentaDiaria._meta.db_table)
+    with conexion.cursor() as cursor:
+        for inicio in range(0, len(filas), lote):
+            parte = filas[inicio:inicio + lote]
+            cursor.execute(
+                f'INSERT INTO {tabla} (dimension, fecha, clave, ventas, total) '
+                f'VALUES {", ".join(["(%s, %s, %s, %s, %s)"] * len(parte))} '
+                f'ON CONFLICT (dimension, fecha, clave) DO UPDATE SET '
+                f'ventas = {tabla}.ventas + EXCLUDED.ventas, total = {tabla}.total + EXCLUDED.total',
+                [valor for fila in parte for valor in fila],
+            )
+    if any(fila[3] < 0 for fila in filas):
+        VentaDiaria.objects.filter(fecha__in={fila[1] for fila in filas}, ventas__lte=0).delete()
+    # SQL directo: no hay post_save que avise al tablero.
+    tablero.invalidar()
+
+
+def _nuevos_cambios():
+    return defaultdict(lambda: [0, Decimal('0')])
+
+
+def acumular(grupos, signo=1):
+    """
+    Aplica al resumen una lista de grupos de ventas, cada uno un diccionario
+    con 'fecha_venta', 'empleado_id', 'modelo', 'metodo_pago', 'ventas' y
+    'total'. signo=-1 los resta.
+    """
+    cambios = _nuevos_cambios()
+    for grupo in grupos:
+        for dimension in DIMENSIONES:
+            cambio = cambios[(grupo['fecha_venta'], dimension, _clave(grupo, dimension))]
+            cambio[0] += signo * grupo['ventas']
+            cambio[1] += signo * _decimal(grupo['total'])
+    _aplicar(cambios)
+
+
+def _grupos_de_ventas(ventas):
+    """Un grupo por venta (instancias de Venta), con el modelo del vehículo."""
+    faltantes = {v.vehiculo_id for v in ventas if not Venta.vehiculo.is_cached(v)}
+    modelos = dict(Vehiculo.objects.filter(id__in=faltantes).values_list('id', 'modelo')) if faltantes else {}
+    return [{
+        'fecha_venta': venta.fecha_venta,
+        'empleado_id': venta.empleado_id,
+        'modelo': venta.vehiculo.modelo if Venta.vehiculo.is_cached(venta) else modelos.get(venta.vehiculo_id),
+        'metodo_pago': venta.metodo_pago,
+        'ventas': 1,
+        'total': venta.total,
+    } for venta in ventas]
+
+
+def registrar_ventas(ventas):
+    """Suma al resumen ventas recién creadas."""
+    acumular(_grupos_de_ventas(ventas))
+
+
+def quitar_ventas(ventas):
+    """Resta del resumen ventas borradas (o su estado anterior a un cambio)."""
+    acumular(_grupos_de_ventas(ventas), signo=-1)
+
+
+def cambiar_venta(anterior, nueva):
+    """
+    Pasa una venta editada de su estado 'anterior' (una copia tomada antes
+    del cambio) al nuevo. Las claves que no cambian sólo ajustan el total.
+    """
+    antes, despues = _grupos_de_ventas([anterior, nueva])
+    antes['ventas'], antes['total'] = -1, -_decimal(antes['total'])
+    acumular([antes, despues])
+
+
+def ventas_agrupadas(queryset, dimension=None):
+    """
+    Agrupa 'queryset' de Venta por día y por las columnas del resumen (o
+    sólo por la de 'dimension'), en el formato que recibe acumular().
+    """
+    columnas = ['fecha_venta', 'empleado_id', 'vehiculo__modelo', 'metodo_pago']
+    if dimension is not None:
+        columnas = ['fecha_venta'] + ([DIMENSIONES[dimension]] if DIMENSIONES[dimension] else [])
+    filas = queryset.order_by().values(*columnas).annotate(ventas=Count('id'), total=Sum('total'))
+    for fila in filas.iterator():
+        fila.setdefault('empleado_id', None)
+        fila.setdefault('metodo_pago', None)
+        fila['modelo'] = fila.pop('vehiculo__modelo', None)
+        yield fila
+
+
+def _ventas(**filtros):
+    """Las ventas que cumplen 'filtros' en la tabla de uso diario y en el archivo."""
+    return [Venta.objects.filter(**filtros), VentaArchivada.objects.filter(**filtros)]
+
+
+def reasignar_empleado(empleado_id):
+    """
+    Al borrar un empleado sus ventas quedan sin empleado (SET_NULL): sus
+    filas del resumen se pasan a la clave ''.
+    """
+    filas = VentaDiaria.objects.filter(dimension='empleado', clave=str(empleado_id))
+    cambios = _nuevos_cambios()
+    for fecha, ventas, total in filas.values_list('fecha', 'ventas', 'total'):
+        cambios[(fecha, 'empleado', '')] = [ventas, total]
+    filas.delete()
+    _aplicar(cambios)
+
+
+def reasignar_ventas(ventas, empleado_id):
+    """
+    Pasa en el resumen las ventas de 'ventas' (un queryset, antes de su
+    UPDATE) al empleado 'empleado_id'. Una consulta agrupada por día y
+    empleado, sin importar cuántas ventas sean.
+    """
+    cambios = _nuevos_cambios()
+    for grupo in ventas_agrupadas(ventas, 'empleado'):
+        ventas_grupo, total = grupo['ventas'], _decimal(grupo['total'])
+        for clave, signo in ((_clave(grupo, 'empleado'), -1), (str(empleado_id), 1)):
+            cambio = cambios[(grupo['fecha_venta'], 'empleado', clave)]
+            cambio[0] += signo * ventas_grupo
+            cambio[1] += signo * total
+    _aplicar(cambios)
+
+
+def cambiar_modelo(vehiculo_id, anterior, nuevo):
+    """Mueve las ventas de un vehículo al cambiar su modelo."""
+    if anterior == nuevo:
+        return
+    cambios = _nuevos_cambios()
+    for queryset in _ventas(vehiculo_id=vehiculo_id):
+        for grupo in ventas_agrupadas(queryset, 'modelo'):
+            ventas, total = grupo['ventas'], _decimal(grupo['total'])
+            for clave, signo in ((anterior or '', -1), (nuevo or '', 1)):
+                cambio = cambios[(grupo['fecha_venta'], 'modelo', clave)]
+                cambio[0] += signo * ventas
+                cambio[1] += signo * total
+    _aplicar(cambios)
+
+
+def quitar_vehiculo(vehiculo_id):
+    """Al borrar un vehículo se borran sus ventas (CASCADE): se restan antes."""
+    for queryset in _ventas(vehiculo_id=vehiculo_id):
+        acumular(ventas_agrupadas(queryset), signo=-1)
+
+
+def _rango(queryset, campo, desde, hasta):
+    if desde is not None:
+        queryset = queryset.filter(**{f'{campo}__gte': desde})
+    if hasta is not None:
+        queryset = queryset.filter(**{f'{campo}__lte': hasta})
+    return queryset
+
+
+def calcular(desde=None, hasta=None):
+    """
+    El resumen correcto según las ventas (con las archivadas), entre 'desde' y 'hasta':
+    {(dimension, fecha, clave): (ventas, total)}.
+    """
+    filas = _nuevos_cambios()
+    for queryset in _ventas():
+        ventas = _rango(queryset, 'fecha_venta', desde, hasta)
+        for dimension in DIMENSIONES:
+            # NULL y '' caen en la misma clave: se juntan aquí.
+            for grupo in ventas_agrupadas(ventas, dimension):
+                fila = filas[(dimension, grupo['fecha_venta'], _clave(grupo, dimension))]
+                fila[0] += grupo['ventas']
+                fila[1] += _decimal(grupo['total'])
+    return {clave: tuple(fila) for clave, fila in filas.items()}
+
+
+def guardado(desde=None, hasta=None):
+    """El resumen tal como está en VentaDiaria, en el formato de calcular()."""
+    filas = _rango(VentaDiaria.objects.all(), 'fecha', desde, hasta)
+    return {
+        (dimension, fecha, clave): (ventas, _decimal(total))
+        for dimension, fecha, clave, ventas, total
+        in filas.values_list('dimension', 'fecha', 'clave', 'ventas', 'total').iterator()
+    }
+
+
+def reconstruir(desde=None, hasta=None, lote=5000):
+    """
+    Vuelve a calcular el resumen desde la tabla de ventas (todo, o sólo las
+    fechas entre 'desde' y 'hasta'). Regresa el número de filas escritas.
+    """
+    with transaction.atomic():
+        _rango(VentaDiaria.objects.all(), 'fecha', desde, hasta).delete()
+        creadas = VentaDiaria.objects.bulk_create([
+            VentaDiaria(fecha=fecha, dimension=dimension, clave=clave, ventas=ventas, total=total)
+            for (dimension, fecha, clave), (ventas, total) in calcular(desde, hasta).items()
+        ], batch_size=lote)
+    tablero.invalidar()
+    return len(creadas)
+
+
+# ==========================================
+# REPORTES
+# ==========================================
+
+def reporte(filas, agrupar):
+    """
+    Agrupa las filas de VentaDiaria (ya filtradas por fecha) según
+    'agrupar' (ver AGRUPACIONES). Regresa [{'etiqueta', 'ventas', 'total'}],
+    por fecha en 'dia' y 'mes' y de mayor a menor total en las demás.
+    """
+    if agrupar in ('dia', 'mes'):
+        filas = filas.filter(dimension='dia')
+        if agrupar == 'mes':
+            filas = filas.annotate(periodo=TruncMonth('fecha')).values('periodo')
+        else:
+            filas = filas.values(periodo=F('fecha'))
+        formato = '%m/%Y' if agrupar == 'mes' else '%d/%m/%Y'
+        return [
+            {'etiqueta': fila['periodo'].strftime(formato), 'ventas': fila['ventas'], 'total': fila['total']}
+            for fila in filas.annotate(ventas=Sum('ventas'), total=Sum('total')).order_by('periodo')
+        ]
+
+    grupos = list(
+        filas.filter(dimension=agrupar).values('clave')
+        .annotate(ventas=Sum('ventas'), total=Sum('total')).order_by('-total', 'clave')
+    )
+    nombres = {}
+    if agrupar == 'empleado':
+        ids = [int(g['clave']) for g in grupos if g['clave']]
+        nombres = {str(e.id): str(e) for e in Empleado.objects.filter(id__in=ids).only('nombre', 'apellido')}
+    return [{
+        'etiqueta': nombres.get(g['clave'], g['clave']) or SIN_VALOR[agrupar],
+        'ventas': g['ventas'],
+        'total': g['total'],
+    } for g in grupos]
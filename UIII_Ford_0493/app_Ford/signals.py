@@ -0,0 +1,48 @@
+# app_Ford/signals.py
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+
+from . import inventario, resumenes, tablero
+from .cache_listas import invalidar_modelo
+from .models import Empleado, Vehiculo
+
+# ==========================================
+# SEÑALES: INVALIDACIÓN DE LA CACHÉ DE LISTAS
+# ==========================================
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidar_listas(sender, **kwargs):
+    if sender._meta.app_label == 'app_Ford':
+        invalidar_modelo(sender.__name__)
+        if sender.__name__ in tablero.MODELOS:
+            tablero.invalidar()
+
+
+# ==========================================
+# SEÑALES: RESUMEN DIARIO DE VENTAS
+# ==========================================
+# Borrar un empleado o un vehículo cambia sus ventas (SET_NULL / CASCADE)
+# sin pasar por las vistas de venta. pre_delete corre dentro de la misma
+# transacción que el borrado.
+
+@receiver(pre_delete, sender=Empleado)
+def resumen_sin_empleado(sender, instance, **kwargs):
+    resumenes.reasignar_empleado(instance.id)
+
+
+@receiver(pre_delete, sender=Vehiculo)
+def resumen_sin_vehiculo(sender, instance, **kwargs):
+    resumenes.quitar_vehiculo(instance.id)
+
+
+# ==========================================
+# SEÑALES: BITÁCORA DE INVENTARIO
+# ==========================================
+# Un vehículo nuevo (formulario o admin) entra con su stock inicial. Los
+# cambios posteriores de stock pasan por inventario.py.
+
+@receiver(post_save, sender=Vehiculo)
+def entrada_de_vehiculo_nuevo(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        inventario.registrar_entrada(instance.id, instance.cantidad_disponible, 'Alta del vehículo')
@@ -0,0 +1,123 @@
+# app_Ford/tablero.py
+import threading
+import time
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.db.models import Count, Q, Sum
+
+from .models import Empleado, ServicioMantenimiento, Vehiculo, VentaDiaria
+
+# ==========================================
+# INDICADORES DEL TABLERO DE INICIO
+# ==========================================
+# La página de inicio es la más visitada; sus indicadores (ventas de hoy y
+# del mes, ingresos, vehículos con poco stock, servicios de la semana y
+# mejores vendedores) se calculan fuera de la petición y se guardan en la
+# caché de Django:
+#
+#   - 'ford:tablero' guarda los indicadores sin caducidad.
+#   - 'ford:tablero:fresco' dura FORD_TABLERO_SEGUNDOS y marca que siguen
+#     vigentes. Cualquier escritura que los afecta lo borra al hacer COMMIT
+#     (invalidar()).
+#
+# Si los indicadores ya no están frescos la petición responde con los que
+# hay y un hilo los recalcula en segundo plano (uno a la vez, aunque lleguen
+# muchas peticiones). Sólo la primera petición después de arrancar (caché
+# vacía) los calcula en línea.
+#
+# Las ventas salen del resumen diario (resumenes.py), no de la tabla de
+# ventas.
+
+CLAVE = 'ford:tablero'
+CLAVE_FRESCO = 'ford:tablero:fresco'
+CLAVE_CALCULANDO = 'ford:tablero:calculando'
+DURACION = getattr(settings, 'FORD_TABLERO_SEGUNDOS', 30)
+STOCK_BAJO = getattr(settings, 'FORD_TABLERO_STOCK_BAJO', 2)
+# Modelos cuyas escrituras cambian algún indicador (ver signals.py).
+MODELOS = {'Venta', 'VentaDiaria', 'Vehiculo', 'ServicioMantenimiento', 'Empleado'}
+
+
+def calcular_kpis(hoy=None):
+    hoy = hoy or date.today()
+    inicio_mes = hoy.replace(day=1)
+    inicio_semana = hoy - timedelta(days=hoy.weekday())
+    fin_semana = inicio_semana + timedelta(days=7)
+    de_hoy = Q(fecha=hoy)
+    ventas = VentaDiaria.objects.filter(dimension='dia', fecha__gte=inicio_mes, fecha__lte=hoy).aggregate(
+        ventas_mes=Sum('ventas'), total_mes=Sum('total'),
+        ventas_hoy=Sum('ventas', filter=de_hoy), total_hoy=Sum('total', filter=de_hoy),
+    )
+
+    vendedores = list(
+        VentaDiaria.objects.filter(dimension='empleado', fecha__gte=inicio_mes, fecha__lte=hoy)
+        .exclude(clave='').values('clave')
+        .annotate(ventas=Sum('ventas'), total=Sum('total')).order_by('-total')[:5]
+    )
+    nombres = {
+        str(e.id): str(e)
+        for e in Empleado.objects.filter(id__in=[int(v['clave']) for v in vendedores]).only('nombre', 'apellido')
+    }
+    for vendedor in vendedores:
+        vendedor['nombre'] = nombres.get(vendedor.pop('clave'), 'Empleado eliminado')
+
+    stock_bajo = Vehiculo.objects.filter(cantidad_disponible__lte=STOCK_BAJO)
+    servicios = ServicioMantenimiento.objects.filter(
+        fecha_servicio__gte=inicio_semana, fecha_servicio__lt=fin_semana
+    ).aggregate(semana=Count('id'), pendientes=Count('id', filter=Q(fecha_servicio__gte=hoy)))
+    return {
+        'hoy': {'ventas': ventas['ventas_hoy'] or 0, 'total': ventas['total_hoy'] or 0},
+        'mes': {'ventas': ventas['ventas_mes'] or 0, 'total': ventas['total_mes'] or 0},
+        'vendedores': vendedores,
+        'stock_bajo': stock_bajo.count(),
+        'stock_bajo_lista': list(
+            stock_bajo.order_by('cantidad_disponible', 'id')
+            .values('id', 'marca', 'modelo', 'anio', 'cantidad_disponible')[:5]
+        ),
+        'servicios_semana': servicios['semana'],
+        'servicios_pendientes': servicios['pendientes'],
+        'umbral_stock': STOCK_BAJO,
+    }
+
+
+def actualizar():
+    """Recalcula los indicadores y los guarda como frescos."""
+    datos = {'kpis': calcular_kpis(), 'calculado': time.time()}
+    cache.set(CLAVE, datos, None)
+    cache.set(CLAVE_FRESCO, True, DURACION)
+    return datos
+
+
+def _actualizar_en_hilo():
+    try:
+        actualizar()
+    finally:
+        cache.delete(CLAVE_CALCULANDO)
+        # Las conexiones de este hilo no las cierra nadie más.
+        connections.close_all()
+
+
+def obtener():
+    """
+    Los indicadores para la página de inicio: {'kpis', 'calculado'}. No
+    espera al recálculo salvo con la caché vacía.
+    """
+    datos = cache.get(CLAVE)
+    if datos is None:
+        return actualizar()
+    if cache.get(CLAVE_FRESCO) is None and cache.add(CLAVE_CALCULANDO, True, 60):
+        if getattr(settings, 'FORD_TABLERO_SEGUNDO_PLANO', True):
+            threading.Thread(target=_actualizar_en_hilo, daemon=True).start()
+        else:
+            try:
+                datos = actualizar()
+            finally:
+                cache.delete(CLAVE_CALCULANDO)
+    return datos
+
+
+def invalidar():
+    """Marca los indicadores como viejos cuando se confirme la transacción."""
+    transaction.on_commit(lambda: cache.delete(CLAVE_FRESCO))
@@ -1,3 +1,1853 @@
-from django.test import TestCase
+import csv
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache, caches
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from django.db import connection
+from django.http import HttpResponse, StreamingHttpResponse
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from . import acciones, archivo, cache_listas, condicional, enrutador, idempotencia, inventario, resumenes, tablero, urls_asgi
+from .cache_listas import estadisticas, reiniciar_estadisticas
+from .consultas_lentas import vigilar_consulta
+from .inventario import reservar_unidad
+from .instrumentacion import Medicion, forma_sql
+from .metricas import contar, foto_del_proceso, guardar_foto, exposicion
+from .management.commands.replicar_sqlite import copiar_base
+from .models import (
+    Vehiculo, Empleado, Venta, Cliente, Proveedor, ServicioMantenimiento, VentaDiaria,
+    MovimientoInventario, SaldoInventario, VentaArchivada, ServicioArchivado, ClaveIdempotencia,
+)
+
+
+def crear_vehiculo(numero_serie='SERIE-1', **extra):
+    datos = {
+        'marca': 'Ford',
+        'modelo': 'Lobo',
+        'anio': 2024,
+        'numero_serie': numero_serie,
+        'precio': 500000,
+        'cantidad_disponible': 5,
+    }
+    datos.update(extra)
+    return Vehiculo.objects.create(**datos)
+
+
+# Las pruebas usan su propia caché de archivos: la de settings es compartida
+# con el servidor de desarrollo (FORD_CACHE_DIR o BASE_DIR/cache) y
+# cache.clear() la vaciaría.
+DIRECTORIO_CACHE_PRUEBAS = tempfile.mkdtemp(prefix='ford-cache-pruebas-')
+CACHE_PRUEBAS = override_settings(CACHES={
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': DIRECTORIO_CACHE_PRUEBAS,
+    }
+})
+
+
+def tearDownModule():
+    shutil.rmtree(DIRECTORIO_CACHE_PRUEBAS, ignore_errors=True)
+
+
+@CACHE_PRUEBAS
+class FordTestCase(TestCase):
+    """
+    La caché de listas vive fuera de la base de datos: se limpia en cada
+    prueba para que no se filtren tablas renderizadas entre pruebas.
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+
+# ==========================================
+# PRUEBAS DE PAGINACIÓN POR CURSOR
+# ==========================================
+
+class PaginacionCursorTests(FordTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.vehiculo = crear_vehiculo()
+        hoy = date.today()
+        ventas = [
+            Venta(vehiculo=cls.vehiculo, cliente_nombre=f'Cliente {i}', total=100 + i)
+            for i in range(7)
+        ]
+        Venta.objects.bulk_create(ventas)
+        # fecha_venta es auto_now_add: se reparte en días distintos con update().
+        for i, venta in enumerate(Venta.objects.order_by('id')):
+            Venta.objects.filter(id=venta.id).update(fecha_venta=hoy - timedelta(days=i % 3))
+
+    def recorrer(self, url):
+        """Sigue los enlaces 'Siguiente' y regresa los ids vistos por página."""
+        paginas = []
+        while url:
+            respuesta = self.client.get(url)
+            self.assertEqual(respuesta.status_code, 200)
+            pagina = respuesta.context['pagina']
+            paginas.append([v.id for v in respuesta.context['ventas']])
+            url = pagina['url_siguiente'] and reverse('ver_ventas') + pagina['url_siguiente']
+        return paginas
+
+    def test_recorre_todas_las_ventas_sin_repetir(self):
+        paginas = self.recorrer(reverse('ver_ventas') + '?tamano=3')
+        self.assertEqual([len(p) for p in paginas], [3, 3, 1])
+        ids = [i for p in paginas for i in p]
+        esperados = list(
+            Venta.objects.order_by('-fecha_venta', '-id').values_list('id', flat=True)
+        )
+        self.assertEqual(ids, esperados)
+
+    def test_pagina_anterior_regresa_los_mismos_registros(self):
+        url = reverse('ver_ventas')
+        primera = self.client.get(url + '?tamano=3')
+        segunda = self.client.get(url + primera.context['pagina']['url_siguiente'])
+        regreso = self.client.get(url + segunda.context['pagina']['url_anterior'])
+        self.assertEqual(
+            [v.id for v in regreso.context['ventas']],
+            [v.id for v in primera.context['ventas']],
+        )
+        self.assertIsNone(regreso.context['pagina']['url_anterior'])
+
+    def test_no_usa_offset(self):
+        url = reverse('ver_ventas')
+        primera = self.client.get(url + '?tamano=3')
+        with CaptureQueriesContext(connection) as consultas:
+            self.client.get(url + primera.context['pagina']['url_siguiente'])
+        for consulta in consultas.captured_queries:
+            self.assertNotIn('OFFSET', consulta['sql'].upper())
+
+    def test_cursor_invalido_regresa_primera_pagina(self):
+        respuesta = self.client.get(reverse('ver_ventas') + '?despues=basura&tamano=3')
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(len(respuesta.context['ventas']), 3)
+        self.assertIsNone(respuesta.context['pagina']['url_anterior'])
+
+    def test_todas_las_listas_responden(self):
+        for nombre in ('ver_vehiculos', 'ver_empleados', 'ver_ventas',
+                       'ver_clientes', 'ver_proveedores', 'ver_servicios'):
+            respuesta = self.client.get(reverse(nombre))
+            self.assertEqual(respuesta.status_code, 200, nombre)
+
+
+# ==========================================
+# PRUEBAS DE FILTROS E ÍNDICES (EXPLAIN QUERY PLAN)
+# ==========================================
+
+def plan_de_consulta(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        return [fila[-1] for fila in cursor.fetchall()]
+
+
+class FiltrosIndicesTests(FordTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.empleado = Empleado.objects.create(nombre='Ana', apellido='Ruiz', puesto='Ventas')
+        cls.proveedor = Proveedor.objects.create(nombre_proveedor='Taller Norte')
+        cls.vehiculo = crear_vehiculo(marca='Ford', modelo='Ranger', anio=2022)
+        crear_vehiculo('SERIE-2', marca='Ford', modelo='Bronco', anio=2024)
+        Venta.objects.create(vehiculo=cls.vehiculo, empleado=cls.empleado,
+                             cliente_nombre='Luis', total=10, metodo_pago='Tarjeta')
+        Venta.objects.create(vehiculo=cls.vehiculo, cliente_nombre='Eva', total=20,
+                             metodo_pago='Efectivo')
+        ServicioMantenimiento.objects.create(vehiculo=cls.vehiculo, proveedor=cls.proveedor,
+                                             tipo_servicio='Afinación',
+                                             fecha_servicio=date.today(), costo_servicio=900)
+
+    def planes_de_la_vista(self, nombre, parametros, tabla):
+        """Ejecuta la vista y regresa el plan de cada SELECT sobre 'tabla'."""
+        with CaptureQueriesContext(connection) as consultas:
+            respuesta = self.client.get(reverse(nombre), parametros)
+        self.assertEqual(respuesta.status_code, 200)
+        planes = [
+            plan_de_consulta(c['sql']) for c in consultas.captured_queries
+            if c['sql'].startswith('SELECT') and f'FROM "{tabla}"' in c['sql']
+        ]
+        self.assertTrue(planes)
+        return respuesta, planes
+
+    def assertUsaIndice(self, planes, tabla, indice):
+        for plan in planes:
+            texto = ' | '.join(plan)
+            self.assertIn(f'SEARCH {tabla} USING INDEX {indice}', texto)
+            self.assertFalse([paso for paso in plan if paso.startswith(f'SCAN {tabla}')], texto)
+            # El índice también entrega las filas ya ordenadas: no hay ordenamiento aparte.
+            self.assertNotIn('TEMP B-TREE', texto)
+
+    def test_ventas_por_rango_de_fechas(self):
+        hoy = date.today().isoformat()
+        respuesta, planes = self.planes_de_la_vista(
+            'ver_ventas', {'desde': hoy, 'hasta': hoy}, 'app_Ford_venta')
+        self.assertEqual(len(respuesta.context['ventas']), 2)
+        self.assertUsaIndice(planes, 'app_Ford_venta', 'venta_fecha_idx')
+
+    def test_ventas_por_empleado(self):
+        respuesta, planes = self.planes_de_la_vista(
+            'ver_ventas', {'empleado': self.empleado.id}, 'app_Ford_venta')
+        self.assertEqual([v.cliente_nombre for v in respuesta.context['ventas']], ['Luis'])
+        self.assertUsaIndice(planes, 'app_Ford_venta', 'venta_empleado_fecha_idx')
+
+    def test_ventas_por_metodo_de_pago(self):
+        respuesta, planes = self.planes_de_la_vista(
+            'ver_ventas', {'metodo_pago': 'Efectivo'}, 'app_Ford_venta')
+        self.assertEqual([v.cliente_nombre for v in respuesta.context['ventas']], ['Eva'])
+        self.assertUsaIndice(planes, 'app_Ford_venta', 'venta_metodo_fecha_idx')
+
+    def test_vehiculos_por_marca_modelo_y_anio(self):
+        respuesta, planes = self.planes_de_la_vista(
+            'ver_vehiculos', {'marca': 'Ford', 'modelo': 'Ranger', 'anio': 2022},
+            'app_Ford_vehiculo')
+        self.assertEqual([v.id for v in respuesta.context['vehiculos']], [self.vehiculo.id])
+        self.assertUsaIndice(planes, 'app_Ford_vehiculo', 'vehiculo_marca_modelo_idx')
+
+    def test_vehiculos_por_modelo(self):
+        respuesta, planes = self.planes_de_la_vista(
+            'ver_vehiculos', {'modelo': 'Ranger'}, 'app_Ford_vehiculo')
+        self.assertEqual([v.id for v in respuesta.context['vehiculos']], [self.vehiculo.id])
+        self.assertUsaIndice(planes, 'app_Ford_vehiculo', 'vehiculo_modelo_idx')
+
+    def test_vehiculos_por_rango_de_anio(self):
+        respuesta, planes = self.planes_de_la_vista(
+            'ver_vehiculos', {'anio_desde': 2023, 'orden': 'anio'}, 'app_Ford_vehiculo')
+        self.assertEqual([v.modelo for v in respuesta.context['vehiculos']], ['Bronco'])
+        self.assertUsaIndice(planes, 'app_Ford_vehiculo', 'vehiculo_anio_idx')
+
+    def test_servicios_por_vehiculo(self):
+        respuesta, planes = self.planes_de_la_vista(
+            'ver_servicios', {'vehiculo': self.vehiculo.id}, 'app_Ford_serviciomantenimiento')
+        self.assertEqual(len(respuesta.context['servicios']), 1)
+        self.assertUsaIndice(planes, 'app_Ford_serviciomantenimiento', 'servicio_vehiculo_fecha_idx')
+
+    def test_servicios_por_proveedor(self):
+        respuesta, planes = self.planes_de_la_vista(
+            'ver_servicios', {'proveedor': self.proveedor.id}, 'app_Ford_serviciomantenimiento')
+        self.assertEqual(len(respuesta.context['servicios']), 1)
+        self.assertUsaIndice(planes, 'app_Ford_serviciomantenimiento', 'servicio_proveedor_fecha_idx')
+
+    def test_servicios_por_fecha(self):
+        respuesta, planes = self.planes_de_la_vista(
+            'ver_servicios', {'desde': date.today().isoformat()}, 'app_Ford_serviciomantenimiento')
+        self.assertEqual(len(respuesta.context['servicios']), 1)
+        self.assertUsaIndice(planes, 'app_Ford_serviciomantenimiento', 'servicio_fecha_idx')
+
+    def test_filtro_invalido_se_ignora(self):
+        respuesta = self.client.get(reverse('ver_ventas'), {'desde': 'ayer', 'empleado': 'x'})
+        self.assertEqual(len(respuesta.context['ventas']), 2)
+        self.assertEqual(respuesta.context['filtros'], {})
+
+
+# ==========================================
+# PRUEBAS DE STOCK ATÓMICO EN VENTAS
+# ==========================================
+
+def datos_venta(vehiculo, **extra):
+    datos = {'vehiculo': vehiculo.id, 'cliente_nombre': 'Cliente', 'total': '100'}
+    datos.update(extra)
+    return datos
+
+
+class StockVentasTests(FordTestCase):
+
+    def test_venta_descuenta_una_unidad(self):
+        vehiculo = crear_vehiculo(cantidad_disponible=2)
+        respuesta = self.client.post(reverse('agregar_venta'), datos_venta(vehiculo))
+        self.assertRedirects(respuesta, reverse('ver_ventas'))
+        vehiculo.refresh_from_db()
+        self.assertEqual(vehiculo.cantidad_disponible, 1)
+
+    def test_sin_stock_no_crea_venta(self):
+        vehiculo = crear_vehiculo(cantidad_disponible=0)
+        respuesta = self.client.post(reverse('agregar_venta'), datos_venta(vehiculo))
+        self.assertContains(respuesta, 'No hay stock disponible')
+        self.assertFalse(Venta.objects.exists())
+
+    def test_cambiar_vehiculo_mueve_el_stock(self):
+        anterior = crear_vehiculo('A', cantidad_disponible=0)
+        nuevo = crear_vehiculo('B', cantidad_disponible=1)
+        venta = Venta.objects.create(vehiculo=anterior, cliente_nombre='X', total=1)
+        respuesta = self.client.post(reverse('actualizar_venta', args=[venta.id]), datos_venta(nuevo))
+        self.assertRedirects(respuesta, reverse('ver_ventas'))
+        anterior.refresh_from_db()
+        nuevo.refresh_from_db()
+        self.assertEqual((anterior.cantidad_disponible, nuevo.cantidad_disponible), (1, 0))
+
+    def test_cambiar_a_vehiculo_sin_stock_no_modifica_nada(self):
+        anterior = crear_vehiculo('A', cantidad_disponible=0)
+        nuevo = crear_vehiculo('B', cantidad_disponible=0)
+        venta = Venta.objects.create(vehiculo=anterior, cliente_nombre='X', total=1)
+        respuesta = self.client.post(reverse('actualizar_venta', args=[venta.id]), datos_venta(nuevo))
+        self.assertContains(respuesta, 'No hay stock disponible')
+        anterior.refresh_from_db()
+        self.assertEqual(anterior.cantidad_disponible, 0)
+        self.assertEqual(Venta.objects.get().vehiculo_id, anterior.id)
+
+    def test_borrar_venta_devuelve_la_unidad_una_sola_vez(self):
+        vehiculo = crear_vehiculo(cantidad_disponible=0)
+        venta = Venta.objects.create(vehiculo=vehiculo, cliente_nombre='X', total=1)
+        self.client.get(reverse('borrar_venta', args=[venta.id]))
+        self.client.get(reverse('borrar_venta', args=[venta.id]))
+        vehiculo.refresh_from_db()
+        self.assertEqual(vehiculo.cantidad_disponible, 1)
+
+
+class IdempotenciaTests(FordTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.vehiculo = crear_vehiculo(cantidad_disponible=3)
+
+    def stock(self):
+        self.vehiculo.refresh_from_db()
+        return self.vehiculo.cantidad_disponible
+
+    def test_el_formulario_repetido_no_crea_otra_venta(self):
+        clave = self.client.get(reverse('agregar_venta')).context['clave_idempotencia']
+        datos = datos_venta(self.vehiculo, clave_idempotencia=clave)
+        primera = self.client.post(reverse('agregar_venta'), datos)
+        with CaptureQueriesContext(connection) as consultas:
+            repetida = self.client.post(reverse('agregar_venta'), datos)
+        # Una sola consulta a las claves, en su índice único.
+        busqueda = [c['sql'] for c in consultas.captured_queries if 'claveidempotencia' in c['sql']]
+        self.assertEqual(len(busqueda), 1)
+        self.assertIn('(ruta=? AND clave=?)', ' '.join(plan_de_consulta(busqueda[0])))
+        self.assertRedirects(repetida, reverse('ver_ventas'))
+        self.assertFalse(primera.has_header('Idempotent-Replayed'))
+        self.assertEqual(repetida['Idempotent-Replayed'], 'true')
+        self.assertEqual((Venta.objects.count(), self.stock()), (1, 2))
+        # Otro formulario es otra venta.
+        self.client.post(reverse('agregar_venta'), datos_venta(self.vehiculo, clave_idempotencia='otra-clave'))
+        self.assertEqual(Venta.objects.count(), 2)
+
+    def test_encabezado_en_servicios(self):
+        datos = {'vehiculo': self.vehiculo.id, 'tipo_servicio': 'Afinación', 'fecha_servicio': '2025-05-01',
+                 'costo_servicio': '900'}
+        for _ in range(2):
+            respuesta = self.client.post(reverse('agregar_servicio'), datos, headers={'Idempotency-Key': 'tableta-7:42'})
+            self.assertRedirects(respuesta, reverse('ver_servicios'))
+        self.assertEqual(ServicioMantenimiento.objects.count(), 1)
+        # La misma clave en otra ruta no choca.
+        self.client.post(reverse('agregar_venta'), datos_venta(self.vehiculo), headers={'Idempotency-Key': 'tableta-7:42'})
+        self.assertEqual(Venta.objects.count(), 1)
+
+    def test_peticion_simultanea_con_la_misma_clave(self):
+        # La otra petición guardó la clave entre la búsqueda y el INSERT de
+        # esta: el índice único la detiene y se deshace todo lo suyo.
+        original = Venta.objects.create(vehiculo=self.vehiculo, cliente_nombre='Ana', total=1)
+        ClaveIdempotencia.objects.create(ruta='venta', clave='clave-doble', objeto_id=original.id)
+        with mock.patch.object(idempotencia, 'buscar', side_effect=[None, (original.id, None)]):
+            respuesta = self.client.post(reverse('agregar_venta'),
+                                         datos_venta(self.vehiculo, clave_idempotencia='clave-doble'))
+        self.assertEqual(respuesta['Idempotent-Replayed'], 'true')
+        self.assertEqual((Venta.objects.count(), self.stock()), (1, 3))
+        self.assertEqual(inventario.conciliar(), [])
+
+    def test_folio_repetido(self):
+        Vehiculo.objects.filter(id=self.vehiculo.id).update(cantidad_disponible=10)
+        self.client.post(reverse('agregar_venta'), datos_venta(self.vehiculo, folio='F-1'))
+        respuesta = self.client.post(reverse('agregar_venta'), datos_venta(self.vehiculo, folio='F-1'))
+        self.assertContains(respuesta, 'Ya existe una venta con el folio F-1')
+        self.assertEqual((Venta.objects.count(), self.stock()), (1, 9))
+        # Sin folio no hay restricción.
+        for _ in range(2):
+            self.client.post(reverse('agregar_venta'), datos_venta(self.vehiculo, folio=''))
+        self.assertEqual(Venta.objects.count(), 3)
+        otra = Venta.objects.filter(folio='').first()
+        respuesta = self.client.post(reverse('actualizar_venta', args=[otra.id]), datos_venta(self.vehiculo, folio='F-1'))
+        self.assertContains(respuesta, 'Ya existe una venta con el folio F-1')
+        datos = self.client.post(reverse('api_lote'), json.dumps({'ventas': [
+            {'vehiculo': self.vehiculo.id, 'cliente_nombre': 'Ana', 'total': '1', 'folio': folio}
+            for folio in ('F-1', 'F-2', 'F-2')
+        ]}), content_type='application/json').json()
+        self.assertEqual([r['ok'] for r in datos['ventas']], [False, True, False])
+
+    def test_lote_reenviado(self):
+        lote = json.dumps({'ventas': [{'vehiculo': self.vehiculo.id, 'cliente_nombre': 'Ana', 'total': '1'}] * 2})
+        respuestas = [
+            self.client.post(reverse('api_lote'), lote, content_type='application/json',
+                             headers={'Idempotency-Key': 'lote-tableta-3'})
+            for _ in range(2)
+        ]
+        self.assertEqual(respuestas[1].json(), respuestas[0].json())
+        self.assertEqual(respuestas[1]['Idempotent-Replayed'], 'true')
+        self.assertEqual((Venta.objects.count(), self.stock()), (2, 1))
+        # Un cuerpo inválido no guarda la clave.
+        self.client.post(reverse('api_lote'), '[]', content_type='application/json',
+                         headers={'Idempotency-Key': 'lote-invalido'})
+        self.assertFalse(ClaveIdempotencia.objects.filter(clave='lote-invalido').exists())
+
+    def test_folio_archivado_no_se_reutiliza(self):
+        vieja = Venta.objects.create(vehiculo=self.vehiculo, cliente_nombre='Ana', total=1, folio='F-9')
+        Venta.objects.filter(id=vieja.id).update(fecha_venta=date(2020, 1, 1))
+        archivo.archivar()
+        respuesta = self.client.post(reverse('agregar_venta'), datos_venta(self.vehiculo, folio='F-9'))
+        self.assertContains(respuesta, 'Ya existe una venta con el folio F-9')
+        self.assertEqual((Venta.objects.count(), self.stock()), (0, 3))
+        datos = self.client.post(reverse('api_lote'), json.dumps({'ventas': [
+            {'vehiculo': self.vehiculo.id, 'cliente_nombre': 'Ana', 'total': '1', 'folio': 'F-9'}
+        ]}), content_type='application/json').json()
+        self.assertEqual(datos['ventas'][0]['error'], 'ya existe una venta con el folio F-9')
+        venta = Venta.objects.create(vehiculo=self.vehiculo, cliente_nombre='Luis', total=1, folio='F-10')
+        respuesta = self.client.post(reverse('actualizar_venta', args=[venta.id]),
+                                     datos_venta(self.vehiculo, folio='F-9'))
+        self.assertContains(respuesta, 'Ya existe una venta con el folio F-9')
+        self.assertEqual(Venta.objects.get(id=venta.id).folio, 'F-10')
+
+    def test_purgar_claves_vencidas(self):
+        ClaveIdempotencia.objects.create(ruta='venta', clave='vieja-clave', objeto_id=1,
+                                         fecha=timezone.now() - timedelta(hours=idempotencia.HORAS + 1))
+        ClaveIdempotencia.objects.create(ruta='venta', clave='nueva-clave', objeto_id=2)
+        salida = StringIO()
+        call_command('purgar_idempotencia', stdout=salida)
+        self.assertIn('1 claves', salida.getvalue())
+        self.assertEqual(list(ClaveIdempotencia.objects.values_list('clave', flat=True)), ['nueva-clave'])
+
+
+@CACHE_PRUEBAS
+class StockConcurrenteTests(TransactionTestCase):
+    """
+    Varios hilos registran ventas del mismo vehículo al mismo tiempo.
+    El stock nunca debe quedar negativo y cada unidad descontada debe
+    corresponder exactamente a una venta creada.
+
+    Usa la base de pruebas en archivo (DATABASES['default']['TEST']) para
+    que los hilos compitan por los bloqueos reales de SQLite.
+    """
+
+    HILOS = 8
+    VENTAS_POR_HILO = 5
+    STOCK_INICIAL = 25
+
+    def vender(self, vehiculo, barrera, resultados):
+        barrera.wait()
+        try:
+            for _ in range(self.VENTAS_POR_HILO):
+                respuesta = self.client_class().post(reverse('agregar_venta'), datos_venta(vehiculo))
+                resultados.append(respuesta.status_code)
+        finally:
+            connection.close()
+
+    def test_ventas_simultaneas_no_sobrevenden(self):
+        vehiculo = crear_vehiculo(cantidad_disponible=self.STOCK_INICIAL)
+        barrera = threading.Barrier(self.HILOS)
+        resultados = []
+        hilos = [
+            threading.Thread(target=self.vender, args=(vehiculo, barrera, resultados))
+            for _ in range(self.HILOS)
+        ]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        vehiculo.refresh_from_db()
+        ventas = Venta.objects.filter(vehiculo=vehiculo).count()
+        self.assertEqual(len(resultados), self.HILOS * self.VENTAS_POR_HILO)
+        self.assertGreaterEqual(vehiculo.cantidad_disponible, 0)
+        # Ninguna actualización perdida: lo vendido es exactamente lo descontado.
+        self.assertEqual(ventas, self.STOCK_INICIAL - vehiculo.cantidad_disponible)
+        self.assertEqual(ventas, min(self.STOCK_INICIAL, self.HILOS * self.VENTAS_POR_HILO))
+        self.assertEqual(resultados.count(302), ventas)
+        # Un movimiento por venta: la bitácora cuadra con el stock.
+        self.assertEqual(vehiculo.movimientos.filter(tipo='venta').count(), ventas)
+        self.assertEqual(inventario.conciliar(), [])
+
+
+# ==========================================
+# PRUEBAS DE LA BITÁCORA DE INVENTARIO
+# ==========================================
+
+class BitacoraInventarioTests(FordTestCase):
+
+    def movimientos(self, vehiculo):
+        return list(vehiculo.movimientos.order_by('id').values_list('tipo', 'cantidad'))
+
+    def test_cada_cambio_de_stock_queda_registrado(self):
+        vehiculo = crear_vehiculo(cantidad_disponible=3)
+        otro = crear_vehiculo('B', cantidad_disponible=1)
+        self.client.post(reverse('agregar_venta'), datos_venta(vehiculo, folio='F-1'))
+        venta = Venta.objects.get()
+        self.client.post(reverse('actualizar_venta', args=[venta.id]), datos_venta(otro))
+        self.client.get(reverse('borrar_venta', args=[venta.id]))
+        self.assertEqual(self.movimientos(vehiculo), [('entrada', 3), ('venta', -1), ('devolucion', 1)])
+        self.assertEqual(self.movimientos(otro), [('entrada', 1), ('venta', -1), ('devolucion', 1)])
+        self.assertEqual(vehiculo.movimientos.get(tipo='venta').nota, 'Venta F-1')
+        self.assertEqual(inventario.conciliar(), [])
+
+    def test_editar_el_vehiculo_registra_un_ajuste(self):
+        vehiculo = crear_vehiculo(cantidad_disponible=3)
+        datos = {'marca': 'Ford', 'modelo': 'Lobo', 'anio': 2024, 'precio': 1, 'numero_serie': 'SERIE-1',
+                 'cantidad_disponible': 7}
+        self.client.post(reverse('actualizar_vehiculo', args=[vehiculo.id]), datos)
+        self.client.post(reverse('actualizar_vehiculo', args=[vehiculo.id]), datos)
+        vehiculo.refresh_from_db()
+        self.assertEqual(vehiculo.cantidad_disponible, 7)
+        self.assertEqual(self.movimientos(vehiculo), [('entrada', 3), ('ajuste', 4)])
+
+    def test_stock_a_una_fecha_desde_la_ultima_foto(self):
+        vehiculo = crear_vehiculo(cantidad_disponible=0)
+        inicio = timezone.now() - timedelta(days=10)
+        for dias, cantidad in [(0, 10), (1, -2), (2, -3), (5, 4), (8, -1)]:
+            MovimientoInventario.objects.create(
+                vehiculo=vehiculo, tipo='ajuste', cantidad=cantidad, fecha=inicio + timedelta(days=dias))
+        self.assertEqual(inventario.compactar(inicio + timedelta(days=3)), 1)
+        # Sin movimientos nuevos no hay foto nueva.
+        self.assertEqual(inventario.compactar(inicio + timedelta(days=4)), 0)
+        self.assertEqual(SaldoInventario.objects.get().saldo, 5)
+        esperados = {1: 8, 3: 5, 4: 5, 6: 9, 9: 8}
+        for dias, esperado in esperados.items():
+            self.assertEqual(inventario.stock_al(vehiculo.id, inicio + timedelta(days=dias, hours=1)), esperado)
+        with self.assertNumQueries(1):
+            self.assertEqual(inventario.stocks_al(inicio + timedelta(days=6)), {vehiculo.id: 9})
+
+    def test_conciliar_y_reparar(self):
+        vehiculo = crear_vehiculo(cantidad_disponible=2)
+        Vehiculo.objects.filter(id=vehiculo.id).update(cantidad_disponible=5)
+        salida = StringIO()
+        with self.assertRaises(CommandError):
+            call_command('compactar_inventario', '--verificar', stdout=salida)
+        self.assertIn('stock 5, según la bitácora 2', salida.getvalue())
+        call_command('compactar_inventario', '--reparar', stdout=StringIO())
+        self.assertEqual(self.movimientos(vehiculo), [('entrada', 2), ('ajuste', 3)])
+        call_command('compactar_inventario', '--verificar', stdout=StringIO())
+
+
+# ==========================================
+# PRUEBAS DEL COMANDO import_vehiculos
+# ==========================================
+
+class ImportVehiculosTests(FordTestCase):
+
+    def archivo(self, sufijo, contenido):
+        descriptor, ruta = tempfile.mkstemp(suffix=sufijo)
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as archivo:
+            archivo.write(contenido)
+        self.addCleanup(os.remove, ruta)
+        return ruta
+
+    def importar(self, ruta, *args):
+        salida, errores = StringIO(), StringIO()
+        call_command('import_vehiculos', ruta, *args, stdout=salida, stderr=errores)
+        return salida.getvalue(), errores.getvalue()
+
+    def test_csv_inserta_y_actualiza_por_numero_serie(self):
+        existente = crear_vehiculo('S-1', color='Rojo', precio=1, cantidad_disponible=1)
+        antes = existente.fecha_actualizacion
+        ruta = self.archivo('.csv', (
+            'marca,modelo,anio,color,numero_serie,precio,cantidad_disponible\n'
+            'Ford,Lobo,2024,Azul,S-1,750000.50,4\n'
+            'Ford,Ranger,2023,,S-2,600000,2\n'
+            'Ford,Bronco,2025,Negro,S-3,900000,\n'
+        ))
+        salida, _ = self.importar(ruta, '--lote', '2')
+        self.assertIn('filas/s', salida)
+        self.assertEqual(Vehiculo.objects.count(), 3)
+        existente.refresh_from_db()
+        # Sólo cambian precio y cantidad; el resto del vehículo existente se conserva.
+        self.assertEqual(existente.precio, Decimal('750000.50'))
+        self.assertEqual(existente.cantidad_disponible, 4)
+        self.assertEqual(existente.color, 'Rojo')
+        self.assertGreater(existente.fecha_actualizacion, antes)
+        self.assertEqual(Vehiculo.objects.get(numero_serie='S-3').cantidad_disponible, 1)
+
+    def test_jsonl_rechaza_filas_invalidas(self):
+        ruta = self.archivo('.jsonl', '\n'.join([
+            '{"marca": "Ford", "modelo": "Maverick", "anio": 2024, "numero_serie": "J-1", "precio": 500000}',
+            '{"marca": "Ford", "modelo": "Maverick", "anio": "dos mil", "numero_serie": "J-2", "precio": 1}',
+            '{"marca": "Ford", "numero_serie": "J-3"}',
+            'esto no es json',
+        ]))
+        salida, errores = self.importar(ruta)
+        self.assertEqual(list(Vehiculo.objects.values_list('numero_serie', flat=True)), ['J-1'])
+        self.assertIn('3 filas rechazadas', salida)
+        self.assertIn('Línea 2', errores)
+
+
+# ==========================================
+# PRUEBAS DE EXPORTACIÓN EN STREAMING
+# ==========================================
+
+class ExportacionTests(FordTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.empleado = Empleado.objects.create(nombre='Ana', apellido='Ruiz', puesto='Ventas')
+        cls.vehiculo = crear_vehiculo()
+        for i in range(3):
+            Venta.objects.create(vehiculo=cls.vehiculo, empleado=cls.empleado,
+                                 cliente_nombre=f'Cliente {i}', total=100)
+        Venta.objects.filter(cliente_nombre='Cliente 0').update(fecha_venta=date(2020, 1, 1))
+        ServicioMantenimiento.objects.create(vehiculo=cls.vehiculo, tipo_servicio='Afinación',
+                                             fecha_servicio=date(2024, 5, 1), costo_servicio=900)
+
+    def test_ventas_csv_en_streaming_con_filtro_de_fechas(self):
+        respuesta = self.client.get(reverse('exportar_ventas'), {'desde': '2021-01-01'})
+        self.assertTrue(respuesta.streaming)
+        self.assertEqual(respuesta['Content-Type'], 'text/csv; charset=utf-8')
+        filas = list(csv.reader(b''.join(respuesta.streaming_content).decode().splitlines()))
+        self.assertEqual(filas[0][:3], ['id', 'folio', 'fecha_venta'])
+        self.assertEqual(sorted(f[8] for f in filas[1:]), ['Cliente 1', 'Cliente 2'])
+        self.assertEqual(filas[1][7], 'Ana Ruiz')
+
+    def test_servicios_jsonl(self):
+        respuesta = self.client.get(reverse('exportar_servicios'), {'formato': 'jsonl'})
+        lineas = b''.join(respuesta.streaming_content).decode().splitlines()
+        self.assertEqual(len(lineas), 1)
+        registro = json.loads(lineas[0])
+        self.assertEqual(registro['tipo_servicio'], 'Afinación')
+        self.assertEqual(registro['costo_servicio'], '900.00')
+        self.assertIsNone(registro['proveedor'])
+
+    def test_una_sola_consulta_con_joins(self):
+        respuesta = self.client.get(reverse('exportar_ventas'))
+        with self.assertNumQueries(1):
+            b''.join(respuesta.streaming_content)
+
+
+# ==========================================
+# PRUEBAS DEL ARCHIVO DE VENTAS Y SERVICIOS
+# ==========================================
+
+class ArchivoHistorialTests(FordTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.vehiculo = crear_vehiculo()
+        self.empleado = Empleado.objects.create(nombre='Ana', apellido='Ruiz', puesto='Ventas')
+        reciente = date.today() - timedelta(days=3)
+        for nombre, fecha in (('Vieja 1', date(2020, 1, 1)), ('Vieja 2', date(2021, 6, 1)), ('Nueva', reciente)):
+            venta = Venta.objects.create(vehiculo=self.vehiculo, empleado=self.empleado,
+                                         cliente_nombre=nombre, total=100, folio=nombre)
+            Venta.objects.filter(id=venta.id).update(fecha_venta=fecha)
+        for fecha in (date(2020, 3, 1), reciente):
+            ServicioMantenimiento.objects.create(vehiculo=self.vehiculo, tipo_servicio='Afinación',
+                                                 fecha_servicio=fecha, costo_servicio=900)
+        resumenes.reconstruir()
+
+    def nombres(self, respuesta):
+        return [v.cliente_nombre for v in respuesta.context['ventas']]
+
+    def test_archivar_por_lotes_sin_tocar_stock_ni_resumen(self):
+        ids = sorted(Venta.objects.filter(fecha_venta__year__lt=2022).values_list('id', flat=True))
+        salida = StringIO()
+        call_command('archivar_historial', '--lote', '1', stdout=salida)
+
+        self.assertIn('Venta: 2 archivadas', salida.getvalue())
+        self.assertEqual(list(Venta.objects.values_list('cliente_nombre', flat=True)), ['Nueva'])
+        self.assertEqual(sorted(VentaArchivada.objects.values_list('id', flat=True)), ids)
+        self.assertEqual(VentaArchivada.objects.get(id=ids[0]).fecha_venta, date(2020, 1, 1))
+        self.assertEqual((ServicioMantenimiento.objects.count(), ServicioArchivado.objects.count()), (1, 1))
+        self.vehiculo.refresh_from_db()
+        self.assertEqual(self.vehiculo.cantidad_disponible, 5)
+        self.assertEqual(resumenes.calcular(), resumenes.guardado())
+        call_command('reconstruir_resumenes', '--verificar', stdout=StringIO())
+
+    def test_listas_leen_el_archivo_solo_con_filtro_de_fechas(self):
+        archivo.archivar()
+        url = reverse('ver_ventas')
+        self.assertEqual(self.nombres(self.client.get(url)), ['Nueva'])
+        reciente = (date.today() - timedelta(days=30)).isoformat()
+        with self.assertNumQueries(2):
+            self.assertEqual(self.nombres(self.client.get(url, {'desde': reciente})), ['Nueva'])
+
+        # Página por página, las dos tablas salen intercaladas en orden.
+        respuesta = self.client.get(url, {'desde': '2019-01-01', 'orden': 'antiguas', 'tamano': 1})
+        vistas = self.nombres(respuesta)
+        while respuesta.context['pagina']['url_siguiente']:
+            respuesta = self.client.get(url + respuesta.context['pagina']['url_siguiente'])
+            vistas += self.nombres(respuesta)
+        self.assertEqual(vistas, ['Vieja 1', 'Vieja 2', 'Nueva'])
+
+        respuesta = self.client.get(url, {'hasta': '2020-12-31'})
+        self.assertEqual(self.nombres(respuesta), ['Vieja 1'])
+        self.assertContains(respuesta, 'Archivado')
+        self.assertNotContains(respuesta, reverse('borrar_venta', args=[respuesta.context['ventas'][0].id]))
+
+    def test_exportaciones_intercalan_el_archivo(self):
+        archivo.archivar()
+        respuesta = self.client.get(reverse('exportar_ventas'), {'desde': '2019-01-01'})
+        filas = list(csv.reader(b''.join(respuesta.streaming_content).decode().splitlines()))
+        self.assertEqual([f[8] for f in filas[1:]], ['Vieja 1', 'Vieja 2', 'Nueva'])
+        respuesta = self.client.get(reverse('exportar_servicios'), {'formato': 'jsonl'})
+        self.assertEqual(len(b''.join(respuesta.streaming_content).decode().splitlines()), 1)
+
+    @override_settings(ROOT_URLCONF='backend_Ford.urls_asgi')
+    async def test_vistas_async_con_archivo(self):
+        await sync_to_async(archivo.archivar)()
+        respuesta = await self.async_client.get(reverse('ver_ventas'), {'desde': '2019-01-01'})
+        self.assertEqual(self.nombres(respuesta), ['Nueva', 'Vieja 2', 'Vieja 1'])
+        respuesta = await self.async_client.get(reverse('exportar_servicios'), {'hasta': '2030-01-01'})
+        contenido = b''.join([trozo async for trozo in respuesta.streaming_content]).decode()
+        self.assertEqual(len(contenido.splitlines()), 3)
+
+    def test_devuelve_lo_archivado_si_el_limite_crece(self):
+        archivo.archivar()
+        with mock.patch.object(archivo, 'DIAS', 365 * 100):
+            resultado = archivo.archivar()
+        self.assertEqual(resultado['Venta'], (0, 2))
+        self.assertFalse(VentaArchivada.objects.exists())
+        self.assertEqual(Venta.objects.get(cliente_nombre='Vieja 1').fecha_venta, date(2020, 1, 1))
+
+    def test_borrar_vehiculo_quita_sus_ventas_archivadas(self):
+        archivo.archivar()
+        self.vehiculo.delete()
+        self.assertFalse(VentaArchivada.objects.exists())
+        self.assertFalse(ServicioArchivado.objects.exists())
+        self.assertFalse(VentaDiaria.objects.exists())
+
+
+# ==========================================
+# PRUEBAS DE ACCIONES MASIVAS
+# ==========================================
+
+class AccionesMasivasTests(FordTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.vehiculos = [crear_vehiculo(f'S-{n}', precio=1000, cantidad_disponible=n) for n in range(4)]
+        self.ana = Empleado.objects.create(nombre='Ana', apellido='Ruiz', puesto='Ventas')
+        self.luis = Empleado.objects.create(nombre='Luis', apellido='Mata', puesto='Ventas')
+
+    def vender(self, vehiculo, **extra):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('agregar_venta'), datos_venta(vehiculo, empleado=self.ana.id, **extra))
+        return Venta.objects.latest('id')
+
+    def stock(self, vehiculo):
+        vehiculo.refresh_from_db()
+        return vehiculo.cantidad_disponible
+
+    def test_precio_en_un_solo_update(self):
+        ids = [v.id for v in self.vehiculos[:3]]
+        # El UPDATE entre SAVEPOINT y RELEASE (la transacción de la prueba).
+        with self.assertNumQueries(3):
+            cambiados = acciones.cambiar_precios(Vehiculo.objects.filter(id__in=ids), Decimal('12.5'))
+        self.assertEqual(cambiados, 3)
+        respuesta = self.client.post(reverse('acciones_vehiculos'),
+                                     {'accion': 'precio', 'valor': '-10', 'ids': [ids[0], 'x']})
+        self.assertRedirects(respuesta, reverse('ver_vehiculos'))
+        precios = [Vehiculo.objects.get(id=v.id).precio for v in self.vehiculos]
+        self.assertEqual(precios, [Decimal('1012.50'), Decimal('1125.00'), Decimal('1125.00'), Decimal('1000.00')])
+
+    def test_valor_invalido_no_cambia_nada(self):
+        for valor in ('abc', '-100', 'NaN'):
+            respuesta = self.client.post(reverse('acciones_vehiculos'), {'accion': 'precio', 'valor': valor,
+                                                                         'todos': '1'}, follow=True)
+            self.assertContains(respuesta, 'no se cambió nada')
+        self.assertEqual(Vehiculo.objects.filter(precio=1000).count(), 4)
+
+    def test_stock_con_filtros_pasa_por_la_bitacora(self):
+        crear_vehiculo('OTRA', marca='Otra', cantidad_disponible=9)
+        # Con 'todos' se toman los filtros de la lista; restar 2 no deja
+        # stock negativo: los que tienen menos se quedan igual.
+        respuesta = self.client.post(reverse('acciones_vehiculos') + '?marca=Ford',
+                                     {'accion': 'stock', 'valor': '-2', 'todos': '1'}, follow=True)
+        self.assertRedirects(respuesta, reverse('ver_vehiculos') + '?marca=Ford')
+        self.assertContains(respuesta, '2 vehículos actualizados')
+        self.assertEqual([self.stock(v) for v in self.vehiculos], [0, 1, 0, 1])
+        self.assertEqual(Vehiculo.objects.get(marca='Otra').cantidad_disponible, 9)
+        self.assertEqual(MovimientoInventario.objects.filter(tipo='ajuste').count(), 2)
+        self.assertEqual(inventario.conciliar(), [])
+
+    def test_reasignar_ventas_mantiene_el_resumen(self):
+        ventas = [self.vender(v) for v in self.vehiculos[1:]]
+        self.client.post(reverse('acciones_ventas'),
+                         {'accion': 'empleado', 'empleado': self.luis.id, 'ids': [ventas[0].id, ventas[1].id]})
+        self.assertEqual(list(Venta.objects.order_by('id').values_list('empleado', flat=True)),
+                         [self.luis.id, self.luis.id, self.ana.id])
+        self.assertEqual(resumenes.calcular(), resumenes.guardado())
+        respuesta = self.client.post(reverse('acciones_ventas'), {'accion': 'empleado', 'empleado': 'x',
+                                                                  'todos': '1'}, follow=True)
+        self.assertContains(respuesta, 'Elige el empleado')
+
+    def test_borrar_ventas_regresa_el_stock(self):
+        ventas = [self.vender(v, folio=f'F-{n}') for n, v in enumerate([self.vehiculos[2]] * 2 + [self.vehiculos[3]])]
+        self.assertEqual((self.stock(self.vehiculos[2]), self.stock(self.vehiculos[3])), (0, 2))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('acciones_ventas'), {'accion': 'borrar', 'todos': '1'})
+        self.assertFalse(Venta.objects.exists())
+        self.assertEqual((self.stock(self.vehiculos[2]), self.stock(self.vehiculos[3])), (2, 3))
+        self.assertEqual(inventario.conciliar(), [])
+        self.assertEqual(resumenes.calcular(), resumenes.guardado())
+        # Una segunda vez ya no encuentra nada que devolver.
+        self.assertEqual(acciones.borrar_ventas(Venta.objects.filter(id__in=[v.id for v in ventas])), 0)
+
+    def test_borrar_proveedores_deja_servicios_sin_proveedor(self):
+        taller, otro = (Proveedor.objects.create(nombre_proveedor=n) for n in ('Taller', 'Otro'))
+        servicio = ServicioMantenimiento.objects.create(vehiculo=self.vehiculos[0], proveedor=taller,
+                                                        tipo_servicio='Afinación', fecha_servicio=date.today(),
+                                                        costo_servicio=900)
+        respuesta = self.client.post(reverse('acciones_proveedores'), {'accion': 'borrar', 'ids': [taller.id]})
+        self.assertRedirects(respuesta, reverse('ver_proveedores'))
+        self.assertEqual(list(Proveedor.objects.all()), [otro])
+        servicio.refresh_from_db()
+        self.assertIsNone(servicio.proveedor_id)
+        self.assertEqual(self.client.get(reverse('acciones_proveedores')).status_code, 405)
+
+    def test_borrar_sin_nada_marcado(self):
+        Proveedor.objects.create(nombre_proveedor='Taller')
+        for ids in ([], ['x']):
+            respuesta = self.client.post(reverse('acciones_proveedores'), {'accion': 'borrar', 'ids': ids}, follow=True)
+            self.assertContains(respuesta, '0 proveedores borrados')
+            respuesta = self.client.post(reverse('acciones_ventas'), {'accion': 'borrar', 'ids': ids}, follow=True)
+            self.assertContains(respuesta, '0 ventas borradas')
+        self.assertEqual(Proveedor.objects.count(), 1)
+
+
+# ==========================================
+# PRUEBAS DE AUTOCOMPLETADO
+# ==========================================
+
+class AutocompletarTests(FordTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(15):
+            crear_vehiculo(f'1FTFW{i:03d}', modelo='Lobo' if i % 2 else 'Ranger')
+        Cliente.objects.create(nombre='María', apellido='López')
+        Cliente.objects.create(nombre='Mario', apellido='Mata')
+        Cliente.objects.create(nombre='Luis', apellido='Martínez')
+        Proveedor.objects.create(nombre_proveedor='Taller Norte')
+
+    def buscar(self, nombre, **parametros):
+        respuesta = self.client.get(reverse(nombre), parametros)
+        self.assertEqual(respuesta.status_code, 200)
+        return respuesta.json()['resultados']
+
+    def test_prefijo_sin_distinguir_mayusculas(self):
+        resultados = self.buscar('autocompletar_clientes', q='MAR')
+        textos = [r['texto'] for r in resultados]
+        # Primero las coincidencias por nombre y luego por apellido, sin repetir.
+        self.assertCountEqual(textos[:2], ['María López', 'Mario Mata'])
+        self.assertEqual(textos[2:], ['Luis Martínez'])
+
+    def test_limite_de_resultados(self):
+        self.assertEqual(len(self.buscar('autocompletar_vehiculos', q='1ftfw')), 10)
+        self.assertEqual(len(self.buscar('autocompletar_vehiculos', q='1ftfw', limite=3)), 3)
+        self.assertEqual(len(self.buscar('autocompletar_vehiculos', q='rang')), 8)
+
+    def test_consulta_vacia(self):
+        self.assertEqual(self.buscar('autocompletar_proveedores', q='  '), [])
+        self.assertEqual(self.buscar('autocompletar_proveedores', q='taller')[0]['texto'], 'Taller Norte')
+
+    def test_busqueda_usa_indice(self):
+        with CaptureQueriesContext(connection) as consultas:
+            self.buscar('autocompletar_vehiculos', q='lob')
+        for consulta in consultas.captured_queries:
+            plan = ' | '.join(plan_de_consulta(consulta['sql']))
+            self.assertIn('USING INDEX vehiculo_', plan)
+            self.assertNotIn('SCAN app_Ford_vehiculo', plan)
+
+    def test_formularios_no_cargan_las_tablas(self):
+        vehiculo = Vehiculo.objects.first()
+        venta = Venta.objects.create(vehiculo=vehiculo, cliente_nombre='X', total=1)
+        for url in (reverse('agregar_venta'), reverse('agregar_servicio')):
+            with self.assertNumQueries(0):
+                respuesta = self.client.get(url)
+            self.assertNotContains(respuesta, '1FTFW')
+        with self.assertNumQueries(1):
+            respuesta = self.client.get(reverse('actualizar_venta', args=[venta.id]))
+        self.assertContains(respuesta, f'value="{vehiculo.id}"')
+
+
+# ==========================================
+# PRUEBAS DE LA CACHÉ DE LISTAS
+# ==========================================
+
+class CacheListasTests(FordTestCase):
+
+    def setUp(self):
+        super().setUp()
+        reiniciar_estadisticas()
+        self.vehiculo = crear_vehiculo()
+        self.proveedor = Proveedor.objects.create(nombre_proveedor='Taller Norte')
+
+    def test_segunda_visita_no_consulta_la_base(self):
+        url = reverse('ver_vehiculos')
+        self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            respuesta = self.client.get(url)
+        self.assertEqual(respuesta['X-Cache'], 'HIT')
+        self.assertContains(respuesta, 'SERIE-1')
+        # Otra página o filtro es otra entrada de la caché.
+        self.assertEqual(self.client.get(url, {'marca': 'Ford'})['X-Cache'], 'MISS')
+        self.assertEqual(estadisticas()['vehiculos'], {'aciertos': 1, 'fallos': 2, 'tasa': 1 / 3})
+
+    def test_guardar_invalida_solo_las_listas_afectadas(self):
+        self.client.get(reverse('ver_vehiculos'))
+        self.client.get(reverse('ver_proveedores'))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.vehiculo.precio = 123456
+            self.vehiculo.save()
+        respuesta = self.client.get(reverse('ver_vehiculos'))
+        self.assertEqual(respuesta['X-Cache'], 'MISS')
+        self.assertContains(respuesta, '123456')
+        self.assertEqual(self.client.get(reverse('ver_proveedores'))['X-Cache'], 'HIT')
+
+    def test_escritura_de_otro_proceso_invalida(self):
+        # Un comando de manage.py: otra conexión a la misma caché compartida.
+        url = reverse('ver_vehiculos')
+        self.client.get(url)
+        Vehiculo.objects.filter(id=self.vehiculo.id).update(precio=654321)
+        otro_proceso = caches.create_connection('default')
+        with mock.patch.object(cache_listas, 'cache', otro_proceso):
+            cache_listas.invalidar_lista('vehiculos')
+        respuesta = self.client.get(url)
+        self.assertEqual(respuesta['X-Cache'], 'MISS')
+        self.assertContains(respuesta, '654321')
+
+    def test_borrar_invalida(self):
+        self.client.get(reverse('ver_proveedores'))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.proveedor.delete()
+        respuesta = self.client.get(reverse('ver_proveedores'))
+        self.assertEqual(respuesta['X-Cache'], 'MISS')
+        self.assertNotContains(respuesta, 'Taller Norte')
+
+    def test_venta_invalida_el_stock_mostrado(self):
+        self.client.get(reverse('ver_vehiculos'))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('agregar_venta'), datos_venta(self.vehiculo))
+        self.assertEqual(self.client.get(reverse('ver_vehiculos'))['X-Cache'], 'MISS')
+
+    def test_estadisticas_en_json(self):
+        self.client.get(reverse('ver_proveedores'))
+        self.client.get(reverse('ver_proveedores'))
+        datos = self.client.get(reverse('estadisticas_cache')).json()
+        self.assertEqual(datos['proveedores']['tasa'], 0.5)
+
+
+# ==========================================
+# PRUEBAS DEL ENRUTADOR LECTURA / ESCRITURA
+# ==========================================
+
+@mock.patch('app_Ford.enrutador.hay_replica', return_value=True)
+class EnrutadorTests(FordTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.router = enrutador.EnrutadorLecturaEscritura()
+        self.request = RequestFactory().get('/')
+        self.request.session = {}
+
+    def _lee(self):
+        return self.router.db_for_read(Venta)
+
+    def test_vista_decorada_lee_de_la_replica(self, _):
+        vista = enrutador.lectura_en_replica(lambda request: HttpResponse(self._lee()))
+        self.assertEqual(vista(self.request).content, b'replica')
+        # Fuera de la vista decorada, y para modelos de Django, la primaria.
+        self.assertEqual(self._lee(), 'default')
+        with mock.patch('app_Ford.enrutador.alias_lectura', return_value='replica'):
+            self.assertEqual(self.router.db_for_read(Session), 'default')
+
+    def test_lecturas_tras_escribir_van_a_la_primaria(self, _):
+        def vista(request):
+            antes = self._lee()
+            self.assertEqual(self.router.db_for_write(Venta), 'default')
+            return HttpResponse(f'{antes},{self._lee()}')
+        vista = enrutador.lectura_en_replica(vista)
+        self.assertEqual(vista(self.request).content, b'replica,default')
+
+    def test_ventana_de_la_sesion_tras_una_escritura(self, _):
+        def escribe(request):
+            self.router.db_for_write(Venta)
+            return HttpResponse()
+        enrutador.PrimariaTrasEscrituraMiddleware(escribe)(self.request)
+        self.assertIn(enrutador.CLAVE_SESION, self.request.session)
+
+        vista = enrutador.lectura_en_replica(lambda request: HttpResponse(self._lee()))
+        self.assertEqual(vista(self.request).content, b'default')
+        self.request.session[enrutador.CLAVE_SESION] = 0
+        self.assertEqual(vista(self.request).content, b'replica')
+
+    def test_lecturas_no_abren_ventana(self, _):
+        def lee(request):
+            self._lee()
+            return HttpResponse()
+        enrutador.PrimariaTrasEscrituraMiddleware(lee)(self.request)
+        self.assertNotIn(enrutador.CLAVE_SESION, self.request.session)
+
+    def test_streaming_sigue_en_la_replica(self, _):
+        def vista(request):
+            return StreamingHttpResponse(self._lee() for _ in range(2))
+        respuesta = enrutador.lectura_en_replica(vista)(self.request)
+        self.assertEqual(b''.join(respuesta.streaming_content), b'replicareplica')
+
+    def test_sin_replica_todo_va_a_la_primaria(self, hay_replica):
+        hay_replica.return_value = False
+        vista = enrutador.lectura_en_replica(lambda request: HttpResponse(self._lee()))
+        self.assertEqual(vista(self.request).content, b'default')
+
+
+class ReplicarSqliteTests(FordTestCase):
+
+    def test_sin_replica_configurada(self):
+        with self.assertRaises(CommandError):
+            call_command('replicar_sqlite', stdout=StringIO())
+
+    def test_copiar_base(self):
+        with tempfile.TemporaryDirectory() as carpeta:
+            origen = os.path.join(carpeta, 'primaria.sqlite3')
+            destino = os.path.join(carpeta, 'replica.sqlite3')
+            with sqlite3.connect(origen) as conexion:
+                conexion.execute('CREATE TABLE t (x INTEGER)')
+                conexion.execute('INSERT INTO t VALUES (7)')
+            conexion.close()
+            copiar_base(origen, destino)
+            conexion = sqlite3.connect(destino)
+            self.assertEqual(conexion.execute('SELECT x FROM t').fetchall(), [(7,)])
+            conexion.close()
+
+
+# ==========================================
+# PRUEBAS DE LA API DE LOTES
+# ==========================================
+
+class ApiLoteTests(FordTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.vehiculo = crear_vehiculo(cantidad_disponible=2)
+        self.otro = crear_vehiculo('SERIE-2', cantidad_disponible=10)
+        self.proveedor = Proveedor.objects.create(nombre_proveedor='Taller Norte')
+
+    def enviar(self, datos):
+        return self.client.post(reverse('api_lote'), json.dumps(datos), content_type='application/json')
+
+    def venta(self, vehiculo, **extra):
+        return dict({'vehiculo': vehiculo.id, 'cliente_nombre': 'Ana', 'total': '1500.00'}, **extra)
+
+    def test_resultados_por_elemento(self):
+        respuesta = self.enviar({
+            'ventas': [
+                self.venta(self.vehiculo),
+                self.venta(self.vehiculo, total='abc'),
+                self.venta(self.vehiculo, empleado=999),
+                self.venta(self.otro, folio='F-1'),
+            ],
+            'servicios': [
+                {'vehiculo': self.otro.id, 'proveedor': self.proveedor.id, 'tipo_servicio': 'Afinación',
+                 'fecha_servicio': '2025-05-01', 'costo_servicio': '900'},
+                {'vehiculo': self.otro.id, 'tipo_servicio': 'Frenos', 'fecha_servicio': 'ayer',
+                 'costo_servicio': '100'},
+            ],
+        })
+        self.assertEqual(respuesta.status_code, 200)
+        datos = respuesta.json()
+        self.assertEqual([r['ok'] for r in datos['ventas']], [True, False, False, True])
+        self.assertIn('total', datos['ventas'][1]['error'])
+        self.assertIn('empleado', datos['ventas'][2]['error'])
+        self.assertEqual([r['ok'] for r in datos['servicios']], [True, False])
+        self.assertEqual(datos['resumen'], {'ventas_creadas': 2, 'servicios_creados': 1, 'errores': 3})
+        self.assertEqual(Venta.objects.get(id=datos['ventas'][3]['id']).folio, 'F-1')
+        self.assertEqual(ServicioMantenimiento.objects.get().proveedor, self.proveedor)
+
+    def test_stock_se_asigna_en_orden(self):
+        datos = self.enviar({'ventas': [self.venta(self.vehiculo) for _ in range(3)]}).json()
+        self.assertEqual([r['ok'] for r in datos['ventas']], [True, True, False])
+        self.assertEqual(datos['ventas'][2]['error'], 'no hay stock disponible')
+        self.vehiculo.refresh_from_db()
+        self.assertEqual(self.vehiculo.cantidad_disponible, 0)
+
+    def test_consultas_no_crecen_con_el_lote(self):
+        tercero = crear_vehiculo('SERIE-3', cantidad_disponible=100)
+
+        def consultas(n):
+            lote = {'ventas': [self.venta(self.otro if i % 2 else tercero) for i in range(n)]}
+            with CaptureQueriesContext(connection) as capturadas:
+                self.enviar(lote)
+            return len(capturadas)
+        # Vehículos, UPDATE por vehículo, INSERT masivo: igual para 2 que para 10 ventas.
+        self.assertEqual(consultas(2), consultas(10))
+
+    def test_cuerpo_invalido(self):
+        self.assertEqual(self.enviar({'ventas': {}}).status_code, 400)
+        self.assertEqual(
+            self.client.post(reverse('api_lote'), 'no json', content_type='application/json').status_code, 400
+        )
+        self.assertEqual(self.client.post(reverse('api_lote'), {'ventas': '[]'}).status_code, 415)
+        self.assertEqual(self.client.get(reverse('api_lote')).status_code, 405)
+
+
+# ==========================================
+# PRUEBAS DE LA INSTRUMENTACIÓN POR PETICIÓN
+# ==========================================
+
+@override_settings(FORD_INSTRUMENTACION=True)
+class InstrumentacionTests(FordTestCase):
+
+    def test_server_timing_y_log(self):
+        crear_vehiculo()
+        with self.assertLogs('app_Ford.instrumentacion', 'INFO') as logs:
+            respuesta = self.client.get(reverse('ver_vehiculos'))
+        cabecera = respuesta['Server-Timing']
+        self.assertRegex(cabecera, r'bd;dur=[\d.]+;desc="\d+ consultas"')
+        self.assertIn('plantillas;dur=', cabecera)
+        self.assertIn('total;dur=', cabecera)
+
+        registro = json.loads(logs.records[0].getMessage())
+        self.assertEqual(registro['vista'], 'ver_vehiculos')
+        self.assertEqual(registro['estado'], 200)
+        self.assertGreater(registro['consultas'], 0)
+        self.assertGreater(registro['plantillas_ms'], 0)
+        self.assertEqual(registro['repetidas'], [])
+
+    @override_settings(FORD_INSTRUMENTACION=False)
+    def test_desactivada(self):
+        self.assertNotIn('Server-Timing', self.client.get(reverse('inicio')))
+
+    def test_detecta_consultas_repetidas(self):
+        ids = [crear_vehiculo(f'SERIE-{i}').id for i in range(6)]
+        medicion = Medicion()
+        with connection.execute_wrapper(medicion):
+            for vehiculo_id in ids:
+                Vehiculo.objects.get(id=vehiculo_id)
+            list(Vehiculo.objects.filter(id__in=ids))
+        repetidas = medicion.repetidas(5)
+        self.assertEqual(list(repetidas.values()), [6])
+        self.assertEqual(medicion.consultas, 7)
+
+    def test_forma_sql(self):
+        self.assertEqual(
+            forma_sql('SELECT * FROM t\n WHERE id IN (%s, %s,%s) AND x = %s'),
+            'SELECT * FROM t WHERE id IN (...) AND x = %s',
+        )
+
+
+# ==========================================
+# PRUEBAS DEL REGISTRO DE CONSULTAS LENTAS
+# ==========================================
+
+class ConsultasLentasTests(FordTestCase):
+
+    def consultar_vigilado(self):
+        crear_vehiculo(marca='Lincoln')
+        with self.assertLogs('app_Ford.consultas_lentas', 'WARNING') as logs:
+            with connection.execute_wrapper(vigilar_consulta):
+                list(Vehiculo.objects.filter(marca='Lincoln'))
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT COUNT(*) FROM app_Ford_venta WHERE fecha_venta >= %s', ['2025-01-01'])
+        return [json.loads(registro.getMessage()) for registro in logs.records]
+
+    @override_settings(FORD_CONSULTA_LENTA_MS=0)
+    def test_registra_sql_parametros_y_plan(self):
+        orm, crudo = self.consultar_vigilado()
+        self.assertIn('"marca" = %s', orm['sql'])
+        self.assertEqual(orm['parametros'], ["'Lincoln'"])
+        self.assertTrue(any('SCAN' in linea or 'SEARCH' in linea for linea in orm['plan']))
+        # El SQL crudo también pasa por el vigilante, y usa el índice de fecha.
+        self.assertIn('app_Ford_venta', crudo['sql'])
+        self.assertTrue(any('venta_fecha_idx' in linea for linea in crudo['plan']))
+
+    @override_settings(FORD_CONSULTA_LENTA_MS=None)
+    def test_sin_umbral_no_registra(self):
+        with self.assertNoLogs('app_Ford.consultas_lentas'):
+            with connection.execute_wrapper(vigilar_consulta):
+                list(Vehiculo.objects.all())
+
+    @override_settings(FORD_CONSULTA_LENTA_MS=0)
+    def test_resumen(self):
+        registros = self.consultar_vigilado() * 3
+        with tempfile.TemporaryDirectory() as carpeta:
+            ruta = os.path.join(carpeta, 'lentas.log')
+            with open(ruta, 'w', encoding='utf-8') as archivo:
+                for registro in registros[:4]:
+                    archivo.write(json.dumps(registro) + '\n')
+                archivo.write('línea dañada\n')
+            with open(ruta + '.1', 'w', encoding='utf-8') as archivo:
+                for registro in registros[4:]:
+                    archivo.write(json.dumps(registro) + '\n')
+            salida = StringIO()
+            call_command('resumir_consultas_lentas', archivo=ruta, horas=1, orden='veces', stdout=salida)
+        texto = salida.getvalue()
+        self.assertIn('6 consultas lentas, 2 formas distintas', texto)
+        self.assertIn('veces=3', texto)
+        self.assertIn('plan:', texto)
+
+
+# ==========================================
+# PRUEBAS DE LAS MÉTRICAS (PROMETHEUS)
+# ==========================================
+
+def valor_contador(nombre, **etiquetas):
+    contadores, _ = foto_del_proceso()
+    return contadores.get((nombre, tuple(sorted(etiquetas.items()))), 0)
+
+
+class MetricasTests(FordTestCase):
+
+    def test_exposicion_por_nombre_de_url(self):
+        self.client.get(reverse('ver_ventas'))
+        texto = self.client.get(reverse('metricas')).content.decode()
+        self.assertIn('# TYPE ford_http_duracion_segundos histogram', texto)
+        self.assertRegex(texto, r'ford_http_peticiones_total\{estado="200",metodo="GET",vista="ver_ventas"\} \d+')
+        self.assertRegex(texto, r'ford_http_duracion_segundos_bucket\{vista="ver_ventas",le="\+Inf"\} \d+')
+        self.assertRegex(texto, r'ford_bd_consultas_por_peticion_count\{vista="ver_ventas"\} \d+')
+        self.assertRegex(texto, r'ford_bd_consulta_duracion_segundos_sum\{alias="default"\} ')
+        # El propio /metrics no se cuenta.
+        self.assertNotIn('vista="metricas"', texto)
+
+    def test_contadores_de_ventas(self):
+        vehiculo = crear_vehiculo(cantidad_disponible=1)
+        registradas = valor_contador('ford_ventas_registradas_total', origen='formulario')
+        sin_stock = valor_contador('ford_ventas_sin_stock_total', origen='formulario')
+        self.client.post(reverse('agregar_venta'), datos_venta(vehiculo))
+        self.client.post(reverse('agregar_venta'), datos_venta(vehiculo))
+        self.assertEqual(valor_contador('ford_ventas_registradas_total', origen='formulario'), registradas + 1)
+        self.assertEqual(valor_contador('ford_ventas_sin_stock_total', origen='formulario'), sin_stock + 1)
+
+    def test_suma_los_procesos_del_directorio(self):
+        with tempfile.TemporaryDirectory() as carpeta, self.settings(FORD_METRICAS_DIR=carpeta):
+            otro = {
+                'contadores': [['ford_ventas_registradas_total', [['origen', 'lote']], 5]],
+                'histogramas': [['ford_http_duracion_segundos', [['vista', 'inicio']],
+                                 [1] + [0] * 11, 0.001, 1]],
+            }
+            with open(os.path.join(carpeta, 'ford_1_1.json'), 'w') as archivo:
+                json.dump(otro, archivo)
+            guardar_foto()
+            self.assertEqual(len(os.listdir(carpeta)), 2)
+
+            propias = valor_contador('ford_ventas_registradas_total', origen='lote')
+            texto = exposicion()
+        self.assertIn(f'ford_ventas_registradas_total{{origen="lote"}} {propias + 5}', texto)
+        self.assertIn('ford_http_duracion_segundos_bucket{vista="inicio",le="0.005"} ', texto)
+
+    @unittest.skipUnless(hasattr(os, 'fork'), 'requiere os.fork')
+    def test_workers_creados_con_fork(self):
+        # Como uWSGI o gunicorn --preload: la app ya está cargada al crear
+        # los workers. Cada uno debe escribir su propio archivo.
+        with tempfile.TemporaryDirectory() as carpeta, self.settings(FORD_METRICAS_DIR=carpeta):
+            contar('ford_ventas_registradas_total', 100, origen='padre')
+            hijos = []
+            for _ in range(2):
+                pid = os.fork()
+                if pid == 0:
+                    codigo = 1
+                    try:
+                        contar('ford_ventas_registradas_total', 5, origen='worker')
+                        guardar_foto()
+                        codigo = 0
+                    finally:
+                        os._exit(codigo)
+                hijos.append(pid)
+            for pid in hijos:
+                self.assertEqual(os.waitstatus_to_exitcode(os.waitpid(pid, 0)[1]), 0)
+            self.assertEqual(len(os.listdir(carpeta)), 2)
+            texto = exposicion()
+        self.assertIn('ford_ventas_registradas_total{origen="worker"} 10', texto)
+        # Los hijos no repiten lo que el padre contó antes del fork.
+        self.assertIn(f'ford_ventas_registradas_total{{origen="padre"}} {valor_contador("ford_ventas_registradas_total", origen="padre")}', texto)
+
+
+# ==========================================
+# PRUEBAS DEL PERFILADO POR MUESTREO
+# ==========================================
+
+class PerfiladoTests(FordTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.carpeta = tempfile.TemporaryDirectory()
+        self.addCleanup(self.carpeta.cleanup)
+
+    def archivos(self, extension):
+        return sorted(n for n in os.listdir(self.carpeta.name) if n.endswith(extension))
+
+    def test_fraccion_y_anillo(self):
+        with self.settings(FORD_PERFILADO_FRACCION=1, FORD_PERFILADO_DIR=self.carpeta.name,
+                           FORD_PERFILADO_MAXIMO=2):
+            nombres = [self.client.get(reverse('ver_ventas'))['X-Ford-Perfil'] for _ in range(3)]
+        # Sólo quedan los dos más recientes.
+        self.assertEqual(self.archivos('.prof'), nombres[1:])
+        self.assertTrue(all(n.endswith('_ver_ventas.prof') for n in nombres))
+        self.assertLessEqual(len(self.archivos('.colapsado')), 2)
+
+    def test_cabecera_secreta(self):
+        with self.settings(FORD_PERFILADO_FRACCION=0, FORD_PERFILADO_SECRETO='s3creto',
+                           FORD_PERFILADO_DIR=self.carpeta.name):
+            self.assertNotIn('X-Ford-Perfil', self.client.get(reverse('inicio')))
+            self.assertNotIn('X-Ford-Perfil', self.client.get(reverse('inicio'), HTTP_X_FORD_PERFIL='otro'))
+            respuesta = self.client.get(reverse('inicio'), HTTP_X_FORD_PERFIL='s3creto')
+        self.assertEqual(self.archivos('.prof'), [respuesta['X-Ford-Perfil']])
+
+    def test_fusionar_por_vista(self):
+        crear_vehiculo()
+        with self.settings(FORD_PERFILADO_FRACCION=1, FORD_PERFILADO_DIR=self.carpeta.name,
+                           FORD_PERFILADO_PILAS_MS=0.5):
+            self.client.get(reverse('ver_ventas'))
+            self.client.get(reverse('ver_ventas'))
+            self.client.get(reverse('ver_vehiculos'))
+        salida = StringIO()
+        colapsado = os.path.join(self.carpeta.name, 'ventas.txt')
+        sumado = os.path.join(self.carpeta.name, 'ventas.prof.sumado')
+        call_command('fusionar_perfiles', dir=self.carpeta.name, vista='ver_ventas',
+                     salida=sumado, colapsado=colapsado, stdout=salida)
+        self.assertIn('== ver_ventas: 2 perfiles ==', salida.getvalue())
+        self.assertIn('views.py', salida.getvalue())
+        self.assertTrue(os.path.getsize(sumado) > 0)
+        with open(colapsado, encoding='utf-8') as archivo:
+            for linea in archivo:
+                self.assertRegex(linea, r'^\S+ \d+$')
+
+        salida = StringIO()
+        call_command('fusionar_perfiles', dir=self.carpeta.name, top=1, stdout=salida)
+        self.assertIn('== ver_vehiculos: 1 perfiles ==', salida.getvalue())
+
+
+# ==========================================
+# PRUEBAS DEL GENERADOR DE DATOS
+# ==========================================
+
+class SeedFordTests(FordTestCase):
+
+    def test_genera_filas_relacionadas(self):
+        call_command('seed_ford', scale=0.01, lote=7, stdout=StringIO())
+        self.assertEqual(Venta.objects.count(), 100)
+        self.assertEqual(Vehiculo.objects.count(), 10)
+        self.assertEqual(ServicioMantenimiento.objects.count(), 50)
+        # Fechas históricas, no la de hoy (auto_now_add desactivado).
+        self.assertLess(Venta.objects.earliest('fecha_venta').fecha_venta, date.today() - timedelta(days=30))
+        self.assertTrue(Venta._meta.get_field('fecha_venta').auto_now_add)
+
+        # Una segunda corrida continúa los números de serie.
+        call_command('seed_ford', scale=0.01, stdout=StringIO())
+        self.assertEqual(Vehiculo.objects.values('numero_serie').distinct().count(), 20)
+
+    def test_escala_invalida(self):
+        with self.assertRaises(CommandError):
+            call_command('seed_ford', scale=0, stdout=StringIO())
+
+
+# ==========================================
+# PRUEBAS DE LA BÚSQUEDA GLOBAL
+# ==========================================
+
+class BusquedaTests(FordTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.maria = Cliente.objects.create(nombre='María', apellido='López', telefono='5512345678')
+        Cliente.objects.create(nombre='Mario', apellido='Mata', correo_electronico='mario@correo.mx')
+        Cliente.objects.create(nombre='José', apellido='Lopera')
+        Proveedor.objects.create(nombre_proveedor='Taller Norte', producto='Llantas')
+        for i in range(5):
+            crear_vehiculo(f'1FTFW{i:03d}', modelo='Lobo')
+
+    def buscar(self, **parametros):
+        respuesta = self.client.get(reverse('buscar'), parametros)
+        self.assertEqual(respuesta.status_code, 200)
+        return respuesta.json()['resultados']
+
+    def textos(self, tipo, q):
+        return [r['texto'] for r in self.buscar(q=q, tipo=tipo)[tipo]]
+
+    def test_palabras_por_prefijo_sin_acentos(self):
+        self.assertEqual(self.textos('clientes', 'mar lop'), ['María López - 5512345678'])
+        self.assertEqual(self.textos('clientes', 'jose'), ['José Lopera'])
+        self.assertCountEqual(self.textos('clientes', 'LOP'), ['María López - 5512345678', 'José Lopera'])
+
+    def test_telefono_correo_y_serie(self):
+        self.assertEqual(self.textos('clientes', '55123'), ['María López - 5512345678'])
+        self.assertEqual(self.textos('clientes', 'mario@correo'), ['Mario Mata - mario@correo.mx'])
+        self.assertEqual(len(self.textos('vehiculos', '1ftfw0')), 5)
+        self.assertEqual(self.textos('proveedores', 'llan'), ['Taller Norte'])
+
+    def test_todos_los_tipos(self):
+        resultados = self.buscar(q='lobo')
+        self.assertEqual(set(resultados), {'clientes', 'proveedores', 'vehiculos'})
+        self.assertEqual(len(resultados['vehiculos']), 5)
+        self.assertEqual(resultados['clientes'], [])
+        primero = resultados['vehiculos'][0]
+        self.assertEqual(primero['url'], reverse('actualizar_vehiculo', args=[primero['id']]))
+
+    def test_limite_tipo_y_consultas_raras(self):
+        self.assertEqual(len(self.buscar(q='1ftfw', tipo='vehiculos', limite=2)['vehiculos']), 2)
+        self.assertEqual(self.client.get(reverse('buscar'), {'q': 'x', 'tipo': 'ventas'}).status_code, 400)
+        # La sintaxis de FTS5 no llega al motor.
+        self.assertEqual(self.buscar(q='"López*)')['clientes'][0]['id'], self.maria.id)
+        self.assertEqual(self.buscar(q='  ')['clientes'], [])
+
+    def test_indice_sigue_a_la_tabla(self):
+        # Triggers: también cubren update(), bulk_create y delete.
+        Cliente.objects.filter(id=self.maria.id).update(apellido='Ibarra')
+        self.assertEqual(self.textos('clientes', 'ibarra'), ['María Ibarra - 5512345678'])
+        self.assertNotIn('María López - 5512345678', self.textos('clientes', 'lopez'))
+        Cliente.objects.bulk_create([Cliente(nombre='Zoe', apellido='Quintana')])
+        self.assertEqual(self.textos('clientes', 'quin'), ['Zoe Quintana'])
+        Cliente.objects.filter(apellido='Quintana').delete()
+        self.assertEqual(self.textos('clientes', 'quin'), [])
+
+    def test_busqueda_usa_indice_de_texto(self):
+        with CaptureQueriesContext(connection) as consultas:
+            self.buscar(q='mar lop')
+        self.assertEqual(len(consultas), 3)
+        for consulta in consultas.captured_queries:
+            plan = ' | '.join(plan_de_consulta(consulta['sql']))
+            self.assertIn('VIRTUAL TABLE INDEX', plan)
+            self.assertNotIn('SCAN t', plan)
+
+
+# ==========================================
+# PRUEBAS DE RESPUESTAS CONDICIONALES (304)
+# ==========================================
+
+class RespuestaCondicionalTests(FordTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.vehiculo = crear_vehiculo(cantidad_disponible=5)
+        self.cliente = Cliente.objects.create(nombre='Ana', apellido='Ruiz')
+
+    def escribir(self, funcion, *args, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return funcion(*args, **kwargs)
+
+    def test_304_sin_consultas_ni_plantilla(self):
+        url = reverse('ver_ventas')
+        # La lista tiene el formulario de acciones: la primera respuesta pone
+        # la cookie CSRF, que entra en el ETag.
+        self.client.get(url)
+        primera = self.client.get(url)
+        self.assertEqual(primera.status_code, 200)
+        self.assertIn('no-cache', primera['Cache-Control'])
+        with self.assertNumQueries(0), mock.patch('app_Ford.views.render') as render:
+            respuesta = self.client.get(url, HTTP_IF_NONE_MATCH=primera['ETag'])
+        self.assertEqual(respuesta.status_code, 304)
+        render.assert_not_called()
+        # Otra página de la lista es otro recurso.
+        self.assertEqual(self.client.get(url + '?metodo_pago=Efectivo', HTTP_IF_NONE_MATCH=primera['ETag']).status_code, 200)
+
+    def test_escrituras_de_los_modelos_mostrados_cambian_el_etag(self):
+        url = reverse('ver_ventas')
+        self.client.get(url)
+        etag = self.client.get(url)['ETag']
+        # Un cliente no aparece en la lista de ventas.
+        self.escribir(Cliente.objects.create, nombre='Luis', apellido='Mata')
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.escribir(self.client.post, reverse('agregar_venta'), datos_venta(self.vehiculo))
+        respuesta = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertNotEqual(respuesta['ETag'], etag)
+
+    def test_formulario_de_edicion(self):
+        url = reverse('actualizar_cliente', args=[self.cliente.id])
+        # La primera respuesta pone la cookie CSRF, que entra en el ETag.
+        primera = self.client.get(url)['ETag']
+        etag = self.client.get(url, HTTP_IF_NONE_MATCH=primera)['ETag']
+        self.assertNotEqual(etag, primera)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        respuesta = self.escribir(self.client.post, url, {'nombre': 'Ana', 'apellido': 'Ríos'})
+        self.assertRedirects(respuesta, reverse('ver_clientes'))
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_if_modified_since(self):
+        url = reverse('ver_vehiculos')
+        # Sin Last-Modified mientras no termine el segundo de la última escritura.
+        self.assertFalse(self.client.get(url).has_header('Last-Modified'))
+        cache.set(cache_listas._clave_sello('Vehiculo'), time.time_ns() - 10 * 10 ** 9, None)
+        fecha = self.client.get(url)['Last-Modified']
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=fecha).status_code, 304)
+        self.escribir(reservar_unidad, self.vehiculo.id)
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=fecha).status_code, 200)
+
+    def test_con_replica_no_hay_validadores_justo_despues_de_escribir(self):
+        with mock.patch.object(condicional, 'hay_replica', return_value=True):
+            self.escribir(Proveedor.objects.create, nombre_proveedor='Taller')
+            self.assertFalse(self.client.get(reverse('ver_proveedores')).has_header('ETag'))
+            cache.set(cache_listas._clave_sello('Proveedor'), time.time_ns() - 60 * 10 ** 9, None)
+            self.assertTrue(self.client.get(reverse('ver_proveedores')).has_header('ETag'))
+
+    def test_mensajes_despues_de_una_accion_sin_cambios(self):
+        url = reverse('ver_proveedores')
+        self.client.get(url)
+        etag = self.client.get(url)['ETag']
+        # La acción no cambia nada (ningún sello cambia) y redirige a la lista.
+        redireccion = self.client.post(reverse('acciones_proveedores'), {'accion': 'otra'})
+        self.assertRedirects(redireccion, url, fetch_redirect_response=False)
+        respuesta = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertContains(respuesta, 'Acción inválida')
+        self.assertFalse(respuesta.has_header('ETag'))
+        # Ya mostrado, la lista vuelve a responder 304 y el mensaje no sale en otra página.
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertNotContains(self.client.get(reverse('ver_clientes')), 'Acción inválida')
+
+    def test_las_pruebas_no_usan_la_cache_de_settings(self):
+        self.assertEqual(caches['default']._dir, os.path.abspath(DIRECTORIO_CACHE_PRUEBAS))
+
+    def test_escrituras_de_otro_proceso(self):
+        # Otro worker o un comando de manage.py: otra conexión a la misma
+        # caché compartida, no la memoria de este proceso.
+        url = reverse('ver_proveedores')
+        etag = self.client.get(url)['ETag']
+        otro_proceso = caches.create_connection('default')
+        otro_proceso.set(cache_listas._clave_sello('Proveedor'), time.time_ns() + 10 ** 9, None)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_sin_cache_compartida_no_hay_validadores(self):
+        with mock.patch.object(cache_listas, 'COMPARTIDA', False):
+            primera = self.client.get(reverse('ver_proveedores'))
+            segunda = self.client.get(reverse('ver_proveedores'))
+        self.assertFalse(primera.has_header('ETag'))
+        self.assertFalse(primera.has_header('Last-Modified'))
+        self.assertEqual((primera['X-Cache'], segunda['X-Cache']), ('MISS', 'MISS'))
+
+    def test_fecha_actualizacion(self):
+        antes = self.vehiculo.fecha_actualizacion
+        self.escribir(reservar_unidad, self.vehiculo.id)
+        self.vehiculo.refresh_from_db()
+        self.assertGreater(self.vehiculo.fecha_actualizacion, antes)
+
+
+# ==========================================
+# PRESUPUESTOS DE CONSULTAS, TIEMPO Y TAMAÑO
+# ==========================================
+# Cada vista que se pide con GET tiene un número fijo de consultas que no
+# debe cambiar con la cantidad de filas: si alguien quita un select_related
+# (N+1) o agrega una consulta por fila, la prueba falla. También hay un tope
+# de tiempo y de tamaño de respuesta medido con la base grande.
+#
+# nombre de URL -> (consultas, milisegundos, kilobytes)
+# Las vistas nuevas deben agregarse aquí (test_todas_las_vistas_tienen_presupuesto).
+PRESUPUESTOS = {
+    'inicio': (0, 150, 20),
+    'autocompletar_vehiculos': (2, 100, 10),
+    'autocompletar_empleados': (2, 100, 10),
+    'autocompletar_clientes': (2, 100, 10),
+    'autocompletar_proveedores': (1, 100, 10),
+    'buscar': (3, 100, 20),
+    'metricas': (0, 150, 200),
+    'estadisticas_cache': (0, 50, 10),
+    'agregar_vehiculo': (0, 100, 20),
+    'ver_vehiculos': (1, 300, 250),
+    'actualizar_vehiculo': (1, 100, 20),
+    'agregar_empleado': (0, 100, 20),
+    'ver_empleados': (1, 300, 250),
+    'actualizar_empleado': (1, 100, 20),
+    'agregar_venta': (0, 100, 30),
+    'ver_ventas': (2, 400, 300),
+    'exportar_ventas': (1, 800, 400),
+    'actualizar_venta': (1, 100, 30),
+    'agregar_cliente': (0, 100, 20),
+    'ver_clientes': (1, 300, 250),
+    'actualizar_cliente': (1, 100, 20),
+    'agregar_proveedor': (0, 100, 20),
+    'ver_proveedores': (1, 300, 250),
+    'actualizar_proveedor': (1, 100, 20),
+    'agregar_servicio': (0, 100, 30),
+    'ver_servicios': (2, 400, 300),
+    'exportar_servicios': (1, 800, 400),
+    'actualizar_servicio': (1, 100, 30),
+    'reporte_ventas': (1, 150, 50),
+}
+# Sin presupuesto:
+# - Las acciones masivas y la API de lotes sólo aceptan POST.
+# - Las de borrado sí responden a GET (borran y redirigen), pero no tienen un
+#   número fijo de consultas. Borrar en cascada (un vehículo con sus ventas,
+#   servicios y movimientos) carga las filas relacionadas para las señales y
+#   las borra en grupos de 100, así que las consultas crecen con los datos.
+#   Además, medirlas borraría las filas que usan las demás rutas.
+# Sus escrituras tienen sus propias pruebas.
+SIN_PRESUPUESTO = {'api_lote', 'borrar_vehiculo', 'borrar_empleado', 'borrar_venta',
+                   'borrar_cliente', 'borrar_proveedor', 'borrar_servicio',
+                   'acciones_vehiculos', 'acciones_ventas', 'acciones_proveedores'}
+# Vistas que sólo leen datos precalculados: antes de medirlas se llena la
+# caché como lo haría el recálculo en segundo plano.
+PRECALCULADAS = {'inicio': tablero.actualizar}
+# Para máquinas de CI lentas: FORD_PRESUPUESTO_TIEMPO_FACTOR=3
+FACTOR_TIEMPO = float(os.environ.get('FORD_PRESUPUESTO_TIEMPO_FACTOR', 1))
+MODELO_DE_RUTA = {
+    'vehiculo': Vehiculo, 'empleado': Empleado, 'venta': Venta,
+    'cliente': Cliente, 'proveedor': Proveedor, 'servicio': ServicioMantenimiento,
+}
+
+
+def rutas_con_presupuesto():
+    """[(nombre, ruta)] con un id existente en las rutas de actualizar."""
+    rutas = []
+    for nombre in PRESUPUESTOS:
+        if nombre.startswith('actualizar_'):
+            modelo = MODELO_DE_RUTA[nombre.split('_', 1)[1]]
+            rutas.append((nombre, reverse(nombre, args=[modelo.objects.order_by('id').first().id])))
+        elif nombre.startswith('autocompletar_') or nombre == 'buscar':
+            rutas.append((nombre, reverse(nombre) + '?q=fo'))
+        else:
+            rutas.append((nombre, reverse(nombre)))
+    return rutas
+
+
+class PresupuestoVistasTests(FordTestCase):
+
+    def preparar(self, nombre):
+        # Sin caché, para medir siempre el camino completo.
+        cache.clear()
+        if nombre in PRECALCULADAS:
+            PRECALCULADAS[nombre]()
+
+    def pedir(self, ruta):
+        inicio = time.perf_counter()
+        respuesta = self.client.get(ruta)
+        cuerpo = b''.join(respuesta.streaming_content) if respuesta.streaming else respuesta.content
+        self.assertEqual(respuesta.status_code, 200)
+        return (time.perf_counter() - inicio) * 1000, len(cuerpo)
+
+    def revisar_consultas(self):
+        for nombre, ruta in rutas_con_presupuesto():
+            with self.subTest(vista=nombre):
+                self.preparar(nombre)
+                with self.assertNumQueries(PRESUPUESTOS[nombre][0]):
+                    self.pedir(ruta)
+
+    def test_todas_las_vistas_tienen_presupuesto(self):
+        from .urls import urlpatterns
+        nombres = {patron.name for patron in urlpatterns}
+        self.assertEqual(nombres - SIN_PRESUPUESTO, set(PRESUPUESTOS))
+
+    def test_consultas_no_crecen_con_los_datos(self):
+        # Pocas filas (menos de una página) y luego más de una página.
+        call_command('seed_ford', scale=0.0005, stdout=StringIO())
+        self.revisar_consultas()
+        call_command('seed_ford', scale=0.1, stdout=StringIO())
+        self.assertGreater(Venta.objects.count(), 1000)
+        self.revisar_consultas()
+
+    def test_tiempo_y_tamano(self):
+        call_command('seed_ford', scale=0.1, stdout=StringIO())
+        for nombre, ruta in rutas_con_presupuesto():
+            _, milisegundos, kilobytes = PRESUPUESTOS[nombre]
+            with self.subTest(vista=nombre):
+                self.preparar(nombre)
+                self.pedir(ruta)  # calienta plantillas
+                self.preparar(nombre)
+                transcurrido, tamano = self.pedir(ruta)
+                self.assertLessEqual(transcurrido, milisegundos * FACTOR_TIEMPO)
+                self.assertLessEqual(tamano, kilobytes * 1024)
+
+
+# ==========================================
+# PRUEBAS DEL RESUMEN DIARIO DE VENTAS
+# ==========================================
+
+class ResumenVentasTests(FordTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.lobo = crear_vehiculo('A', cantidad_disponible=10)
+        self.ranger = crear_vehiculo('B', modelo='Ranger', cantidad_disponible=10)
+        self.empleado = Empleado.objects.create(nombre='Ana', apellido='Ruiz', puesto='Ventas')
+
+    def assertResumenCorrecto(self):
+        self.assertEqual(resumenes.guardado(), resumenes.calcular())
+
+    def fila(self, dimension, clave=''):
+        return VentaDiaria.objects.filter(
+            dimension=dimension, clave=clave, fecha=date.today()
+        ).values_list('ventas', 'total').first()
+
+    def test_alta_cambio_y_baja(self):
+        self.client.post(reverse('agregar_venta'), datos_venta(
+            self.lobo, empleado=self.empleado.id, metodo_pago='Tarjeta', total='100.50'))
+        self.client.post(reverse('agregar_venta'), datos_venta(self.lobo, total='50'))
+        self.assertEqual(self.fila('dia'), (2, Decimal('150.50')))
+        self.assertEqual(self.fila('empleado', str(self.empleado.id)), (1, Decimal('100.50')))
+        self.assertEqual(self.fila('modelo', 'Lobo'), (2, Decimal('150.50')))
+        self.assertResumenCorrecto()
+
+        venta = Venta.objects.get(metodo_pago='Tarjeta')
+        self.client.post(reverse('actualizar_venta', args=[venta.id]), datos_venta(
+            self.ranger, metodo_pago='Efectivo', total='200'))
+        self.assertEqual(self.fila('dia'), (2, Decimal('250.00')))
+        self.assertEqual(self.fila('modelo', 'Ranger'), (1, Decimal('200.00')))
+        self.assertIsNone(self.fila('metodo_pago', 'Tarjeta'))
+        self.assertIsNone(self.fila('empleado', str(self.empleado.id)))
+        self.assertResumenCorrecto()
+
+        self.client.get(reverse('borrar_venta', args=[venta.id]))
+        self.client.get(reverse('borrar_venta', args=[venta.id]))
+        self.assertEqual(self.fila('dia'), (1, Decimal('50.00')))
+        self.assertResumenCorrecto()
+
+    def test_lote_empleados_y_vehiculos(self):
+        ventas = [{'vehiculo': v.id, 'cliente_nombre': 'X', 'total': '10', 'empleado': self.empleado.id}
+                  for v in (self.lobo, self.ranger, self.ranger)]
+        self.client.post(reverse('api_lote'), json.dumps({'ventas': ventas}), content_type='application/json')
+        self.assertEqual(self.fila('modelo', 'Ranger'), (2, Decimal('20.00')))
+        self.assertResumenCorrecto()
+
+        self.client.post(reverse('actualizar_vehiculo', args=[self.ranger.id]), {
+            'marca': 'Ford', 'modelo': 'Maverick', 'anio': '2024', 'precio': '1',
+            'cantidad_disponible': '1', 'numero_serie': 'B'})
+        self.assertEqual(self.fila('modelo', 'Maverick'), (2, Decimal('20.00')))
+        self.assertResumenCorrecto()
+
+        self.client.get(reverse('borrar_empleado', args=[self.empleado.id]))
+        self.assertEqual(self.fila('empleado'), (3, Decimal('30.00')))
+        self.assertResumenCorrecto()
+
+        self.client.get(reverse('borrar_vehiculo', args=[self.ranger.id]))
+        self.assertEqual(self.fila('dia'), (1, Decimal('10.00')))
+        self.assertResumenCorrecto()
+
+    def test_reconstruir_repara(self):
+        call_command('seed_ford', scale=0.01, stdout=StringIO())
+        call_command('reconstruir_resumenes', verificar=True, stdout=StringIO())
+        # Un cambio que no pasa por las vistas.
+        Venta.objects.filter(id=Venta.objects.first().id).update(total=1)
+        with self.assertRaises(CommandError):
+            call_command('reconstruir_resumenes', verificar=True, stdout=StringIO())
+        call_command('reconstruir_resumenes', stdout=StringIO())
+        self.assertResumenCorrecto()
+
+    def test_reporte_lee_solo_el_resumen(self):
+        self.client.post(reverse('agregar_venta'), datos_venta(self.lobo, empleado=self.empleado.id, total='70'))
+        self.client.post(reverse('agregar_venta'), datos_venta(self.ranger, total='30'))
+        with CaptureQueriesContext(connection) as consultas:
+            respuesta = self.client.get(reverse('reporte_ventas'), {'agrupar': 'empleado'})
+        self.assertFalse([c for c in consultas if 'app_ford_venta"' in c['sql'].lower()])
+        self.assertContains(respuesta, 'Ana Ruiz')
+        self.assertContains(respuesta, 'Sin empleado')
+        self.assertEqual(respuesta.context['total'], Decimal('100.00'))
+        self.assertEqual([g['porcentaje'] for g in respuesta.context['grupos']], [70, 30])
+
+        manana = (date.today() + timedelta(days=1)).isoformat()
+        respuesta = self.client.get(reverse('reporte_ventas'), {'agrupar': 'dia', 'desde': manana})
+        self.assertEqual(respuesta.context['grupos'], [])
+
+
+# ==========================================
+# PRUEBAS DEL TABLERO DE INICIO
+# ==========================================
+
+@override_settings(FORD_TABLERO_SEGUNDO_PLANO=False)
+class TableroTests(FordTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.vehiculo = crear_vehiculo(cantidad_disponible=3)
+        self.empleado = Empleado.objects.create(nombre='Ana', apellido='Ruiz', puesto='Ventas')
+
+    def vender(self, total='100'):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('agregar_venta'), datos_venta(
+                self.vehiculo, empleado=self.empleado.id, total=total))
+
+    def test_indicadores(self):
+        self.vender('100')
+        self.vender('50')
+        ServicioMantenimiento.objects.create(
+            vehiculo=self.vehiculo, tipo_servicio='Frenos', fecha_servicio=date.today(), costo_servicio=1)
+        kpis = tablero.calcular_kpis()
+        self.assertEqual(kpis['hoy'], {'ventas': 2, 'total': Decimal('150.00')})
+        self.assertEqual(kpis['mes']['ventas'], 2)
+        self.assertEqual(kpis['vendedores'], [{'nombre': 'Ana Ruiz', 'ventas': 2, 'total': Decimal('150.00')}])
+        # Quedó 1 unidad: poco stock.
+        self.assertEqual(kpis['stock_bajo'], 1)
+        self.assertEqual(kpis['stock_bajo_lista'][0]['id'], self.vehiculo.id)
+        self.assertEqual((kpis['servicios_semana'], kpis['servicios_pendientes']), (1, 1))
+
+    def test_inicio_no_consulta_la_base(self):
+        self.vender()
+        self.client.get(reverse('inicio'))
+        with self.assertNumQueries(0):
+            respuesta = self.client.get(reverse('inicio'))
+        self.assertContains(respuesta, 'Ana Ruiz')
+
+    def test_escritura_marca_los_indicadores_como_viejos(self):
+        self.assertEqual(self.client.get(reverse('inicio')).context['kpis']['hoy']['ventas'], 0)
+        self.vender()
+        self.assertEqual(self.client.get(reverse('inicio')).context['kpis']['hoy']['ventas'], 1)
+
+    @override_settings(FORD_TABLERO_SEGUNDO_PLANO=True)
+    def test_viejos_se_recalculan_en_segundo_plano(self):
+        tablero.actualizar()
+        cache.delete(tablero.CLAVE_FRESCO)
+        with mock.patch('app_Ford.tablero.threading.Thread') as hilo, self.assertNumQueries(0):
+            self.client.get(reverse('inicio'))
+            self.client.get(reverse('inicio'))
+        # Un solo recálculo aunque lleguen varias peticiones.
+        hilo.assert_called_once()
+        hilo.return_value.start.assert_called_once()
+
+
+# ==========================================
+# PRUEBAS DE LAS VISTAS ASYNC (ASGI)
+# ==========================================
+
+@override_settings(ROOT_URLCONF='backend_Ford.urls_asgi')
+class VistasAsyncTests(FordTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.vehiculo = crear_vehiculo('1FTASYNC1')
+        cls.empleado = Empleado.objects.create(nombre='Ana', apellido='Ruiz', puesto='Ventas')
+        cls.proveedor = Proveedor.objects.create(nombre_proveedor='Taller Norte')
+        Cliente.objects.create(nombre='María', apellido='López')
+        for i in range(3):
+            Venta.objects.create(vehiculo=cls.vehiculo, empleado=cls.empleado,
+                                 cliente_nombre=f'Cliente {i}', total=100)
+        ServicioMantenimiento.objects.create(vehiculo=cls.vehiculo, proveedor=cls.proveedor,
+                                             tipo_servicio='Afinación', fecha_servicio=date(2024, 5, 1),
+                                             costo_servicio=900)
+
+    def test_mismas_rutas_con_vistas_async(self):
+        from .urls import urlpatterns
+        asincronas = {p.name for p in urls_asgi.urlpatterns if iscoroutinefunction(p.callback)}
+        self.assertEqual([p.name for p in urls_asgi.urlpatterns], [p.name for p in urlpatterns])
+        self.assertTrue({'ver_ventas', 'exportar_ventas', 'buscar', 'autocompletar_clientes'} <= asincronas)
+        self.assertNotIn('agregar_venta', asincronas)
+
+    async def test_lista_con_validadores(self):
+        url = reverse('ver_ventas')
+        await self.async_client.get(url)
+        respuesta = await self.async_client.get(url)
+        self.assertContains(respuesta, 'Cliente 2')
+        self.assertContains(respuesta, 'Ana')
+        respuesta = await self.async_client.get(url, headers={'If-None-Match': respuesta['ETag']})
+        self.assertEqual(respuesta.status_code, 304)
+
+    async def test_tabla_cacheada(self):
+        primera = await self.async_client.get(reverse('ver_proveedores'))
+        segunda = await self.async_client.get(reverse('ver_proveedores'))
+        self.assertEqual((primera['X-Cache'], segunda['X-Cache']), ('MISS', 'HIT'))
+        self.assertContains(segunda, 'Taller Norte')
+
+    async def test_exportacion_igual_que_la_sincrona(self):
+        for nombre in ('exportar_ventas', 'exportar_servicios'):
+            for formato in ('csv', 'jsonl'):
+                respuesta = await self.async_client.get(reverse(nombre), {'formato': formato})
+                self.assertTrue(respuesta.is_async)
+                contenido = b''.join([trozo async for trozo in respuesta.streaming_content])
+                with override_settings(ROOT_URLCONF='backend_Ford.urls'):
+                    sincrona = await sync_to_async(self.client.get)(reverse(nombre), {'formato': formato})
+                    esperado = await sync_to_async(b''.join)(sincrona.streaming_content)
+                self.assertEqual(contenido, esperado)
+
+    async def test_busqueda_y_autocompletado(self):
+        respuesta = await self.async_client.get(reverse('autocompletar_clientes'), {'q': 'mar'})
+        self.assertEqual(respuesta.json()['resultados'][0]['texto'], 'María López')
+        respuesta = await self.async_client.get(reverse('buscar'), {'q': 'taller', 'tipo': 'proveedores'})
+        self.assertEqual(respuesta.json()['resultados']['proveedores'][0]['id'], self.proveedor.id)
+        respuesta = await self.async_client.get(reverse('buscar'), {'tipo': 'x'})
+        self.assertEqual(respuesta.status_code, 400)
@@ -8,11 +8,34 @@ urlpatterns = [
     # ==========================================
     path('', views.inicio_ford, name='inicio'),
 
+    # ==========================================
+    # URLS DE AUTOCOMPLETADO (JSON)
+    # ==========================================
+    path('autocompletar/vehiculos/', views.autocompletar_vehiculos, name='autocompletar_vehiculos'),
+    path('autocompletar/empleados/', views.autocompletar_empleados, name='autocompletar_empleados'),
+    path('autocompletar/clientes/', views.autocompletar_clientes, name='autocompletar_clientes'),
+    path('autocompletar/proveedores/', views.autocompletar_proveedores, name='autocompletar_proveedores'),
+
+    # Búsqueda global de clientes, proveedores y vehículos
+    path('buscar/', views.buscar, name='buscar'),
+
+    # ==========================================
+    # URLS DE LA API (JSON)
+    # ==========================================
+    path('api/lote/', views.api_lote, name='api_lote'),
+
+    # Métricas en formato Prometheus
+    path('metrics', views.metricas, name='metricas'),
+
+    # Aciertos/fallos de la caché de listas
+    path('cache/estadisticas/', views.estadisticas_cache, name='estadisticas_cache'),
+
     # ==========================================
     # URLS CRUD DE VEHÍCULO
     # ==========================================
     path('vehiculos/agregar/', views.agregar_vehiculo, name='agregar_vehiculo'),
     path('vehiculos/ver/', views.ver_vehiculos, name='ver_vehiculos'),
+    path('vehiculos/acciones/', views.acciones_vehiculos, name='acciones_vehiculos'),
     # KEEPING THIS ONE, as the view function exists:
     path('vehiculos/actualizar/<int:id>/', views.actualizar_vehiculo, name='actualizar_vehiculo'),
     # REMOVING THIS ONE, as 'views.realizar_actualizacion_vehiculo' does NOT exist:
@@ -35,6 +58,8 @@ urlpatterns = [
     # ==========================================
     path('ventas/registrar/', views.agregar_venta, name='agregar_venta'),
     path('ventas/ver/', views.ver_ventas, name='ver_ventas'), 
+    path('ventas/exportar/', views.exportar_ventas, name='exportar_ventas'),
+    path('ventas/acciones/', views.acciones_ventas, name='acciones_ventas'),
     # KEEPING THIS ONE:
     path('ventas/actualizar/<int:id>/', views.actualizar_venta, name='actualizar_venta'),
     # REMOVING THIS ONE:
@@ -42,6 +67,11 @@ urlpatterns = [
     path('ventas/borrar/<int:id>/', views.borrar_venta, name='borrar_venta'),
     # REMOVED DUPLICATE: path('ventas/borrar/<int:id>/', views.borrar_venta, name='borrar_venta'),
 
+    # ==========================================
+    # URLS DE REPORTES
+    # ==========================================
+    path('reportes/ventas/', views.reporte_ventas, name='reporte_ventas'),
+
     # ==========================================
     # URLS CRUD DE CLIENTE (NUEVAS)
     # ==========================================
@@ -58,6 +88,7 @@ urlpatterns = [
     # ==========================================
     path('proveedores/agregar/', views.agregar_proveedor, name='agregar_proveedor'),
     path('proveedores/ver/', views.ver_proveedores, name='ver_proveedores'),
+    path('proveedores/acciones/', views.acciones_proveedores, name='acciones_proveedores'),
     # KEEPING THIS ONE:
     path('proveedores/actualizar/<int:id>/', views.actualizar_proveedor, name='actualizar_proveedor'),
     # REMOVING THIS ONE:
@@ -69,6 +100,7 @@ urlpatterns = [
     # ==========================================
     path('servicios/agregar/', views.agregar_servicio, name='agregar_servicio'),
     path('servicios/ver/', views.ver_servicios, name='ver_servicios'),
+    path('servicios/exportar/', views.exportar_servicios, name='exportar_servicios'),
     # KEEPING THIS ONE:
     path('servicios/actualizar/<int:id>/', views.actualizar_servicio, name='actualizar_servicio'),
     # REMOVING THIS ONE:
@@ -0,0 +1,23 @@
+# app_Ford/urls_asgi.py
+from django.urls import URLPattern
+
+from . import vistas_async
+from .urls import urlpatterns as urlpatterns_wsgi
+
+# ==========================================
+# URLS BAJO ASGI
+# ==========================================
+# Las mismas rutas y nombres de urls.py; las vistas de lectura que tienen
+# versión async (vistas_async.py) se sustituyen por ella. Las demás
+# (formularios, API de lotes, reportes) siguen siendo síncronas y Django
+# las corre en un hilo.
+
+
+def _async_si_hay(patron):
+    vista = getattr(vistas_async, patron.name or '', None)
+    if vista is None:
+        return patron
+    return URLPattern(patron.pattern, vista, patron.default_args, patron.name)
+
+
+urlpatterns = [_async_si_hay(patron) for patron in urlpatterns_wsgi]
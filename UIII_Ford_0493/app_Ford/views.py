@@ -1,10 +1,41 @@
 # app_Ford/views.py
+import json
+from copy import copy
+from decimal import Decimal, InvalidOperation
+
+from django.contrib import messages
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse, JsonResponse
 from django.shortcuts import render, redirect, get_object_or_404
-from .models import Vehiculo, Empleado, Venta, Cliente, Proveedor, ServicioMantenimiento
-from datetime import date 
-# Se puede usar para mostrar mensajes de error, aunque en este ejemplo
-# pasaremos el error en el contexto.
-# from django.contrib import messages 
+from django.urls import reverse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from .models import Vehiculo, Empleado, Venta, VentaArchivada, Cliente, Proveedor, ServicioMantenimiento, VentaDiaria
+from .inventario import reservar_unidad, devolver_unidad, ajustar_stock, ajustar_stocks
+from .autocompletar import (
+    respuesta_autocompletar, leer_limite,
+    BUSQUEDA_VEHICULO, BUSQUEDA_EMPLEADO, BUSQUEDA_CLIENTE, BUSQUEDA_PROVEEDOR,
+)
+from .cache_listas import tabla_cacheada, estadisticas
+from .condicional import respuesta_condicional
+from .enrutador import lectura_en_replica
+from .lotes import procesar_lote, LoteInvalido
+from . import acciones, busqueda, idempotencia, resumenes, tablero
+from .metricas import contar, exposicion
+from .exportar import (
+    respuesta_exportacion, filas_venta, filas_servicio,
+    COLUMNAS_VENTA, COLUMNAS_SERVICIO,
+)
+from .archivo import con_archivo
+from .paginacion import paginar_por_cursor
+from .filtros import (
+    aplicar_filtros, elegir_orden,
+    FILTROS_VEHICULO, ORDENES_VEHICULO,
+    FILTROS_VENTA, ORDENES_VENTA,
+    FILTROS_SERVICIO, ORDENES_SERVICIO,
+    FILTROS_REPORTE,
+)
+from datetime import date, datetime, timezone
 
 # ==========================================
 # VISTAS PRINCIPALES
@@ -12,9 +43,108 @@ from datetime import date
 
 def inicio_ford(request):
     """
-    Renderiza la página de inicio.
+    Renderiza la página de inicio con los indicadores del tablero, que
+    vienen de la caché (ver tablero.py).
+    """
+    datos = tablero.obtener()
+    contexto = {
+        'kpis': datos['kpis'],
+        'calculado': datetime.fromtimestamp(datos['calculado'], tz=timezone.utc),
+    }
+    return render(request, 'inicio.html', contexto)
+
+
+def metricas(request):
+    """
+    Métricas en el formato de texto de Prometheus (ver metricas.py).
+    """
+    return HttpResponse(exposicion(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+def estadisticas_cache(request):
+    """
+    Aciertos/fallos de la caché de listas en este proceso (JSON).
     """
-    return render(request, 'inicio.html')
+    return JsonResponse(estadisticas())
+
+# ==========================================
+# API DE LOTES (JSON)
+# ==========================================
+
+# Sin token CSRF: la usan las tabletas, no un formulario del sitio. Sólo
+# acepta Content-Type application/json, que un formulario de otro sitio no
+# puede enviar sin que el navegador lo bloquee (CORS).
+@csrf_exempt
+@require_POST
+def api_lote(request):
+    """
+    Registra un lote de ventas y servicios (ver lotes.py). Responde con un
+    resultado por elemento.
+    """
+    if request.content_type != 'application/json':
+        return JsonResponse({'error': 'se esperaba application/json'}, status=415)
+    try:
+        datos = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({'error': 'JSON mal formado'}, status=400)
+    # Con Idempotency-Key, un lote reenviado (timeout de la tableta) recibe
+    # la respuesta original sin volver a crear nada (ver idempotencia.py).
+    clave = idempotencia.clave_de(request)
+    try:
+        with transaction.atomic():
+            previo = clave and idempotencia.buscar('lote', clave)
+            if previo:
+                return idempotencia.repetida(JsonResponse(previo[1]))
+            resultado = procesar_lote(datos)
+            if clave:
+                idempotencia.registrar('lote', clave, resultado=resultado)
+    except LoteInvalido as error:
+        return JsonResponse({'error': str(error)}, status=400)
+    except IntegrityError:
+        # Otro envío del mismo lote terminó primero; nada de este se guardó.
+        previo = clave and idempotencia.buscar('lote', clave)
+        if not previo:
+            raise
+        return idempotencia.repetida(JsonResponse(previo[1]))
+    return JsonResponse(resultado)
+
+# ==========================================
+# VISTAS DE AUTOCOMPLETADO Y BÚSQUEDA (JSON)
+# ==========================================
+# Usadas por los formularios de ventas y servicios en lugar de <select>
+# con todas las filas de la tabla (ver autocompletar.py).
+# Las vistas de sólo lectura (@lectura_en_replica) consultan la réplica
+# si está configurada (ver enrutador.py).
+
+@lectura_en_replica
+def autocompletar_vehiculos(request):
+    return respuesta_autocompletar(request, Vehiculo.objects.all(), BUSQUEDA_VEHICULO)
+
+@lectura_en_replica
+def autocompletar_empleados(request):
+    return respuesta_autocompletar(request, Empleado.objects.all(), BUSQUEDA_EMPLEADO)
+
+@lectura_en_replica
+def autocompletar_clientes(request):
+    return respuesta_autocompletar(request, Cliente.objects.all(), BUSQUEDA_CLIENTE)
+
+@lectura_en_replica
+def autocompletar_proveedores(request):
+    return respuesta_autocompletar(request, Proveedor.objects.all(), BUSQUEDA_PROVEEDOR)
+
+@lectura_en_replica
+def buscar(request):
+    """
+    Búsqueda global de clientes, proveedores y vehículos (ver busqueda.py):
+    ?q=<palabras>&tipo=<clientes|proveedores|vehiculos>&limite=<n>.
+    'tipo' se puede repetir; sin él se busca en todos.
+        {"resultados": {"clientes": [{"id": 1, "texto": "...", "url": "..."}], ...}}
+    """
+    tipos = request.GET.getlist('tipo') or None
+    if tipos and not set(tipos) <= set(busqueda.INDICES):
+        return JsonResponse({'error': f"tipo debe ser uno de: {', '.join(busqueda.INDICES)}"}, status=400)
+    resultados = busqueda.buscar(request.GET.get('q', ''), tipos, leer_limite(request))
+    return JsonResponse({'resultados': resultados})
 
 # ==========================================
 # VISTAS CRUD DE VEHÍCULO (Refactorizadas)
@@ -56,14 +186,63 @@ def agregar_vehiculo(request):
     return render(request, 'vehiculos/agregar_vehiculo.html')
 
 
+@respuesta_condicional('Vehiculo')
+@lectura_en_replica
 def ver_vehiculos(request):
-    todos_los_vehiculos = Vehiculo.objects.all()
+    vehiculos, filtros = aplicar_filtros(request, Vehiculo.objects.all(), FILTROS_VEHICULO)
+    orden_actual, orden = elegir_orden(request, ORDENES_VEHICULO, 'id')
+
+    def contexto_tabla():
+        # Sólo se ejecuta (y consulta la base) si la tabla no está en caché.
+        pagina = paginar_por_cursor(request, vehiculos, orden=orden)
+        return {'vehiculos': pagina['objetos'], 'pagina': pagina}
+
+    tabla, acierto = tabla_cacheada(
+        request, 'vehiculos', 'vehiculos/tabla_vehiculos.html', contexto_tabla
+    )
     contexto = {
-        'vehiculos': todos_los_vehiculos
+        'tabla': tabla,
+        'filtros': filtros,
+        'orden_actual': orden_actual
     }
-    return render(request, 'vehiculos/ver_vehiculos.html', contexto)
+    respuesta = render(request, 'vehiculos/ver_vehiculos.html', contexto)
+    respuesta['X-Cache'] = 'HIT' if acierto else 'MISS'
+    return respuesta
+
+
+def _volver_a_lista(request, nombre):
+    """Redirige a la lista 'nombre' con los mismos filtros (los GET de la acción)."""
+    consulta = request.GET.urlencode()
+    return redirect(f'{reverse(nombre)}?{consulta}' if consulta else nombre)
+
+
+@require_POST
+def acciones_vehiculos(request):
+    """
+    Acción masiva sobre los vehículos marcados o filtrados (ver acciones.py):
+    'precio' cambia el precio en 'valor' por ciento y 'stock' suma 'valor'
+    unidades (negativo resta).
+    """
+    vehiculos = acciones.seleccion(request, Vehiculo.objects.all(), FILTROS_VEHICULO)
+    accion = request.POST.get('accion')
+    try:
+        if accion == 'precio':
+            porcentaje = Decimal(request.POST.get('valor'))
+            if not porcentaje.is_finite() or porcentaje <= -100:
+                raise ValueError(porcentaje)
+            cambiados = acciones.cambiar_precios(vehiculos, porcentaje)
+        elif accion == 'stock':
+            cambiados = len(ajustar_stocks(vehiculos, int(request.POST.get('valor')), 'Ajuste masivo'))
+        else:
+            raise ValueError(accion)
+    except (ValueError, TypeError, InvalidOperation):
+        messages.error(request, 'Acción o valor inválido: no se cambió nada.')
+    else:
+        messages.success(request, f'{cambiados} vehículos actualizados.')
+    return _volver_a_lista(request, 'ver_vehiculos')
 
 
+@respuesta_condicional('Vehiculo')
 def actualizar_vehiculo(request, id):
     """
     Vista fusionada:
@@ -73,6 +252,7 @@ def actualizar_vehiculo(request, id):
     vehiculo_a_actualizar = get_object_or_404(Vehiculo, id=id)
     
     if request.method == "POST":
+        modelo_anterior = vehiculo_a_actualizar.modelo
         vehiculo_a_actualizar.marca = request.POST.get('marca')
         vehiculo_a_actualizar.modelo = request.POST.get('modelo')
         
@@ -88,14 +268,22 @@ def actualizar_vehiculo(request, id):
             vehiculo_a_actualizar.precio = None # O mantener el valor anterior o dar un error
             
         try:
-            vehiculo_a_actualizar.cantidad_disponible = int(request.POST.get('cantidad_disponible'))
+            cantidad = int(request.POST.get('cantidad_disponible'))
         except (ValueError, TypeError):
-            vehiculo_a_actualizar.cantidad_disponible = 0 # O mantener el valor anterior o dar un error
+            cantidad = 0 # O mantener el valor anterior o dar un error
             
         vehiculo_a_actualizar.numero_serie = request.POST.get('numero_serie')
         vehiculo_a_actualizar.color = request.POST.get('color')
         
-        vehiculo_a_actualizar.save()
+        with transaction.atomic():
+            # El stock no se guarda con save(): el cambio queda como ajuste
+            # en la bitácora (ver inventario.py).
+            vehiculo_a_actualizar.save(update_fields=[
+                'marca', 'modelo', 'anio', 'precio', 'numero_serie', 'color', 'fecha_actualizacion',
+            ])
+            ajustar_stock(vehiculo_a_actualizar.id, cantidad, 'Edición del vehículo')
+            # El reporte por modelo agrupa por el modelo actual del vehículo.
+            resumenes.cambiar_modelo(vehiculo_a_actualizar.id, modelo_anterior, vehiculo_a_actualizar.modelo)
         return redirect('ver_vehiculos')
     
     # Si es GET, muestra el formulario de actualización
@@ -150,13 +338,17 @@ def agregar_empleado(request):
 
     return render(request, 'empleados/agregar_empleado.html')
 
+@respuesta_condicional('Empleado')
+@lectura_en_replica
 def ver_empleados(request):
-    todos_los_empleados = Empleado.objects.all()
+    pagina = paginar_por_cursor(request, Empleado.objects.all(), orden=['id'])
     contexto = {
-        'empleados': todos_los_empleados
+        'empleados': pagina['objetos'],
+        'pagina': pagina
     }
     return render(request, 'empleados/ver_empleados.html', contexto)
 
+@respuesta_condicional('Empleado')
 def actualizar_empleado(request, id):
     """
     Vista fusionada:
@@ -207,24 +399,16 @@ def borrar_empleado(request, id):
 # ==========================================
 
 def agregar_venta(request):
-    vehiculos = Vehiculo.objects.all() 
-    empleados = Empleado.objects.all() 
-    contexto = {
-        'vehiculos': vehiculos,
-        'empleados': empleados
-    }
+    # Vehículo y empleado se eligen con autocompletado; no se cargan las tablas.
+    # Cada formulario lleva su clave de idempotencia (ver idempotencia.py).
+    contexto = {'clave_idempotencia': idempotencia.nueva_clave()}
 
     if request.method == "POST":
         vehiculo_id = request.POST.get('vehiculo')
         empleado_id = request.POST.get('empleado')
+        clave = idempotencia.clave_de(request)
         
-        # --- Validación de Stock ---
         vehiculo = get_object_or_404(Vehiculo, id=vehiculo_id)
-        if vehiculo.cantidad_disponible <= 0:
-            # Si no hay stock, volvemos al formulario con un mensaje de error
-            contexto['error'] = f"No hay stock disponible para el vehículo: {vehiculo.marca} {vehiculo.modelo}."
-            return render(request, 'ventas/agregar_venta.html', contexto)
-        
         empleado = get_object_or_404(Empleado, id=empleado_id) if empleado_id else None 
 
         try:
@@ -232,20 +416,48 @@ def agregar_venta(request):
         except (ValueError, TypeError):
             total = 0.0 # O manejar el error
 
-        Venta.objects.create(
-            vehiculo=vehiculo,
-            empleado=empleado,
-            cliente_nombre=request.POST.get('cliente_nombre'),
-            cliente_telefono=request.POST.get('cliente_telefono'),
-            total=total,
-            metodo_pago=request.POST.get('metodo_pago'),
-            folio=request.POST.get('folio'),
-            fecha_venta=date.today() 
-        )
-        
-        # Restar del stock (ahora sabemos que es seguro)
-        vehiculo.cantidad_disponible -= 1
-        vehiculo.save()
+        # --- Validación y descuento de Stock en una sola sentencia ---
+        # La reserva y el INSERT de la venta van en la misma transacción:
+        # si algo falla al crear la venta, la unidad regresa al inventario.
+        folio = request.POST.get('folio')
+        try:
+            with transaction.atomic():
+                # Dentro de la transacción: en SQLite espera a que termine
+                # una petición con la misma clave que todavía esté guardando.
+                if clave and idempotencia.buscar('venta', clave) is not None:
+                    return idempotencia.repetida(redirect('ver_ventas'))
+                if folio and VentaArchivada.objects.filter(folio=folio).exists():
+                    contexto['error'] = f"Ya existe una venta con el folio {folio}."
+                    return render(request, 'ventas/agregar_venta.html', contexto)
+                if not reservar_unidad(vehiculo.id, nota=f'Venta {folio}' if folio else 'Venta nueva'):
+                    contar('ford_ventas_sin_stock_total', origen='formulario')
+                    # Si no hay stock, volvemos al formulario con un mensaje de error
+                    contexto['error'] = f"No hay stock disponible para el vehículo: {vehiculo.marca} {vehiculo.modelo}."
+                    return render(request, 'ventas/agregar_venta.html', contexto)
+
+                venta = Venta.objects.create(
+                    vehiculo=vehiculo,
+                    empleado=empleado,
+                    cliente_nombre=request.POST.get('cliente_nombre'),
+                    cliente_telefono=request.POST.get('cliente_telefono'),
+                    total=total,
+                    metodo_pago=request.POST.get('metodo_pago'),
+                    folio=folio,
+                    fecha_venta=date.today() 
+                )
+                resumenes.registrar_ventas([venta])
+                if clave:
+                    idempotencia.registrar('venta', clave, venta.id)
+        except IntegrityError:
+            # Otra petición con la misma clave ganó (su venta es la buena) o
+            # el folio ya existe. Nada de esta se guardó.
+            if clave and idempotencia.buscar('venta', clave) is not None:
+                return idempotencia.repetida(redirect('ver_ventas'))
+            if not folio:
+                raise
+            contexto['error'] = f"Ya existe una venta con el folio {folio}."
+            return render(request, 'ventas/agregar_venta.html', contexto)
+        contar('ford_ventas_registradas_total', origen='formulario')
 
         return redirect('ver_ventas')
     
@@ -253,65 +465,98 @@ def agregar_venta(request):
     return render(request, 'ventas/agregar_venta.html', contexto)
 
 
+@respuesta_condicional('Venta', 'Vehiculo', 'Empleado')
+@lectura_en_replica
 def ver_ventas(request):
-    todas_las_ventas = Venta.objects.select_related('vehiculo', 'empleado').all()
+    # Con un filtro de fechas anterior al límite también se lee el archivo.
+    ventas, filtros = con_archivo(request, Venta, ('vehiculo', 'empleado'), FILTROS_VENTA)
+    # Por defecto las ventas más recientes primero; 'id' desempata ventas del mismo día.
+    orden_actual, orden = elegir_orden(request, ORDENES_VENTA, 'recientes')
+    pagina = paginar_por_cursor(request, ventas, orden=orden)
     contexto = {
-        'ventas': todas_las_ventas
+        'ventas': pagina['objetos'],
+        'pagina': pagina,
+        'filtros': filtros,
+        'orden_actual': orden_actual,
+        # Sólo id y nombre: es para el <select> del filtro.
+        'empleados': Empleado.objects.order_by('nombre', 'apellido').values('id', 'nombre', 'apellido')
     }
     return render(request, 'ventas/ver_ventas.html', contexto)
 
 
+@lectura_en_replica
+def exportar_ventas(request):
+    """
+    Descarga las ventas (con los mismos filtros que 'ver_ventas') en CSV
+    o JSONL (?formato=jsonl), enviadas en streaming.
+    """
+    ventas, _ = con_archivo(request, Venta, ('vehiculo', 'empleado'), FILTROS_VENTA)
+    return respuesta_exportacion(
+        COLUMNAS_VENTA, filas_venta(*(v.order_by('fecha_venta', 'id') for v in ventas)),
+        request.GET.get('formato'), 'ventas'
+    )
+
+
+@respuesta_condicional('Venta', 'Vehiculo', 'Empleado')
 def actualizar_venta(request, id):
     """
     Vista fusionada:
     - GET: Muestra el formulario de actualización.
     - POST: Procesa los datos y guarda los cambios, validando stock.
     """
-    venta_a_actualizar = get_object_or_404(Venta, id=id)
-    vehiculos = Vehiculo.objects.all()
-    empleados = Empleado.objects.all()
-    
+    venta_a_actualizar = get_object_or_404(
+        Venta.objects.select_related('vehiculo', 'empleado'), id=id
+    )
     contexto = {
-        'venta': venta_a_actualizar,
-        'vehiculos': vehiculos,
-        'empleados': empleados
+        'venta': venta_a_actualizar
     }
 
     if request.method == "POST":
-        vehiculo_anterior = venta_a_actualizar.vehiculo
         vehiculo_nuevo_id = request.POST.get('vehiculo')
         vehiculo_nuevo = get_object_or_404(Vehiculo, id=vehiculo_nuevo_id)
-
-        # --- Validación de Stock si el vehículo cambia ---
-        if vehiculo_anterior.id != vehiculo_nuevo.id:
-            if vehiculo_nuevo.cantidad_disponible <= 0:
-                # Si no hay stock del nuevo vehículo, volvemos al formulario con error
-                contexto['error'] = f"No hay stock disponible para el nuevo vehículo: {vehiculo_nuevo.marca} {vehiculo_nuevo.modelo}."
-                return render(request, 'ventas/actualizar_venta.html', contexto)
-            
-            # Actualizar stock
-            vehiculo_anterior.cantidad_disponible += 1 
-            vehiculo_anterior.save()
-            vehiculo_nuevo.cantidad_disponible -= 1 
-            vehiculo_nuevo.save()
-
-        # Actualizar la venta
-        venta_a_actualizar.vehiculo = vehiculo_nuevo
-        
         empleado_id = request.POST.get('empleado')
-        venta_a_actualizar.empleado = get_object_or_404(Empleado, id=empleado_id) if empleado_id else None
-        
-        venta_a_actualizar.cliente_nombre = request.POST.get('cliente_nombre')
-        venta_a_actualizar.cliente_telefono = request.POST.get('cliente_telefono')
-        
+        empleado = get_object_or_404(Empleado, id=empleado_id) if empleado_id else None
+
         try:
-            venta_a_actualizar.total = float(request.POST.get('total'))
-        except (ValueError, TypeError):
-            venta_a_actualizar.total = 0.0 # O mantener el valor anterior
+            with transaction.atomic():
+                # Se vuelve a leer la venta bloqueándola, para que dos ediciones
+                # simultáneas no devuelvan dos veces el mismo vehículo al stock.
+                venta_a_actualizar = Venta.objects.select_for_update().get(id=venta_a_actualizar.id)
+                vehiculo_anterior_id = venta_a_actualizar.vehiculo_id
+                anterior = copy(venta_a_actualizar)
+
+                # --- Validación de Stock si el vehículo cambia ---
+                if vehiculo_anterior_id != vehiculo_nuevo.id:
+                    if not reservar_unidad(vehiculo_nuevo.id, nota=str(venta_a_actualizar)):
+                        # Si no hay stock del nuevo vehículo, volvemos al formulario con error
+                        contexto['error'] = f"No hay stock disponible para el nuevo vehículo: {vehiculo_nuevo.marca} {vehiculo_nuevo.modelo}."
+                        return render(request, 'ventas/actualizar_venta.html', contexto)
+                    devolver_unidad(vehiculo_anterior_id, nota=str(venta_a_actualizar))
+
+                # Actualizar la venta
+                venta_a_actualizar.vehiculo = vehiculo_nuevo
+                venta_a_actualizar.empleado = empleado
             
-        venta_a_actualizar.metodo_pago = request.POST.get('metodo_pago')
-        venta_a_actualizar.folio = request.POST.get('folio')
-        venta_a_actualizar.save()
+                venta_a_actualizar.cliente_nombre = request.POST.get('cliente_nombre')
+                venta_a_actualizar.cliente_telefono = request.POST.get('cliente_telefono')
+            
+                try:
+                    venta_a_actualizar.total = float(request.POST.get('total'))
+                except (ValueError, TypeError):
+                    venta_a_actualizar.total = 0.0 # O mantener el valor anterior
+                
+                venta_a_actualizar.metodo_pago = request.POST.get('metodo_pago')
+                venta_a_actualizar.folio = request.POST.get('folio')
+                # La restricción única sólo cubre Venta; tampoco se reusa un folio archivado.
+                if venta_a_actualizar.folio and venta_a_actualizar.folio != anterior.folio \
+                        and VentaArchivada.objects.filter(folio=venta_a_actualizar.folio).exists():
+                    raise IntegrityError('folio archivado')
+                venta_a_actualizar.save()
+                resumenes.cambiar_venta(anterior, venta_a_actualizar)
+        except IntegrityError:
+            # El folio nuevo ya es de otra venta; no se cambió nada.
+            contexto['error'] = f"Ya existe una venta con el folio {request.POST.get('folio')}."
+            return render(request, 'ventas/actualizar_venta.html', contexto)
 
         return redirect('ver_ventas')
     
@@ -321,16 +566,71 @@ def actualizar_venta(request, id):
 
 def borrar_venta(request, id):
     venta_a_borrar = get_object_or_404(Venta, id=id)
-    vehiculo_vendido = venta_a_borrar.vehiculo 
 
-    venta_a_borrar.delete()
-    
-    # Devolver el vehículo al stock
-    vehiculo_vendido.cantidad_disponible += 1
-    vehiculo_vendido.save()
+    with transaction.atomic():
+        # Sólo quien realmente borra la fila devuelve el vehículo al stock;
+        # un doble clic o un borrado simultáneo no lo devuelven dos veces.
+        borradas, _ = Venta.objects.filter(id=venta_a_borrar.id).delete()
+        if borradas:
+            devolver_unidad(venta_a_borrar.vehiculo_id, nota=str(venta_a_borrar))
+            resumenes.quitar_ventas([venta_a_borrar])
     
     return redirect('ver_ventas')
 
+
+@require_POST
+def acciones_ventas(request):
+    """
+    Acción masiva sobre las ventas marcadas o filtradas: 'empleado' las pasa
+    a otro empleado y 'borrar' las borra y regresa los vehículos al stock.
+    Las ventas archivadas no se tocan.
+    """
+    ventas = acciones.seleccion(request, Venta.objects.all(), FILTROS_VENTA)
+    accion = request.POST.get('accion')
+    if accion == 'empleado':
+        try:
+            empleado = Empleado.objects.filter(id=int(request.POST.get('empleado'))).first()
+        except (ValueError, TypeError):
+            empleado = None
+        if empleado is None:
+            messages.error(request, 'Elige el empleado al que pasan las ventas.')
+        else:
+            cambiadas = acciones.reasignar_ventas(ventas, empleado)
+            messages.success(request, f'{cambiadas} ventas pasadas a {empleado}.')
+    elif accion == 'borrar':
+        messages.success(request, f'{acciones.borrar_ventas(ventas)} ventas borradas.')
+    else:
+        messages.error(request, 'Acción inválida: no se cambió nada.')
+    return _volver_a_lista(request, 'ver_ventas')
+
+# ==========================================
+# REPORTES DE VENTAS (leen sólo el resumen diario)
+# ==========================================
+
+@lectura_en_replica
+def reporte_ventas(request):
+    """
+    Ingresos por día, mes, empleado, modelo o método de pago en un rango de
+    fechas. No toca la tabla de ventas: lee VentaDiaria (ver resumenes.py).
+    """
+    agrupar = request.GET.get('agrupar')
+    if agrupar not in resumenes.AGRUPACIONES:
+        agrupar = 'mes'
+    filas, filtros = aplicar_filtros(request, VentaDiaria.objects.all(), FILTROS_REPORTE)
+    grupos = resumenes.reporte(filas, agrupar)
+    total = sum((g['total'] for g in grupos), 0)
+    for grupo in grupos:
+        grupo['porcentaje'] = round(grupo['total'] / total * 100, 1) if total else 0
+    contexto = {
+        'grupos': grupos,
+        'filtros': filtros,
+        'agrupar': agrupar,
+        'agrupaciones': resumenes.AGRUPACIONES,
+        'total_ventas': sum(g['ventas'] for g in grupos),
+        'total': total,
+    }
+    return render(request, 'reportes/reporte_ventas.html', contexto)
+
 # ==========================================
 # VISTAS CRUD DE CLIENTE (Refactorizadas)
 # ==========================================
@@ -346,13 +646,17 @@ def agregar_cliente(request):
         return redirect('ver_clientes')
     return render(request, 'clientes/agregar_cliente.html')
 
+@respuesta_condicional('Cliente')
+@lectura_en_replica
 def ver_clientes(request):
-    todos_los_clientes = Cliente.objects.all()
+    pagina = paginar_por_cursor(request, Cliente.objects.all(), orden=['id'])
     contexto = {
-        'clientes': todos_los_clientes
+        'clientes': pagina['objetos'],
+        'pagina': pagina
     }
     return render(request, 'clientes/ver_clientes.html', contexto)
 
+@respuesta_condicional('Cliente')
 def actualizar_cliente(request, id):
     """
     Vista fusionada:
@@ -396,13 +700,21 @@ def agregar_proveedor(request):
         return redirect('ver_proveedores')
     return render(request, 'proveedores/agregar_proveedor.html')
 
+@respuesta_condicional('Proveedor')
+@lectura_en_replica
 def ver_proveedores(request):
-    todos_los_proveedores = Proveedor.objects.all()
-    contexto = {
-        'proveedores': todos_los_proveedores
-    }
-    return render(request, 'proveedores/ver_proveedores.html', contexto)
-
+    def contexto_tabla():
+        pagina = paginar_por_cursor(request, Proveedor.objects.all(), orden=['id'])
+        return {'proveedores': pagina['objetos'], 'pagina': pagina}
+
+    tabla, acierto = tabla_cacheada(
+        request, 'proveedores', 'proveedores/tabla_proveedores.html', contexto_tabla
+    )
+    respuesta = render(request, 'proveedores/ver_proveedores.html', {'tabla': tabla})
+    respuesta['X-Cache'] = 'HIT' if acierto else 'MISS'
+    return respuesta
+
+@respuesta_condicional('Proveedor')
 def actualizar_proveedor(request, id):
     """
     Vista fusionada:
@@ -431,15 +743,22 @@ def borrar_proveedor(request, id):
     proveedor_a_borrar.delete()
     return redirect('ver_proveedores')
 
+
+@require_POST
+def acciones_proveedores(request):
+    """Borra de una vez los proveedores marcados en la lista."""
+    if request.POST.get('accion') != 'borrar':
+        messages.error(request, 'Acción inválida: no se cambió nada.')
+    else:
+        borrados = acciones.borrar_proveedores(acciones.seleccion(request, Proveedor.objects.all()))
+        messages.success(request, f'{borrados} proveedores borrados.')
+    return _volver_a_lista(request, 'ver_proveedores')
+
 # ==========================================
 # VISTAS CRUD DE SERVICIO MANTENIMIENTO (Refactorizadas)
 # ==========================================
 
 def agregar_servicio(request):
-    vehiculos = Vehiculo.objects.all()
-    clientes = Cliente.objects.all()
-    proveedores = Proveedor.objects.all()
-    
     if request.method == "POST":
         vehiculo_id = request.POST.get('vehiculo')
         cliente_id = request.POST.get('cliente')
@@ -463,45 +782,74 @@ def agregar_servicio(request):
                 pass # Manejar el error si la fecha no es válida
 
 
-        ServicioMantenimiento.objects.create(
-            vehiculo=vehiculo,
-            cliente=cliente,
-            proveedor=proveedor,
-            tipo_servicio=request.POST.get('tipo_servicio'),
-            fecha_servicio=fecha_servicio,
-            costo_servicio=costo_servicio
-        )
+        clave = idempotencia.clave_de(request)
+        try:
+            with transaction.atomic():
+                # Como en agregar_venta: una petición repetida no crea otro servicio.
+                if clave and idempotencia.buscar('servicio', clave) is not None:
+                    return idempotencia.repetida(redirect('ver_servicios'))
+                servicio = ServicioMantenimiento.objects.create(
+                    vehiculo=vehiculo,
+                    cliente=cliente,
+                    proveedor=proveedor,
+                    tipo_servicio=request.POST.get('tipo_servicio'),
+                    fecha_servicio=fecha_servicio,
+                    costo_servicio=costo_servicio
+                )
+                if clave:
+                    idempotencia.registrar('servicio', clave, servicio.id)
+        except IntegrityError:
+            if not (clave and idempotencia.buscar('servicio', clave) is not None):
+                raise
+            return idempotencia.repetida(redirect('ver_servicios'))
+        contar('ford_servicios_registrados_total', origen='formulario')
         return redirect('ver_servicios')
         
-    contexto = {
-        'vehiculos': vehiculos,
-        'clientes': clientes,
-        'proveedores': proveedores
-    }
-    return render(request, 'servicios/agregar_servicio.html', contexto)
+    return render(request, 'servicios/agregar_servicio.html', {'clave_idempotencia': idempotencia.nueva_clave()})
 
+@respuesta_condicional('ServicioMantenimiento', 'Vehiculo', 'Cliente', 'Proveedor')
+@lectura_en_replica
 def ver_servicios(request):
-    todos_los_servicios = ServicioMantenimiento.objects.select_related('vehiculo', 'cliente', 'proveedor').all()
+    servicios, filtros = con_archivo(
+        request, ServicioMantenimiento, ('vehiculo', 'cliente', 'proveedor'), FILTROS_SERVICIO
+    )
+    orden_actual, orden = elegir_orden(request, ORDENES_SERVICIO, 'recientes')
+    pagina = paginar_por_cursor(request, servicios, orden=orden)
     contexto = {
-        'servicios': todos_los_servicios
+        'servicios': pagina['objetos'],
+        'pagina': pagina,
+        'filtros': filtros,
+        'orden_actual': orden_actual,
+        'proveedores': Proveedor.objects.order_by('nombre_proveedor').values('id', 'nombre_proveedor')
     }
     return render(request, 'servicios/ver_servicios.html', contexto)
 
 
+@lectura_en_replica
+def exportar_servicios(request):
+    """
+    Descarga los servicios (con los mismos filtros que 'ver_servicios') en CSV
+    o JSONL (?formato=jsonl), enviados en streaming.
+    """
+    servicios, _ = con_archivo(
+        request, ServicioMantenimiento, ('vehiculo', 'cliente', 'proveedor'), FILTROS_SERVICIO
+    )
+    return respuesta_exportacion(
+        COLUMNAS_SERVICIO, filas_servicio(*(s.order_by('fecha_servicio', 'id') for s in servicios)),
+        request.GET.get('formato'), 'servicios'
+    )
+
+
+@respuesta_condicional('ServicioMantenimiento', 'Vehiculo', 'Cliente', 'Proveedor')
 def actualizar_servicio(request, id):
     """
     Vista para actualizar un servicio de mantenimiento existente.
     """
-    servicio_a_actualizar = get_object_or_404(ServicioMantenimiento, id=id)
-    vehiculos = Vehiculo.objects.all()
-    clientes = Cliente.objects.all()
-    proveedores = Proveedor.objects.all()
-
+    servicio_a_actualizar = get_object_or_404(
+        ServicioMantenimiento.objects.select_related('vehiculo', 'cliente', 'proveedor'), id=id
+    )
     contexto = {
-        'servicio': servicio_a_actualizar,
-        'vehiculos': vehiculos,
-        'clientes': clientes,
-        'proveedores': proveedores
+        'servicio': servicio_a_actualizar
     }
 
     if request.method == "POST":
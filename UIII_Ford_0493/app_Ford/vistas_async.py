@@ -0,0 +1,204 @@
+# app_Ford/vistas_async.py
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.shortcuts import render
+
+from .models import Vehiculo, Empleado, Venta, Cliente, Proveedor, ServicioMantenimiento
+from .autocompletar import (
+    arespuesta_autocompletar, leer_limite,
+    BUSQUEDA_VEHICULO, BUSQUEDA_EMPLEADO, BUSQUEDA_CLIENTE, BUSQUEDA_PROVEEDOR,
+)
+from .cache_listas import atabla_cacheada
+from .condicional import respuesta_condicional
+from .enrutador import lectura_en_replica
+from . import busqueda
+from .exportar import (
+    respuesta_exportacion, afilas_venta, afilas_servicio,
+    COLUMNAS_VENTA, COLUMNAS_SERVICIO,
+)
+from .archivo import con_archivo
+from .paginacion import apaginar_por_cursor
+from .filtros import (
+    aplicar_filtros, elegir_orden,
+    FILTROS_VEHICULO, ORDENES_VEHICULO,
+    FILTROS_VENTA, ORDENES_VENTA,
+    FILTROS_SERVICIO, ORDENES_SERVICIO,
+)
+
+# ==========================================
+# VISTAS DE LECTURA ASÍNCRONAS (ASGI)
+# ==========================================
+# Las mismas listas, exportaciones, búsqueda y autocompletado de views.py,
+# escritas con el ORM asíncrono. Las usa app_Ford/urls_asgi.py, que es la
+# configuración de URLs cuando el sitio corre bajo ASGI (asgi.py pone
+# FORD_VISTAS_ASYNC=1); bajo WSGI se siguen usando las de views.py.
+#
+# Mientras una vista async espera a la base o a que el cliente reciba un
+# trozo de la exportación, el proceso atiende otras peticiones: un cliente
+# lento ya no ocupa un hilo del servidor durante toda la descarga.
+#
+# Las plantillas no pueden consultar la base desde una vista async, así que
+# todo lo que muestran se evalúa antes de render() (las páginas ya son
+# listas; los <select> de los filtros se leen aquí).
+
+
+async def _lista(queryset):
+    return [fila async for fila in queryset]
+
+# ==========================================
+# AUTOCOMPLETADO Y BÚSQUEDA (JSON)
+# ==========================================
+
+@lectura_en_replica
+async def autocompletar_vehiculos(request):
+    return await arespuesta_autocompletar(request, Vehiculo.objects.all(), BUSQUEDA_VEHICULO)
+
+@lectura_en_replica
+async def autocompletar_empleados(request):
+    return await arespuesta_autocompletar(request, Empleado.objects.all(), BUSQUEDA_EMPLEADO)
+
+@lectura_en_replica
+async def autocompletar_clientes(request):
+    return await arespuesta_autocompletar(request, Cliente.objects.all(), BUSQUEDA_CLIENTE)
+
+@lectura_en_replica
+async def autocompletar_proveedores(request):
+    return await arespuesta_autocompletar(request, Proveedor.objects.all(), BUSQUEDA_PROVEEDOR)
+
+@lectura_en_replica
+async def buscar(request):
+    """
+    Igual que views.buscar. Las consultas de texto completo son SQL directo
+    (sin versión async en Django): corren en un hilo con sync_to_async.
+    """
+    tipos = request.GET.getlist('tipo') or None
+    if tipos and not set(tipos) <= set(busqueda.INDICES):
+        return JsonResponse({'error': f"tipo debe ser uno de: {', '.join(busqueda.INDICES)}"}, status=400)
+    resultados = await sync_to_async(busqueda.buscar)(request.GET.get('q', ''), tipos, leer_limite(request))
+    return JsonResponse({'resultados': resultados})
+
+# ==========================================
+# LISTAS
+# ==========================================
+
+@respuesta_condicional('Vehiculo')
+@lectura_en_replica
+async def ver_vehiculos(request):
+    vehiculos, filtros = aplicar_filtros(request, Vehiculo.objects.all(), FILTROS_VEHICULO)
+    orden_actual, orden = elegir_orden(request, ORDENES_VEHICULO, 'id')
+
+    async def contexto_tabla():
+        pagina = await apaginar_por_cursor(request, vehiculos, orden=orden)
+        return {'vehiculos': pagina['objetos'], 'pagina': pagina}
+
+    tabla, acierto = await atabla_cacheada(
+        request, 'vehiculos', 'vehiculos/tabla_vehiculos.html', contexto_tabla
+    )
+    contexto = {
+        'tabla': tabla,
+        'filtros': filtros,
+        'orden_actual': orden_actual
+    }
+    respuesta = render(request, 'vehiculos/ver_vehiculos.html', contexto)
+    respuesta['X-Cache'] = 'HIT' if acierto else 'MISS'
+    return respuesta
+
+
+@respuesta_condicional('Empleado')
+@lectura_en_replica
+async def ver_empleados(request):
+    pagina = await apaginar_por_cursor(request, Empleado.objects.all(), orden=['id'])
+    contexto = {
+        'empleados': pagina['objetos'],
+        'pagina': pagina
+    }
+    return render(request, 'empleados/ver_empleados.html', contexto)
+
+
+@respuesta_condicional('Venta', 'Vehiculo', 'Empleado')
+@lectura_en_replica
+async def ver_ventas(request):
+    ventas, filtros = con_archivo(request, Venta, ('vehiculo', 'empleado'), FILTROS_VENTA)
+    orden_actual, orden = elegir_orden(request, ORDENES_VENTA, 'recientes')
+    pagina = await apaginar_por_cursor(request, ventas, orden=orden)
+    contexto = {
+        'ventas': pagina['objetos'],
+        'pagina': pagina,
+        'filtros': filtros,
+        'orden_actual': orden_actual,
+        'empleados': await _lista(
+            Empleado.objects.order_by('nombre', 'apellido').values('id', 'nombre', 'apellido')
+        )
+    }
+    return render(request, 'ventas/ver_ventas.html', contexto)
+
+
+@respuesta_condicional('Cliente')
+@lectura_en_replica
+async def ver_clientes(request):
+    pagina = await apaginar_por_cursor(request, Cliente.objects.all(), orden=['id'])
+    contexto = {
+        'clientes': pagina['objetos'],
+        'pagina': pagina
+    }
+    return render(request, 'clientes/ver_clientes.html', contexto)
+
+
+@respuesta_condicional('Proveedor')
+@lectura_en_replica
+async def ver_proveedores(request):
+    async def contexto_tabla():
+        pagina = await apaginar_por_cursor(request, Proveedor.objects.all(), orden=['id'])
+        return {'proveedores': pagina['objetos'], 'pagina': pagina}
+
+    tabla, acierto = await atabla_cacheada(
+        request, 'proveedores', 'proveedores/tabla_proveedores.html', contexto_tabla
+    )
+    respuesta = render(request, 'proveedores/ver_proveedores.html', {'tabla': tabla})
+    respuesta['X-Cache'] = 'HIT' if acierto else 'MISS'
+    return respuesta
+
+
+@respuesta_condicional('ServicioMantenimiento', 'Vehiculo', 'Cliente', 'Proveedor')
+@lectura_en_replica
+async def ver_servicios(request):
+    servicios, filtros = con_archivo(
+        request, ServicioMantenimiento, ('vehiculo', 'cliente', 'proveedor'), FILTROS_SERVICIO
+    )
+    orden_actual, orden = elegir_orden(request, ORDENES_SERVICIO, 'recientes')
+    pagina = await apaginar_por_cursor(request, servicios, orden=orden)
+    contexto = {
+        'servicios': pagina['objetos'],
+        'pagina': pagina,
+        'filtros': filtros,
+        'orden_actual': orden_actual,
+        'proveedores': await _lista(
+            Proveedor.objects.order_by('nombre_proveedor').values('id', 'nombre_proveedor')
+        )
+    }
+    return render(request, 'servicios/ver_servicios.html', contexto)
+
+# ==========================================
+# EXPORTACIONES
+# ==========================================
+
+@lectura_en_replica
+async def exportar_ventas(request):
+    """Igual que views.exportar_ventas, leyendo con aiterator()."""
+    ventas, _ = con_archivo(request, Venta, ('vehiculo', 'empleado'), FILTROS_VENTA)
+    return respuesta_exportacion(
+        COLUMNAS_VENTA, afilas_venta(*(v.order_by('fecha_venta', 'id') for v in ventas)),
+        request.GET.get('formato'), 'ventas'
+    )
+
+
+@lectura_en_replica
+async def exportar_servicios(request):
+    """Igual que views.exportar_servicios, leyendo con aiterator()."""
+    servicios, _ = con_archivo(
+        request, ServicioMantenimiento, ('vehiculo', 'cliente', 'proveedor'), FILTROS_SERVICIO
+    )
+    return respuesta_exportacion(
+        COLUMNAS_SERVICIO, afilas_servicio(*(s.order_by('fecha_servicio', 'id') for s in servicios)),
+        request.GET.get('formato'), 'servicios'
+    )
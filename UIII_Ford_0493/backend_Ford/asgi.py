@@ -12,5 +12,8 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend_Ford.settings')
+# Las vistas de lectura async (app_Ford/vistas_async.py); con
+# FORD_VISTAS_ASYNC=0 se usan las mismas vistas que bajo WSGI.
+os.environ.setdefault('FORD_VISTAS_ASYNC', '1')
 
 application = get_asgi_application()
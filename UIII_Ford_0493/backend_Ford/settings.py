@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -41,11 +42,19 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Sólo activo con FORD_INSTRUMENTACION=1 (ver más abajo)
+    'app_Ford.instrumentacion.InstrumentacionMiddleware',
+    'app_Ford.metricas.MetricasMiddleware',
+    # Sólo activo con FORD_PERFILADO_FRACCION o FORD_PERFILADO_SECRETO
+    'app_Ford.perfilado.PerfiladoMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'app_Ford.enrutador.PrimariaTrasEscrituraMiddleware',
+    # Sólo activo con FORD_CONSULTA_LENTA_MS (ver más abajo)
+    'app_Ford.consultas_lentas.ConsultasLentasMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -55,7 +64,9 @@ ROOT_URLCONF = 'backend_Ford.urls'
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
-        'DIRS': [],
+        # La carpeta se llama 'Templates' (con mayúscula); APP_DIRS sólo busca
+        # 'templates', así que en sistemas sensibles a mayúsculas hay que indicarla.
+        'DIRS': [BASE_DIR / 'app_Ford' / 'Templates'],
         'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
@@ -73,12 +84,149 @@ WSGI_APPLICATION = 'backend_Ford.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# Se configura con variables de entorno:
+#   FORD_DB_ENGINE          'sqlite' (por defecto) o 'postgresql'
+#   FORD_DB_NAME            archivo SQLite o nombre de la base PostgreSQL
+#   FORD_DB_USER, FORD_DB_PASSWORD, FORD_DB_HOST, FORD_DB_PORT  (PostgreSQL)
+#   FORD_DB_CONN_MAX_AGE    segundos que se reutiliza una conexión (por defecto 60)
+#   FORD_DB_POOL            '1' para usar el pool de conexiones de psycopg 3
+#   FORD_SQLITE_AJUSTES     '0' para desactivar los PRAGMA de abajo
+#   FORD_SQLITE_BUSY_TIMEOUT  segundos de espera si la base está bloqueada (por defecto 20)
+
+def _entorno_bool(nombre, por_defecto):
+    return os.environ.get(nombre, por_defecto).lower() in ('1', 'true', 'si', 'sí', 'yes')
+
+
+FORD_DB_ENGINE = os.environ.get('FORD_DB_ENGINE', 'sqlite')
+
+if FORD_DB_ENGINE == 'postgresql':
+    _usar_pool = _entorno_bool('FORD_DB_POOL', '0')
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('FORD_DB_NAME', 'ford'),
+            'USER': os.environ.get('FORD_DB_USER', ''),
+            'PASSWORD': os.environ.get('FORD_DB_PASSWORD', ''),
+            'HOST': os.environ.get('FORD_DB_HOST', ''),
+            'PORT': os.environ.get('FORD_DB_PORT', ''),
+            # Con pool, Django pide que las conexiones no sean persistentes:
+            # el pool ya las reutiliza.
+            'CONN_MAX_AGE': 0 if _usar_pool else int(os.environ.get('FORD_DB_CONN_MAX_AGE', 60)),
+            # Verifica la conexión reutilizada antes de usarla (p. ej. tras reiniciar el servidor).
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {'pool': True} if _usar_pool else {},
+        }
     }
-}
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('FORD_DB_NAME', BASE_DIR / 'db.sqlite3'),
+            # Base de pruebas en archivo (no en memoria compartida): las pruebas de
+            # concurrencia necesitan que cada hilo tenga su propia conexión real.
+            'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
+            'OPTIONS': {
+                # busy_timeout de SQLite: espera (en vez de fallar con
+                # "database is locked") si otro proceso está escribiendo.
+                'timeout': int(os.environ.get('FORD_SQLITE_BUSY_TIMEOUT', 20)),
+            },
+        }
+    }
+    if _entorno_bool('FORD_SQLITE_AJUSTES', '1'):
+        DATABASES['default']['OPTIONS'].update({
+            # Se ejecuta al abrir cada conexión:
+            #  - WAL: los lectores no bloquean al escritor ni al revés. El
+            #    db.sqlite3 del repositorio ya está en WAL, así que esto no
+            #    reescribe su encabezado (los -wal/-shm están en .gitignore).
+            #  - synchronous=NORMAL: en WAL es seguro ante caídas del proceso y
+            #    evita un fsync por cada transacción.
+            #  - mmap de 256 MB y ~64 MB de caché de páginas por conexión.
+            'init_command': (
+                'PRAGMA journal_mode=WAL;'
+                'PRAGMA synchronous=NORMAL;'
+                'PRAGMA mmap_size=268435456;'
+                'PRAGMA cache_size=-65536;'
+                'PRAGMA temp_store=MEMORY;'
+            ),
+            # BEGIN IMMEDIATE: la transacción toma el candado de escritura al
+            # empezar; así el busy timeout funciona y no hay "database is locked"
+            # al pasar de lectura a escritura a media transacción.
+            'transaction_mode': 'IMMEDIATE',
+        })
+
+# Réplica de sólo lectura (opcional): FORD_DB_REPLICA_NAME (archivo SQLite o
+# base PostgreSQL) y, para PostgreSQL, FORD_DB_REPLICA_HOST/FORD_DB_REPLICA_PORT.
+# Las vistas de listas, exportaciones y reportes leen de ella
+# (app_Ford/enrutador.py). Con SQLite, 'manage.py replicar_sqlite' la
+# mantiene sincronizada copiando la primaria.
+
+if os.environ.get('FORD_DB_REPLICA_NAME'):
+    DATABASES['replica'] = dict(
+        DATABASES['default'],
+        NAME=os.environ['FORD_DB_REPLICA_NAME'],
+        HOST=os.environ.get('FORD_DB_REPLICA_HOST', DATABASES['default'].get('HOST', '')),
+        PORT=os.environ.get('FORD_DB_REPLICA_PORT', DATABASES['default'].get('PORT', '')),
+        # En las pruebas la réplica es la misma base que la primaria.
+        TEST={'MIRROR': 'default'},
+    )
+
+DATABASE_ROUTERS = ['app_Ford.enrutador.EnrutadorLecturaEscritura']
+
+# Segundos que una sesión lee de la primaria después de escribir
+FORD_VENTANA_PRIMARIA = 5
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Los sellos de las respuestas condicionales (ETag) y las versiones de la
+# caché de listas deben ser los mismos para todos los workers y para los
+# comandos de manage.py que escriben (import_vehiculos, archivar_historial,
+# seed_ford...); si no, un proceso seguiría sirviendo páginas viejas. Por
+# eso la caché es compartida:
+#   FORD_CACHE      'archivos' (por defecto; en FORD_CACHE_DIR),
+#                   'redis' (en FORD_CACHE_URL; requiere el paquete redis) o
+#                   'memoria' (la de cada proceso)
+# Con 'memoria' no se mandan ETag/Last-Modified ni se guardan tablas de las
+# listas; sólo la usa el tablero, cuyos indicadores expiran solos.
+
+FORD_CACHE = os.environ.get('FORD_CACHE', 'archivos')
+if FORD_CACHE == 'redis':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ.get('FORD_CACHE_URL', 'redis://127.0.0.1:6379/1'),
+        }
+    }
+elif FORD_CACHE == 'memoria':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'ford',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get('FORD_CACHE_DIR', str(BASE_DIR / 'cache')),
+        }
+    }
+FORD_CACHE_COMPARTIDA = FORD_CACHE != 'memoria'
+
+# Segundos que vive una tabla renderizada en la caché de listas (app_Ford/cache_listas.py)
+FORD_CACHE_LISTAS_SEGUNDOS = 300
+
+# Indicadores de la página de inicio (app_Ford/tablero.py): segundos que se
+# consideran frescos, unidades a partir de las cuales un vehículo tiene poco
+# stock y si se recalculan en un hilo (0 = en la petición, sólo para pruebas).
+FORD_TABLERO_SEGUNDOS = int(os.environ.get('FORD_TABLERO_SEGUNDOS', '30'))
+FORD_TABLERO_STOCK_BAJO = 2
+FORD_TABLERO_SEGUNDO_PLANO = _entorno_bool('FORD_TABLERO_SEGUNDO_PLANO', '1')
+
+# Bajo ASGI (asgi.py pone FORD_VISTAS_ASYNC=1) las listas, exportaciones,
+# búsqueda y autocompletado usan las vistas async de app_Ford/vistas_async.py.
+if _entorno_bool('FORD_VISTAS_ASYNC', '0'):
+    ROOT_URLCONF = 'backend_Ford.urls_asgi'
 
 
 # Password validation
@@ -121,3 +269,116 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# Paginación por cursor de las vistas ver_* (app_Ford/paginacion.py).
+# Se puede cambiar por petición con ?tamano=N, hasta el máximo.
+
+FORD_TAMANO_PAGINA = 50
+FORD_TAMANO_PAGINA_MAXIMO = 500
+
+# Máximo de ventas + servicios por petición a la API de lotes (app_Ford/lotes.py)
+FORD_API_LOTE_MAXIMO = 500
+
+# Segundos hacia atrás del corte de las fotos de inventario (app_Ford/inventario.py):
+# más que la transacción más larga que registre movimientos.
+FORD_INVENTARIO_MARGEN = 300
+
+# Días que las ventas y servicios se quedan en las tablas de uso diario; los
+# más antiguos los mueve 'manage.py archivar_historial' a las tablas de
+# archivo (app_Ford/archivo.py).
+FORD_ARCHIVO_DIAS = int(os.environ.get('FORD_ARCHIVO_DIAS', '365'))
+
+# Horas que se guarda cada clave de idempotencia de las altas de ventas y
+# servicios (app_Ford/idempotencia.py); las más viejas las borra
+# 'manage.py purgar_idempotencia'.
+FORD_IDEMPOTENCIA_HORAS = int(os.environ.get('FORD_IDEMPOTENCIA_HORAS', '24'))
+
+
+# Instrumentación por petición (app_Ford/instrumentacion.py): consultas,
+# tiempo de base de datos y de plantillas en la cabecera Server-Timing y en
+# un log JSON rotativo.
+#   FORD_INSTRUMENTACION      '1' para activarla
+#   FORD_INSTRUMENTACION_LOG  archivo del log (por defecto peticiones.log)
+
+FORD_INSTRUMENTACION = _entorno_bool('FORD_INSTRUMENTACION', '0')
+# Veces que una misma consulta debe repetirse para marcarla como N+1
+FORD_INSTRUMENTACION_REPETIDAS = 5
+
+# Métricas para Prometheus en /metrics (app_Ford/metricas.py).
+#   FORD_METRICAS             '0' para desactivarlas
+#   FORD_METRICAS_DIR         directorio compartido entre workers; sin él cada
+#                             proceso sólo reporta lo suyo. Vaciarlo al reiniciar.
+
+FORD_METRICAS = _entorno_bool('FORD_METRICAS', '1')
+FORD_METRICAS_DIR = os.environ.get('FORD_METRICAS_DIR') or None
+# Segundos entre fotos de las métricas de cada proceso en FORD_METRICAS_DIR
+FORD_METRICAS_INTERVALO = 5
+
+# Perfilado por muestreo con cProfile (app_Ford/perfilado.py).
+#   FORD_PERFILADO_FRACCION   fracción de peticiones a perfilar (0.01 = 1 %)
+#   FORD_PERFILADO_SECRETO    perfila las peticiones con 'X-Ford-Perfil: <secreto>'
+#   FORD_PERFILADO_DIR        directorio de los .prof (por defecto perfiles/)
+# 'manage.py fusionar_perfiles' los suma por vista.
+
+FORD_PERFILADO_FRACCION = float(os.environ.get('FORD_PERFILADO_FRACCION', '0'))
+FORD_PERFILADO_SECRETO = os.environ.get('FORD_PERFILADO_SECRETO', '')
+FORD_PERFILADO_DIR = os.environ.get('FORD_PERFILADO_DIR', str(BASE_DIR / 'perfiles'))
+# Tope de archivos en el directorio (los más viejos se borran)
+FORD_PERFILADO_MAXIMO = 200
+# Cada cuántos milisegundos se muestrea la pila para el flamegraph (0: no se muestrea)
+FORD_PERFILADO_PILAS_MS = 2
+
+# Registro de consultas lentas (app_Ford/consultas_lentas.py): toda consulta
+# que tarde FORD_CONSULTA_LENTA_MS o más se escribe con su plan de ejecución.
+#   FORD_CONSULTA_LENTA_MS    umbral en milisegundos (sin definir: apagado)
+#   FORD_CONSULTAS_LENTAS_LOG archivo del log (por defecto consultas_lentas.log)
+# 'manage.py resumir_consultas_lentas' resume el log.
+
+FORD_CONSULTA_LENTA_MS = (
+    float(os.environ['FORD_CONSULTA_LENTA_MS']) if os.environ.get('FORD_CONSULTA_LENTA_MS') else None
+)
+FORD_CONSULTAS_LENTAS_LOG = os.environ.get(
+    'FORD_CONSULTAS_LENTAS_LOG', str(BASE_DIR / 'consultas_lentas.log')
+)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'mensaje': {'format': '%(message)s'},
+    },
+    'handlers': {
+        'peticiones': {
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': os.environ.get('FORD_INSTRUMENTACION_LOG', str(BASE_DIR / 'peticiones.log')),
+            'maxBytes': 10 * 1024 * 1024,
+            'backupCount': 5,
+            'encoding': 'utf-8',
+            # El archivo se crea con la primera línea, no al arrancar.
+            'delay': True,
+            'formatter': 'mensaje',
+        },
+        'consultas_lentas': {
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': FORD_CONSULTAS_LENTAS_LOG,
+            'maxBytes': 10 * 1024 * 1024,
+            'backupCount': 5,
+            'encoding': 'utf-8',
+            'delay': True,
+            'formatter': 'mensaje',
+        },
+    },
+    'loggers': {
+        'app_Ford.instrumentacion': {
+            'handlers': ['peticiones'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+        'app_Ford.consultas_lentas': {
+            'handlers': ['consultas_lentas'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
+}
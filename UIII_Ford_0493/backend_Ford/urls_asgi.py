@@ -0,0 +1,11 @@
+# backend_Ford/urls_asgi.py
+# Igual que backend_Ford/urls.py, con las vistas de lectura async de
+# app_Ford (ver app_Ford/urls_asgi.py). settings.py la elige con
+# FORD_VISTAS_ASYNC=1, que asgi.py pone por defecto.
+from django.contrib import admin
+from django.urls import path, include
+
+urlpatterns = [
+    path('admin/', admin.site.urls),
+    path('', include('app_Ford.urls_asgi')),
+]
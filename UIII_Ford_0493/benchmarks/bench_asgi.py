@@ -0,0 +1,237 @@
+"""
+Benchmark: clientes lentos concurrentes atendidos por un proceso WSGI con
+hilos contra un proceso ASGI con las vistas async (app_Ford/vistas_async.py).
+
+Uso (desde la carpeta del proyecto, donde está manage.py):
+    python benchmarks/bench_asgi.py
+    python benchmarks/bench_asgi.py --clientes 200 --hilos 8 --kb-por-segundo 256
+    python benchmarks/bench_asgi.py --ruta '/ventas/ver/?tamano=20' --peticiones 3
+
+Se crea una base SQLite temporal (nunca se toca db.sqlite3) llenada con
+'manage.py seed_ford --scale N'. Para cada modo, un proceso hijo lanza
+--clientes clientes al mismo tiempo; cada uno pide --peticiones veces la
+--ruta (por omisión la exportación de las ventas del último año) y la
+recibe a --kb-por-segundo, como un teléfono con mala señal:
+
+    wsgi -> WSGIHandler de Django con --hilos hilos (como gunicorn
+            --threads): cada hilo queda ocupado mientras su cliente recibe.
+    asgi -> get_asgi_application() con FORD_VISTAS_ASYNC=1 en un solo
+            event loop: mientras un cliente recibe, el proceso atiende a
+            los demás.
+
+Los clientes se simulan dentro del proceso (sin red): el envío de cada trozo
+espera len(trozo) / velocidad. Se reporta el tiempo total, peticiones por
+segundo y la latencia p50/p95/p99 desde que el cliente llega hasta que
+termina de recibir.
+"""
+import argparse
+import asyncio
+import json
+import os
+import queue
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from urllib.parse import urlsplit
+from wsgiref.util import setup_testing_defaults
+
+PROYECTO = Path(__file__).resolve().parent.parent
+MODOS = {
+    'wsgi': {'FORD_VISTAS_ASYNC': '0'},
+    'asgi': {'FORD_VISTAS_ASYNC': '1'},
+}
+
+
+def percentil(valores, p):
+    """Percentil por rango más cercano; 'valores' debe venir ordenado."""
+    indice = max(0, min(len(valores) - 1, -(-len(valores) * p // 100) - 1))
+    return valores[int(indice)]
+
+
+def medir_wsgi(args, ruta):
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.db import connections
+
+    aplicacion = WSGIHandler()
+    partes = urlsplit(ruta)
+    velocidad = args.kb_por_segundo * 1024
+    pendientes = queue.Queue()
+    latencias, tamanos, errores = [], [], []
+    candado = threading.Lock()
+
+    def atender():
+        while True:
+            pedido = pendientes.get()
+            if pedido is None:
+                connections.close_all()
+                return
+            llegada, terminado = pedido
+            entorno = {'PATH_INFO': partes.path, 'QUERY_STRING': partes.query, 'SERVER_NAME': 'localhost'}
+            setup_testing_defaults(entorno)
+            estado = []
+            respuesta = aplicacion(entorno, lambda status, headers: estado.append(status))
+            tamano = 0
+            try:
+                for trozo in respuesta:
+                    tamano += len(trozo)
+                    # El hilo queda bloqueado mientras el cliente recibe.
+                    time.sleep(len(trozo) / velocidad)
+            finally:
+                respuesta.close()
+            with candado:
+                latencias.append(time.perf_counter() - llegada)
+                tamanos.append(tamano)
+                if not estado[0].startswith('200'):
+                    errores.append(estado[0])
+            terminado.set()
+
+    hilos = [threading.Thread(target=atender) for _ in range(args.hilos)]
+    for hilo in hilos:
+        hilo.start()
+    inicio = time.perf_counter()
+
+    # Cada cliente pide de nuevo en cuanto termina la respuesta anterior.
+    def cliente():
+        for _ in range(args.peticiones):
+            terminado = threading.Event()
+            pendientes.put((time.perf_counter(), terminado))
+            terminado.wait()
+
+    clientes = [threading.Thread(target=cliente) for _ in range(args.clientes)]
+    for hilo in clientes:
+        hilo.start()
+    for hilo in clientes:
+        hilo.join()
+    total = time.perf_counter() - inicio
+    for _ in hilos:
+        pendientes.put(None)
+    for hilo in hilos:
+        hilo.join()
+    return total, latencias, tamanos, errores
+
+
+def medir_asgi(args, ruta):
+    from django.core.asgi import get_asgi_application
+
+    aplicacion = get_asgi_application()
+    partes = urlsplit(ruta)
+    velocidad = args.kb_por_segundo * 1024
+    latencias, tamanos, errores = [], [], []
+
+    async def una_peticion():
+        llegada = time.perf_counter()
+        alcance = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+            'method': 'GET', 'scheme': 'http', 'path': partes.path, 'raw_path': partes.path.encode(),
+            'query_string': partes.query.encode(), 'root_path': '',
+            'headers': [(b'host', b'localhost')],
+            'client': ('127.0.0.1', 50000), 'server': ('localhost', 80),
+        }
+        cuerpo_enviado = asyncio.Event()
+        recibido = {'estado': None, 'tamano': 0}
+
+        async def recibir():
+            if not cuerpo_enviado.is_set():
+                cuerpo_enviado.set()
+                return {'type': 'http.request', 'body': b'', 'more_body': False}
+            # El cliente no se desconecta.
+            await asyncio.Event().wait()
+
+        async def enviar(mensaje):
+            if mensaje['type'] == 'http.response.start':
+                recibido['estado'] = mensaje['status']
+            elif mensaje['type'] == 'http.response.body':
+                recibido['tamano'] += len(mensaje.get('body', b''))
+                await asyncio.sleep(len(mensaje.get('body', b'')) / velocidad)
+
+        await aplicacion(alcance, recibir, enviar)
+        latencias.append(time.perf_counter() - llegada)
+        tamanos.append(recibido['tamano'])
+        if recibido['estado'] != 200:
+            errores.append(recibido['estado'])
+
+    async def cliente():
+        for _ in range(args.peticiones):
+            await una_peticion()
+
+    async def todos():
+        await asyncio.gather(*(cliente() for _ in range(args.clientes)))
+
+    inicio = time.perf_counter()
+    asyncio.run(todos())
+    return time.perf_counter() - inicio, latencias, tamanos, errores
+
+
+def trabajador(args):
+    """Se ejecuta en un proceso hijo con FORD_VISTAS_ASYNC ya puesto en el entorno."""
+    sys.path.insert(0, str(PROYECTO))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend_Ford.settings')
+    import django
+    django.setup()
+    from django.urls import reverse
+
+    ruta = args.ruta or f"{reverse('exportar_ventas')}?desde={date.today() - timedelta(days=365)}"
+    medir = medir_asgi if args.modo == 'asgi' else medir_wsgi
+    total, latencias, tamanos, errores = medir(args, ruta)
+    latencias.sort()
+    print(json.dumps({
+        'ruta': ruta,
+        'total_s': round(total, 2),
+        'peticiones': len(latencias),
+        'peticiones_por_segundo': round(len(latencias) / total, 1),
+        'p50_ms': round(percentil(latencias, 50) * 1000),
+        'p95_ms': round(percentil(latencias, 95) * 1000),
+        'p99_ms': round(percentil(latencias, 99) * 1000),
+        'kb_promedio': round(sum(tamanos) / max(1, len(tamanos)) / 1024, 1),
+        'errores': len(errores),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=float, default=0.2, help='Escala de seed_ford.')
+    parser.add_argument('--clientes', type=int, default=64, help='Clientes lentos concurrentes.')
+    parser.add_argument('--peticiones', type=int, default=1, help='Peticiones de cada cliente.')
+    parser.add_argument('--hilos', type=int, default=8, help='Hilos del proceso WSGI.')
+    parser.add_argument('--kb-por-segundo', type=float, default=64, help='Velocidad de cada cliente.')
+    parser.add_argument('--ruta', default=None, help='Ruta a pedir (por omisión la exportación de ventas del último año).')
+    parser.add_argument('--modo', choices=MODOS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.modo:
+        trabajador(args)
+        return
+
+    resultados = {}
+    with tempfile.TemporaryDirectory() as carpeta:
+        env = dict(os.environ, FORD_DB_ENGINE='sqlite', FORD_DB_NAME=str(Path(carpeta) / 'asgi.sqlite3'))
+        manage = [sys.executable, str(PROYECTO / 'manage.py')]
+        subprocess.run(manage + ['migrate', '-v', '0'], env=env, cwd=PROYECTO, check=True)
+        subprocess.run(manage + ['seed_ford', '--scale', str(args.scale)], env=env, cwd=PROYECTO,
+                       check=True, capture_output=True)
+        for modo, entorno in MODOS.items():
+            opciones = ['--modo', modo, '--clientes', str(args.clientes), '--peticiones', str(args.peticiones),
+                        '--hilos', str(args.hilos), '--kb-por-segundo', str(args.kb_por_segundo)]
+            if args.ruta:
+                opciones += ['--ruta', args.ruta]
+            salida = subprocess.run(
+                [sys.executable, __file__] + opciones,
+                env=dict(env, **entorno), cwd=PROYECTO, capture_output=True, text=True, check=True,
+            )
+            resultados[modo] = json.loads(salida.stdout.strip().splitlines()[-1])
+
+    primero = next(iter(resultados.values()))
+    print(f"{primero['ruta']} ({primero['kb_promedio']} KB): {args.clientes} clientes a "
+          f"{args.kb_por_segundo:g} KB/s, {args.peticiones} peticiones cada uno, {args.hilos} hilos WSGI\n")
+    print(f"{'':6}{'total s':>9}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errores':>9}")
+    for modo, r in resultados.items():
+        print(f"{modo:6}{r['total_s']:>9}{r['peticiones_por_segundo']:>9}{r['p50_ms']:>9}"
+              f"{r['p95_ms']:>9}{r['p99_ms']:>9}{r['errores']:>9}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark de la búsqueda global (app_Ford/busqueda.py): latencia de
+búsquedas típicas con un millón de clientes.
+
+Uso (desde la carpeta del proyecto, donde está manage.py):
+    python benchmarks/bench_busqueda.py
+    python benchmarks/bench_busqueda.py --clientes 200000 --repeticiones 200
+
+Se usa una base SQLite temporal (nunca se toca db.sqlite3). Los clientes y
+vehículos se insertan con SQL directo para llenar rápido; los índices FTS5
+los mantienen los triggers, igual que con el ORM. Se reporta p50/p95/máximo
+de cada búsqueda, sin pasar por HTTP.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROYECTO = Path(__file__).resolve().parent.parent
+
+# nombre -> (texto buscado, tipo)
+BUSQUEDAS = {
+    'nombre (prefijo corto)': ('mar', 'clientes'),
+    'nombre y apellido': ('maría lóp', 'clientes'),
+    'sin acentos': ('jose hernandez', 'clientes'),
+    'teléfono': ('55123', 'clientes'),
+    'correo': ('cliente12345', 'clientes'),
+    'serie': ('1ft000000000001', 'vehiculos'),
+    'modelo': ('lobo', 'vehiculos'),
+    'sin resultados': ('zzzz', 'clientes'),
+}
+
+
+def llenar(clientes, vehiculos, lote=50000):
+    from django.db import connection, transaction
+    from app_Ford.management.commands.seed_ford import APELLIDOS, COLORES, MODELOS_FORD, NOMBRES
+
+    azar = random.Random(42)
+    with transaction.atomic(), connection.cursor() as cursor:
+        for inicio in range(0, clientes, lote):
+            cursor.executemany(
+                'INSERT INTO "app_Ford_cliente" (nombre, apellido, telefono, correo_electronico, fecha_registro) '
+                "VALUES (%s, %s, %s, %s, '2024-01-01')",
+                [(azar.choice(NOMBRES), f'{azar.choice(APELLIDOS)} {azar.choice(APELLIDOS)}',
+                  f'55{azar.randrange(10 ** 8):08d}', f'cliente{i}@correo.mx')
+                 for i in range(inicio, min(inicio + lote, clientes))],
+            )
+        cursor.executemany(
+            'INSERT INTO "app_Ford_vehiculo" (marca, modelo, anio, color, numero_serie, precio, cantidad_disponible) '
+            'VALUES (%s, %s, %s, %s, %s, %s, %s)',
+            [('Ford', azar.choice(list(MODELOS_FORD)), 2024, azar.choice(COLORES), f'1FT{i:014d}', 500000, 1)
+             for i in range(vehiculos)],
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clientes', type=int, default=1000000)
+    parser.add_argument('--vehiculos', type=int, default=100000)
+    parser.add_argument('--repeticiones', type=int, default=100)
+    args = parser.parse_args()
+
+    carpeta = tempfile.TemporaryDirectory()
+    os.environ['FORD_DB_ENGINE'] = 'sqlite'
+    os.environ['FORD_DB_NAME'] = str(Path(carpeta.name) / 'bench.sqlite3')
+    sys.path.insert(0, str(PROYECTO))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend_Ford.settings')
+    import django
+    django.setup()
+
+    from django.core.management import call_command
+    from app_Ford import busqueda
+
+    call_command('migrate', verbosity=0)
+    inicio = time.perf_counter()
+    llenar(args.clientes, args.vehiculos)
+    print(f'{args.clientes} clientes y {args.vehiculos} vehículos en {time.perf_counter() - inicio:.1f}s\n')
+
+    print(f"{'búsqueda':26}{'resultados':>11}{'p50 ms':>9}{'p95 ms':>9}{'máx ms':>9}")
+    for nombre, (texto, tipo) in BUSQUEDAS.items():
+        tiempos = []
+        for _ in range(args.repeticiones):
+            inicio = time.perf_counter()
+            resultados = busqueda.buscar(texto, [tipo])
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+        tiempos.sort()
+        p95 = tiempos[max(0, -(-len(tiempos) * 95 // 100) - 1)]
+        print(f"{nombre:26}{len(resultados[tipo]):>11}{tiempos[len(tiempos) // 2]:>9.2f}{p95:>9.2f}{tiempos[-1]:>9.2f}")
+    carpeta.cleanup()
+
+
+if __name__ == '__main__':
+    main()
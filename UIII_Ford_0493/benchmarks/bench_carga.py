@@ -0,0 +1,252 @@
+"""
+Benchmark de carga: recorre cada URL de app_Ford/urls.py con varios clientes
+concurrentes y reporta latencia p50/p95/p99 y peticiones por segundo. El
+resultado se guarda en JSON para comparar entre commits.
+
+Uso (desde la carpeta del proyecto, donde está manage.py):
+    python benchmarks/bench_carga.py --salida base.json
+    python benchmarks/bench_carga.py --scale 5 --concurrencia 8 --peticiones 200
+    python benchmarks/bench_carga.py --comparar base.json --salida nuevo.json
+    python benchmarks/bench_carga.py --db /ruta/seed.sqlite3 --servidor http://127.0.0.1:8000
+
+Por omisión se crea una base SQLite temporal (nunca se toca db.sqlite3) y
+se llena con 'manage.py seed_ford --scale N'. Con --db se usa una base ya
+generada. Sin --servidor las peticiones van al Client de Django dentro de
+este proceso (mide la aplicación sin red); con --servidor se mandan por
+HTTP a un servidor ya levantado sobre la misma base.
+
+Sólo se hacen GET: las URLs de borrado y la API de lotes se omiten. Las
+rutas con <int:id> usan ids existentes del modelo correspondiente y las
+exportaciones se leen completas.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+PROYECTO = Path(__file__).resolve().parent.parent
+
+# Sólo aceptan POST.
+OMITIDAS = {'api_lote', 'acciones_vehiculos', 'acciones_ventas', 'acciones_proveedores'}
+# prefijo del nombre de URL -> modelo cuyos ids se usan en <int:id>
+MODELO_POR_PREFIJO = {
+    'vehiculo': 'Vehiculo', 'empleado': 'Empleado', 'venta': 'Venta',
+    'cliente': 'Cliente', 'proveedor': 'Proveedor', 'servicio': 'ServicioMantenimiento',
+}
+PARAMETROS = {nombre: '?q=fo' for nombre in (
+    'autocompletar_vehiculos', 'autocompletar_empleados', 'autocompletar_clientes', 'autocompletar_proveedores',
+    'buscar',
+)}
+
+
+def percentil(valores, p):
+    """Percentil por rango más cercano; 'valores' debe venir ordenado."""
+    if not valores:
+        return None
+    indice = max(0, min(len(valores) - 1, -(-len(valores) * p // 100) - 1))
+    return valores[int(indice)]
+
+
+def commit_actual():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=PROYECTO, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def rutas_a_medir():
+    """[(nombre, ruta)] de cada URL de la app que se puede pedir con GET."""
+    from django.urls import reverse
+    from app_Ford import models
+    from app_Ford.urls import urlpatterns
+
+    rutas = []
+    for patron in urlpatterns:
+        nombre = patron.name
+        if not nombre or nombre in OMITIDAS or nombre.startswith('borrar_'):
+            continue
+        if 'id' not in patron.pattern.converters:
+            rutas.append((nombre, reverse(nombre) + PARAMETROS.get(nombre, '')))
+            continue
+        modelo = getattr(models, MODELO_POR_PREFIJO[nombre.split('_', 1)[1]])
+        primero = modelo.objects.order_by('id').values_list('id', flat=True).first()
+        if primero is None:
+            continue
+        rutas.append((nombre, reverse(nombre, args=[primero])))
+    return rutas
+
+
+def cliente_en_proceso():
+    from django.test import Client
+    locales = threading.local()
+
+    def pedir(ruta):
+        if not hasattr(locales, 'cliente'):
+            locales.cliente = Client(SERVER_NAME='localhost')
+        respuesta = locales.cliente.get(ruta)
+        if respuesta.streaming:
+            cuerpo = b''.join(respuesta.streaming_content)
+        else:
+            cuerpo = respuesta.content
+        return respuesta.status_code, len(cuerpo)
+    return pedir
+
+
+def cliente_http(servidor):
+    def pedir(ruta):
+        try:
+            with urllib.request.urlopen(servidor.rstrip('/') + ruta, timeout=60) as respuesta:
+                return respuesta.status, len(respuesta.read())
+        except urllib.error.HTTPError as error:
+            return error.code, len(error.read())
+    return pedir
+
+
+def medir_ruta(pedir, ruta, concurrencia, peticiones):
+    """Lanza 'peticiones' GET repartidos en 'concurrencia' hilos."""
+    latencias = []
+    errores = []
+    bytes_totales = [0]
+    candado = threading.Lock()
+    pendientes = iter(range(peticiones))
+
+    def trabajador():
+        while True:
+            with candado:
+                if next(pendientes, None) is None:
+                    return
+            inicio = time.perf_counter()
+            try:
+                estado, tamano = pedir(ruta)
+            except Exception as error:  # se reporta, no detiene el benchmark
+                estado, tamano = repr(error), 0
+            transcurrido = time.perf_counter() - inicio
+            with candado:
+                latencias.append(transcurrido)
+                bytes_totales[0] += tamano
+                if not (isinstance(estado, int) and estado < 400):
+                    errores.append(estado)
+
+    hilos = [threading.Thread(target=trabajador) for _ in range(concurrencia)]
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    total = time.perf_counter() - inicio
+
+    latencias.sort()
+    return {
+        'ruta': ruta,
+        'peticiones': len(latencias),
+        'errores': len(errores),
+        'primer_error': str(errores[0]) if errores else None,
+        'p50_ms': round(percentil(latencias, 50) * 1000, 2),
+        'p95_ms': round(percentil(latencias, 95) * 1000, 2),
+        'p99_ms': round(percentil(latencias, 99) * 1000, 2),
+        'peticiones_por_segundo': round(len(latencias) / total, 1) if total else None,
+        'bytes_promedio': bytes_totales[0] // max(1, len(latencias)),
+    }
+
+
+def comparar(anterior, actual):
+    print(f"\nComparación contra {anterior['metadatos'].get('commit') or 'la base anterior'}:")
+    print(f"{'vista':28}{'p50':>10}{'p95':>10}{'p99':>10}{'req/s':>10}")
+
+    def cambio(antes, ahora):
+        if not antes or ahora is None:
+            return '-'
+        return f'{(ahora - antes) / antes * 100:+.0f}%'
+
+    for nombre, r in actual['vistas'].items():
+        previo = anterior['vistas'].get(nombre)
+        if previo is None:
+            print(f'{nombre:28}{"(nueva)":>10}')
+            continue
+        print(f"{nombre:28}"
+              f"{cambio(previo['p50_ms'], r['p50_ms']):>10}{cambio(previo['p95_ms'], r['p95_ms']):>10}"
+              f"{cambio(previo['p99_ms'], r['p99_ms']):>10}"
+              f"{cambio(previo['peticiones_por_segundo'], r['peticiones_por_segundo']):>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=float, default=1, help='Escala de seed_ford para la base temporal.')
+    parser.add_argument('--db', default=None, help='Base SQLite ya generada (no se siembra).')
+    parser.add_argument('--servidor', default=None, help='URL de un servidor levantado, p. ej. http://127.0.0.1:8000')
+    parser.add_argument('--concurrencia', type=int, default=4)
+    parser.add_argument('--peticiones', type=int, default=100, help='Peticiones por URL.')
+    parser.add_argument('--calentamiento', type=int, default=3, help='Peticiones por URL que no se miden.')
+    parser.add_argument('--vista', action='append', help='Sólo esta vista (se puede repetir).')
+    parser.add_argument('--salida', default=None, help='Guarda los resultados en JSON.')
+    parser.add_argument('--comparar', default=None, help='JSON de una corrida anterior.')
+    args = parser.parse_args()
+
+    carpeta = None
+    os.environ['FORD_DB_ENGINE'] = 'sqlite'
+    if args.db:
+        os.environ['FORD_DB_NAME'] = str(Path(args.db).resolve())
+    else:
+        carpeta = tempfile.TemporaryDirectory()
+        os.environ['FORD_DB_NAME'] = str(Path(carpeta.name) / 'carga.sqlite3')
+    sys.path.insert(0, str(PROYECTO))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend_Ford.settings')
+    import django
+    django.setup()
+
+    from django.core.management import call_command
+
+    if carpeta is not None:
+        call_command('migrate', verbosity=0)
+        call_command('seed_ford', scale=args.scale, stdout=io.StringIO())
+
+    pedir = cliente_http(args.servidor) if args.servidor else cliente_en_proceso()
+    rutas = rutas_a_medir()
+    if args.vista:
+        rutas = [(nombre, ruta) for nombre, ruta in rutas if nombre in args.vista]
+
+    resultados = {
+        'metadatos': {
+            'commit': commit_actual(),
+            'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'scale': None if args.db else args.scale,
+            'db': args.db,
+            'servidor': args.servidor,
+            'concurrencia': args.concurrencia,
+            'peticiones': args.peticiones,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+        },
+        'vistas': {},
+    }
+    print(f"{'vista':28}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>9}{'errores':>9}")
+    for nombre, ruta in rutas:
+        for _ in range(args.calentamiento):
+            pedir(ruta)
+        r = medir_ruta(pedir, ruta, args.concurrencia, args.peticiones)
+        resultados['vistas'][nombre] = r
+        print(f"{nombre:28}{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}"
+              f"{r['peticiones_por_segundo']:>9.1f}{r['errores']:>9}")
+
+    if args.salida:
+        Path(args.salida).write_text(json.dumps(resultados, indent=2, ensure_ascii=False), encoding='utf-8')
+        print(f'\nResultados en {args.salida}')
+    if args.comparar:
+        comparar(json.loads(Path(args.comparar).read_text(encoding='utf-8')), resultados)
+    if carpeta is not None:
+        carpeta.cleanup()
+
+
+if __name__ == '__main__':
+    main()
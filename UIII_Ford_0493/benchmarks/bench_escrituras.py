@@ -0,0 +1,136 @@
+"""
+Benchmark: registro de ventas concurrente con y sin los ajustes de SQLite.
+
+Uso (desde la carpeta del proyecto, donde está manage.py):
+    python benchmarks/bench_escrituras.py
+    python benchmarks/bench_escrituras.py --vendedores 16 --lectores 8 --segundos 10
+
+Para cada configuración se crea una base SQLite temporal (nunca se toca
+db.sqlite3), se lanzan hilos "vendedores" que hacen POST a agregar_venta y
+hilos "lectores" que consultan ver_ventas al mismo tiempo, y se mide:
+ventas por segundo, lecturas por segundo y errores "database is locked".
+
+    antes   -> FORD_SQLITE_AJUSTES=0, busy timeout de 5 s (valores originales)
+    despues -> WAL, synchronous=NORMAL, BEGIN IMMEDIATE, busy timeout 20 s
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+PROYECTO = Path(__file__).resolve().parent.parent
+
+CONFIGURACIONES = {
+    'antes': {'FORD_SQLITE_AJUSTES': '0', 'FORD_SQLITE_BUSY_TIMEOUT': '5'},
+    'despues': {'FORD_SQLITE_AJUSTES': '1', 'FORD_SQLITE_BUSY_TIMEOUT': '20'},
+}
+
+
+def trabajador(args):
+    """Se ejecuta en un proceso hijo con la configuración ya puesta en el entorno."""
+    sys.path.insert(0, str(PROYECTO))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend_Ford.settings')
+    import django
+    django.setup()
+
+    from django.core.management import call_command
+    from django.db import connection, OperationalError
+    from django.test import Client
+    from django.urls import reverse
+    from app_Ford.models import Vehiculo
+
+    call_command('migrate', verbosity=0)
+    vehiculo = Vehiculo.objects.create(
+        marca='Ford', modelo='Lobo', anio=2024, numero_serie='BENCH-1',
+        precio=500000, cantidad_disponible=10 ** 9,
+    )
+    connection.close()
+
+    fin = time.perf_counter() + args.segundos
+    conteo = {'ventas': 0, 'lecturas': 0, 'bloqueos': 0}
+    candado = threading.Lock()
+
+    def sumar(clave):
+        with candado:
+            conteo[clave] += 1
+
+    def vendedor():
+        cliente = Client(SERVER_NAME='localhost')
+        datos = {'vehiculo': vehiculo.id, 'cliente_nombre': 'Bench', 'total': '100'}
+        try:
+            while time.perf_counter() < fin:
+                try:
+                    respuesta = cliente.post(reverse('agregar_venta'), datos)
+                    sumar('ventas' if respuesta.status_code == 302 else 'bloqueos')
+                except OperationalError:
+                    sumar('bloqueos')
+        finally:
+            connection.close()
+
+    def lector():
+        cliente = Client(SERVER_NAME='localhost')
+        try:
+            while time.perf_counter() < fin:
+                try:
+                    cliente.get(reverse('ver_ventas'))
+                    sumar('lecturas')
+                except OperationalError:
+                    sumar('bloqueos')
+        finally:
+            connection.close()
+
+    hilos = [threading.Thread(target=vendedor) for _ in range(args.vendedores)]
+    hilos += [threading.Thread(target=lector) for _ in range(args.lectores)]
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    transcurrido = time.perf_counter() - inicio
+
+    print(json.dumps({
+        'ventas_por_segundo': round(conteo['ventas'] / transcurrido, 1),
+        'lecturas_por_segundo': round(conteo['lecturas'] / transcurrido, 1),
+        'errores_bloqueo': conteo['bloqueos'],
+        'ventas': conteo['ventas'],
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--vendedores', type=int, default=8)
+    parser.add_argument('--lectores', type=int, default=4)
+    parser.add_argument('--segundos', type=float, default=5)
+    parser.add_argument('--trabajador', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.trabajador:
+        trabajador(args)
+        return
+
+    resultados = {}
+    for nombre, entorno in CONFIGURACIONES.items():
+        with tempfile.TemporaryDirectory() as carpeta:
+            env = dict(os.environ, FORD_DB_ENGINE='sqlite',
+                       FORD_DB_NAME=str(Path(carpeta) / 'bench.sqlite3'), **entorno)
+            salida = subprocess.run(
+                [sys.executable, __file__, '--trabajador',
+                 '--vendedores', str(args.vendedores), '--lectores', str(args.lectores),
+                 '--segundos', str(args.segundos)],
+                env=env, cwd=PROYECTO, capture_output=True, text=True, check=True,
+            )
+            resultados[nombre] = json.loads(salida.stdout.strip().splitlines()[-1])
+
+    print(f"{args.vendedores} vendedores, {args.lectores} lectores, {args.segundos}s por configuración\n")
+    print(f"{'':10}{'ventas/s':>12}{'lecturas/s':>12}{'bloqueos':>10}")
+    for nombre, r in resultados.items():
+        print(f"{nombre:10}{r['ventas_por_segundo']:>12}{r['lecturas_por_segundo']:>12}{r['errores_bloqueo']:>10}")
+
+
+if __name__ == '__main__':
+    main()
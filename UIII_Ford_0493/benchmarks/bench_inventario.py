@@ -0,0 +1,134 @@
+"""
+Benchmark del stock a una fecha: sumar toda la bitácora de inventario del
+vehículo contra partir de la última foto de saldo (inventario.stock_al).
+
+Uso (desde la carpeta del proyecto, donde está manage.py):
+    python benchmarks/bench_inventario.py
+    python benchmarks/bench_inventario.py --vehiculos 200 --movimientos 10000 --dias-entre-fotos 1
+
+Se usa una base SQLite temporal (nunca se toca db.sqlite3). Se crean
+--vehiculos vehículos con --movimientos movimientos cada uno repartidos en
+tres años, se sacan fotos cada --dias-entre-fotos días con
+inventario.compactar() y se mide el tiempo por consulta de cada forma en
+fechas al azar, para un vehículo (stock_al) y para todo el inventario
+(stocks_al). También se mide la conciliación de todo el inventario.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+PROYECTO = Path(__file__).resolve().parent.parent
+DIAS = 3 * 365
+
+
+def llenar(vehiculos, movimientos, azar, inicio):
+    from django.db import transaction
+    from app_Ford.models import MovimientoInventario, Vehiculo
+
+    ids = []
+    with transaction.atomic():
+        for n in range(vehiculos):
+            vehiculo = Vehiculo.objects.create(
+                marca='Ford', modelo='Lobo', anio=2024, numero_serie=f'BENCH-{n}', precio=1, cantidad_disponible=0)
+            ids.append(vehiculo.id)
+    segundos = DIAS * 86400
+    for vehiculo_id in ids:
+        instantes = sorted(azar.randrange(segundos) for _ in range(movimientos))
+        with transaction.atomic():
+            MovimientoInventario.objects.bulk_create([
+                MovimientoInventario(vehiculo_id=vehiculo_id, tipo='ajuste', cantidad=azar.choice((-1, 1, 2)),
+                                     fecha=inicio + timedelta(seconds=s))
+                for s in instantes
+            ], batch_size=5000)
+    return ids
+
+
+def suma_completa(vehiculo_id, momento):
+    """El stock sin fotos: la suma de todos los movimientos hasta 'momento'."""
+    from django.db.models import Sum
+    from app_Ford.models import MovimientoInventario
+
+    return MovimientoInventario.objects.filter(
+        vehiculo_id=vehiculo_id, fecha__lte=momento).aggregate(s=Sum('cantidad'))['s'] or 0
+
+
+def sumas_completas(momento):
+    from django.db.models import Sum
+    from app_Ford.models import MovimientoInventario
+
+    return dict(MovimientoInventario.objects.filter(fecha__lte=momento).order_by()
+                .values('vehiculo').annotate(s=Sum('cantidad')).values_list('vehiculo', 's'))
+
+
+def medir(funcion, consultas):
+    inicio = time.perf_counter()
+    resultados = [funcion(*consulta) for consulta in consultas]
+    return (time.perf_counter() - inicio) / len(consultas) * 1000, resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--vehiculos', type=int, default=20)
+    parser.add_argument('--movimientos', type=int, default=20000, help='Movimientos por vehículo.')
+    parser.add_argument('--dias-entre-fotos', type=int, default=7)
+    parser.add_argument('--consultas', type=int, default=500)
+    parser.add_argument('--semilla', type=int, default=42)
+    args = parser.parse_args()
+
+    carpeta = tempfile.TemporaryDirectory()
+    os.environ['FORD_DB_ENGINE'] = 'sqlite'
+    os.environ['FORD_DB_NAME'] = str(Path(carpeta.name) / 'inventario.sqlite3')
+    sys.path.insert(0, str(PROYECTO))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend_Ford.settings')
+    import django
+    django.setup()
+
+    from django.core.management import call_command
+    from django.utils import timezone
+    from app_Ford import inventario
+
+    call_command('migrate', verbosity=0)
+    azar = random.Random(args.semilla)
+    inicio = timezone.now() - timedelta(days=DIAS + 1)
+    antes = time.perf_counter()
+    ids = llenar(args.vehiculos, args.movimientos, azar, inicio)
+    print(f'{args.vehiculos * args.movimientos} movimientos en {time.perf_counter() - antes:.1f}s')
+
+    consultas = [(azar.choice(ids), inicio + timedelta(seconds=azar.randrange(DIAS * 86400)))
+                 for _ in range(args.consultas)]
+    fechas = [(momento,) for _, momento in consultas[:20]]
+    sin_fotos, esperados = medir(suma_completa, consultas)
+    todos_sin_fotos, todos_esperados = medir(sumas_completas, fechas)
+
+    antes = time.perf_counter()
+    fotos = sum(inventario.compactar(inicio + timedelta(days=dia))
+                for dia in range(args.dias_entre_fotos, DIAS + 1, args.dias_entre_fotos))
+    print(f'{fotos} fotos en {time.perf_counter() - antes:.1f}s')
+    con_fotos, resultados = medir(inventario.stock_al, consultas)
+    assert resultados == esperados, 'stock_al no coincide con la suma completa'
+    todos_con_fotos, resultados = medir(inventario.stocks_al, fechas)
+    # stocks_al también trae en 0 los vehículos sin movimientos hasta esa fecha.
+    assert [{k: v for k, v in r.items() if v} for r in resultados] \
+        == [{k: v for k, v in e.items() if v} for e in todos_esperados], 'stocks_al no coincide con la suma completa'
+
+    antes = time.perf_counter()
+    inventario.conciliar()
+    conciliar = time.perf_counter() - antes
+
+    print(f'\nstock a una fecha ({args.consultas} consultas al azar):')
+    print(f'  sumando toda la bitácora   {sin_fotos:8.2f} ms')
+    print(f'  desde la última foto       {con_fotos:8.2f} ms')
+    print(f'todo el inventario a una fecha ({len(fechas)} fechas al azar):')
+    print(f'  sumando toda la bitácora   {todos_sin_fotos:8.2f} ms')
+    print(f'  desde la última foto       {todos_con_fotos:8.2f} ms')
+    print(f'conciliación de {args.vehiculos} vehículos  {conciliar * 1000:8.1f} ms')
+    carpeta.cleanup()
+
+
+if __name__ == '__main__':
+    main()
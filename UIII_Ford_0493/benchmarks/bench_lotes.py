@@ -0,0 +1,86 @@
+"""
+Benchmark: N ventas por el formulario (una petición cada una) contra las
+mismas N ventas en una sola petición a la API de lotes.
+
+Uso (desde la carpeta del proyecto, donde está manage.py):
+    python benchmarks/bench_lotes.py
+    python benchmarks/bench_lotes.py --ventas 500
+
+Se usa una base SQLite temporal (nunca se toca db.sqlite3). Se mide el
+tiempo total, las peticiones y las consultas SQL de cada forma.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROYECTO = Path(__file__).resolve().parent.parent
+
+
+def medir(funcion):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    with CaptureQueriesContext(connection) as consultas:
+        inicio = time.perf_counter()
+        peticiones = funcion()
+        transcurrido = time.perf_counter() - inicio
+    return {'segundos': transcurrido, 'peticiones': peticiones, 'consultas': len(consultas)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--ventas', type=int, default=200)
+    args = parser.parse_args()
+
+    carpeta = tempfile.TemporaryDirectory()
+    os.environ['FORD_DB_ENGINE'] = 'sqlite'
+    os.environ['FORD_DB_NAME'] = str(Path(carpeta.name) / 'bench.sqlite3')
+    sys.path.insert(0, str(PROYECTO))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend_Ford.settings')
+    import django
+    django.setup()
+
+    from django.core.management import call_command
+    from django.test import Client
+    from django.urls import reverse
+    from app_Ford.models import Vehiculo
+
+    call_command('migrate', verbosity=0)
+    vehiculos = [
+        Vehiculo.objects.create(
+            marca='Ford', modelo='Lobo', anio=2024, numero_serie=f'BENCH-{i}',
+            precio=500000, cantidad_disponible=10 ** 6,
+        )
+        for i in range(10)
+    ]
+    cliente = Client(SERVER_NAME='localhost')
+
+    def por_formulario():
+        for i in range(args.ventas):
+            cliente.post(reverse('agregar_venta'), {
+                'vehiculo': vehiculos[i % len(vehiculos)].id, 'cliente_nombre': 'Bench', 'total': '100',
+            })
+        return args.ventas
+
+    def por_lote():
+        lote = {'ventas': [
+            {'vehiculo': vehiculos[i % len(vehiculos)].id, 'cliente_nombre': 'Bench', 'total': '100'}
+            for i in range(args.ventas)
+        ]}
+        cliente.post(reverse('api_lote'), json.dumps(lote), content_type='application/json')
+        return 1
+
+    resultados = {'formulario': medir(por_formulario), 'lote': medir(por_lote)}
+
+    print(f"{args.ventas} ventas sobre {len(vehiculos)} vehículos\n")
+    print(f"{'':12}{'segundos':>10}{'peticiones':>12}{'consultas':>11}")
+    for nombre, r in resultados.items():
+        print(f"{nombre:12}{r['segundos']:>10.3f}{r['peticiones']:>12}{r['consultas']:>11}")
+    carpeta.cleanup()
+
+
+if __name__ == '__main__':
+    main()
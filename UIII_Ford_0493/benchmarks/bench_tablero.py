@@ -0,0 +1,129 @@
+"""
+Benchmark del tablero de inicio: la página con los indicadores en caché
+contra calcularlos en cada petición, desde el resumen diario y desde la
+tabla de ventas (como se haría sin resumenes.py).
+
+Uso (desde la carpeta del proyecto, donde está manage.py):
+    python benchmarks/bench_tablero.py
+    python benchmarks/bench_tablero.py --scale 5 --peticiones 200
+
+Se usa una base SQLite temporal (nunca se toca db.sqlite3) llenada con
+'manage.py seed_ford --scale N'. Se mide el tiempo por petición y las
+consultas SQL de cada forma.
+"""
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from unittest import mock
+
+PROYECTO = Path(__file__).resolve().parent.parent
+
+
+def kpis_desde_ventas(hoy=None):
+    """Los mismos indicadores de tablero.calcular_kpis(), agregando Venta."""
+    from django.db.models import Count, Q, Sum
+    from app_Ford import tablero
+    from app_Ford.models import ServicioMantenimiento, Vehiculo, Venta
+
+    hoy = hoy or date.today()
+    inicio_mes = hoy.replace(day=1)
+    inicio_semana = hoy - timedelta(days=hoy.weekday())
+    del_mes = Venta.objects.filter(fecha_venta__gte=inicio_mes, fecha_venta__lte=hoy)
+    de_hoy = Q(fecha_venta=hoy)
+    ventas = del_mes.aggregate(
+        ventas_mes=Count('id'), total_mes=Sum('total'),
+        ventas_hoy=Count('id', filter=de_hoy), total_hoy=Sum('total', filter=de_hoy),
+    )
+    vendedores = [
+        {'nombre': f"{v['empleado__nombre']} {v['empleado__apellido']}", 'ventas': v['ventas'], 'total': v['total']}
+        for v in del_mes.filter(empleado__isnull=False)
+        .values('empleado_id', 'empleado__nombre', 'empleado__apellido')
+        .annotate(ventas=Count('id'), total=Sum('total')).order_by('-total')[:5]
+    ]
+    stock_bajo = Vehiculo.objects.filter(cantidad_disponible__lte=tablero.STOCK_BAJO)
+    servicios = ServicioMantenimiento.objects.filter(
+        fecha_servicio__gte=inicio_semana, fecha_servicio__lt=inicio_semana + timedelta(days=7)
+    ).aggregate(semana=Count('id'), pendientes=Count('id', filter=Q(fecha_servicio__gte=hoy)))
+    return {
+        'hoy': {'ventas': ventas['ventas_hoy'], 'total': ventas['total_hoy'] or 0},
+        'mes': {'ventas': ventas['ventas_mes'], 'total': ventas['total_mes'] or 0},
+        'vendedores': vendedores,
+        'stock_bajo': stock_bajo.count(),
+        'stock_bajo_lista': list(
+            stock_bajo.order_by('cantidad_disponible', 'id')
+            .values('id', 'marca', 'modelo', 'anio', 'cantidad_disponible')[:5]
+        ),
+        'servicios_semana': servicios['semana'],
+        'servicios_pendientes': servicios['pendientes'],
+        'umbral_stock': tablero.STOCK_BAJO,
+    }
+
+
+def medir(cliente, peticiones, antes=None):
+    """GET a la página de inicio 'peticiones' veces; 'antes()' corre fuera de la medición."""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from django.urls import reverse
+
+    ruta = reverse('inicio')
+    segundos = 0.0
+    consultas = 0
+    for _ in range(peticiones):
+        if antes is not None:
+            antes()
+        with CaptureQueriesContext(connection) as capturadas:
+            inicio = time.perf_counter()
+            cliente.get(ruta)
+            segundos += time.perf_counter() - inicio
+        consultas += len(capturadas)
+    return {'ms': segundos / peticiones * 1000, 'consultas': consultas / peticiones}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=float, default=1, help='Escala de seed_ford.')
+    parser.add_argument('--peticiones', type=int, default=100)
+    args = parser.parse_args()
+
+    carpeta = tempfile.TemporaryDirectory()
+    os.environ['FORD_DB_ENGINE'] = 'sqlite'
+    os.environ['FORD_DB_NAME'] = str(Path(carpeta.name) / 'bench.sqlite3')
+    sys.path.insert(0, str(PROYECTO))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend_Ford.settings')
+    import django
+    django.setup()
+
+    from django.core.cache import cache
+    from django.core.management import call_command
+    from django.test import Client
+    from app_Ford import tablero
+    from app_Ford.models import Venta
+
+    call_command('migrate', verbosity=0)
+    call_command('seed_ford', scale=args.scale, stdout=io.StringIO())
+    cliente = Client(SERVER_NAME='localhost')
+
+    def sin_cache():
+        cache.delete(tablero.CLAVE)
+
+    resultados = {}
+    cliente.get('/')
+    resultados['en caché'] = medir(cliente, args.peticiones)
+    resultados['resumen diario'] = medir(cliente, args.peticiones, antes=sin_cache)
+    with mock.patch.object(tablero, 'calcular_kpis', kpis_desde_ventas):
+        resultados['tabla de ventas'] = medir(cliente, args.peticiones, antes=sin_cache)
+
+    print(f"{Venta.objects.count()} ventas, {args.peticiones} peticiones por forma\n")
+    print(f"{'indicadores':18}{'ms/petición':>13}{'consultas':>11}")
+    for nombre, r in resultados.items():
+        print(f"{nombre:18}{r['ms']:>13.2f}{r['consultas']:>11.1f}")
+    carpeta.cleanup()
+
+
+if __name__ == '__main__':
+    main()